@@ -0,0 +1,272 @@
+"""
+Vectorized Mean Reversion Backtest
+Offline batch mode for the Bollinger + RSI + EMA rules of MeanReversionStrategy.
+
+• Loads data['Close'][token] from market_data.pkl into NumPy arrays.
+• Computes Bollinger Bands, Wilder RSI and EMA for the whole series at once.
+• Evaluates the check_entry / check_exit / square-off rules as boolean masks.
+• Walks the masks (one step per trade, not per bar) to build the same trade
+  summaries and daily_report numbers as the live ZeroMQ path.
+• Stops entering once the daily loss is breached, judged like the live RMS:
+  realized PnL as the OMS books it plus the open position's mark-to-market.
+
+Run from repo root:
+    python src/backtest_mean_reversion.py [token] [market_data.pkl | market_store dir]
+"""
+
+import pickle
+import random
+import sys
+import time
+from datetime import datetime
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from market_store import MarketStore
+from records import Side, TradeSummary
+from trade_journal import trade_report
+
+# -------------------------
+# Defaults (mirror strategy_mean_reversion.py)
+# -------------------------
+BB_N = 20
+BB_K = 2.0
+RSI_N = 14
+EMA_N = 20
+RSI_LONG = 30
+RSI_SHORT = 70
+RSI_EXIT = 50
+QTY = 1
+SLIPPAGE_PCT = 0.0005         # OMS default
+MAX_DAILY_LOSS = 20000        # RMS default
+
+INTRADAY_SQUARE_OFF_MIN = 15*60 + 15      # 15:15 as minute-of-day
+
+
+# -------------------------
+# Data loading
+# -------------------------
+def load_close_series(data, token):
+    """
+    Return (timestamps datetime64[m], closes float64) for one token,
+    in the same order FeedDistributor publishes them.
+    `data` is the unpickled market_data dict or a MarketStore.
+    """
+    if isinstance(data, MarketStore):
+        return data.timestamps(token), np.asarray(data.series(token, "close"))
+
+    bars = data["Close"][str(token)]
+    ts = np.array([bar["Minute"] for bar in bars], dtype="datetime64[m]")
+    closes = np.fromiter((bar["Price"] for bar in bars), dtype=np.float64, count=len(bars))
+    return ts, closes
+
+
+# -------------------------
+# Vectorized indicators (NaN until warm)
+# -------------------------
+def _ewm(x, alpha, init):
+    """
+    y[0] = init; y[t] = y[t-1] + alpha * (x[t] - y[t-1])
+    Evaluated in closed form per chunk; chunk length keeps decay^-k finite.
+    """
+    y = np.empty(len(x) + 1)
+    y[0] = init
+    if not len(x):
+        return y
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        y[1:] = x
+        return y
+
+    chunk = max(1, min(len(x), int(150 / -np.log10(decay))))
+    powers = decay ** np.arange(1, chunk + 1)
+    carry = init
+    for start in range(0, len(x), chunk):
+        seg = x[start:start + chunk]
+        p = powers[:len(seg)]
+        acc = np.cumsum(alpha * seg / p)
+        out = p * (carry + acc)
+        y[start + 1:start + 1 + len(seg)] = out
+        carry = out[-1]
+    return y
+
+def ema_series(closes, period):
+    """Same recurrence as indicators.EMA (seeded with the first price)."""
+    if not len(closes):
+        return closes.copy()
+    return _ewm(closes[1:], 2/(period+1), closes[0])
+
+def bollinger_series(closes, period, k):
+    lower = np.full(len(closes), np.nan)
+    mid = lower.copy()
+    upper = lower.copy()
+    if len(closes) >= period:
+        win = sliding_window_view(closes, period)
+        m = win.mean(axis=1)
+        sd = win.std(axis=1)
+        mid[period-1:] = m
+        lower[period-1:] = m - k*sd
+        upper[period-1:] = m + k*sd
+    return lower, mid, upper
+
+def rsi_series(closes, period):
+    """Same recurrence as indicators.WilderRSI."""
+    rsi = np.full(len(closes), np.nan)
+    if len(closes) < period + 1:
+        return rsi
+    diff = np.diff(closes)
+    gain = np.where(diff > 0, diff, 0.0)
+    loss = np.where(diff < 0, -diff, 0.0)
+
+    alpha = 1.0/period
+    avg_gain = _ewm(gain[period:], alpha, gain[:period].sum()/period)
+    avg_loss = _ewm(loss[period:], alpha, loss[:period].sum()/period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100 - 100/(1 + avg_gain/avg_loss)
+    rsi[period:] = np.where(avg_loss == 0, 100.0, value)
+    return rsi
+
+
+def indicator_series(closes, bb_n=BB_N, bb_k=BB_K, rsi_n=RSI_N, ema_n=EMA_N):
+    """(ema, lower_bb, upper_bb, rsi) arrays, reusable across threshold-only changes."""
+    lower, _, upper = bollinger_series(closes, bb_n, bb_k)
+    return ema_series(closes, ema_n), lower, upper, rsi_series(closes, rsi_n)
+
+
+# -------------------------
+# Backtest
+# -------------------------
+def run_backtest(timestamps, closes, token="", bb_n=BB_N, bb_k=BB_K, rsi_n=RSI_N, ema_n=EMA_N,
+                 rsi_long=RSI_LONG, rsi_short=RSI_SHORT, rsi_exit=RSI_EXIT, qty=QTY,
+                 slippage_pct=SLIPPAGE_PCT, max_daily_loss=MAX_DAILY_LOSS, seed=None,
+                 indicators=None):
+    """
+    Replays the live per-bar rules over the full series.
+    Returns {"trades": [TradeSummary, ...], "open_position": dict|None, "report": dict}.
+    Trades are the same records as MeanReversionStrategy.place_exit_and_compute_pnl builds.
+    indicators: precomputed indicator_series(closes, bb_n, bb_k, rsi_n, ema_n).
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    timestamps = np.asarray(timestamps, dtype="datetime64[m]")
+
+    if indicators is None:
+        indicators = indicator_series(closes, bb_n, bb_k, rsi_n, ema_n)
+    ema_v, lower, upper, rsi = indicators
+
+    minute_of_day = (timestamps - timestamps.astype("datetime64[D]")).astype(np.int64)
+    tradable = minute_of_day < INTRADAY_SQUARE_OFF_MIN
+    ready = ~np.isnan(lower) & ~np.isnan(rsi)
+
+    # check_entry()
+    with np.errstate(invalid="ignore"):
+        long_entry = tradable & ready & (closes <= lower) & (rsi < rsi_long) & (closes > ema_v)
+        short_entry = tradable & ready & (closes >= upper) & (rsi > rsi_short) & (closes < ema_v)
+
+        # check_exit() (RSI has priority for the reason label) + check_square_off()
+        long_rsi_exit = rsi >= rsi_exit
+        short_rsi_exit = rsi <= rsi_exit
+        long_exit = ~tradable | long_rsi_exit | (closes <= ema_v)
+        short_exit = ~tradable | short_rsi_exit | (closes >= ema_v)
+
+    entry_idx = np.flatnonzero(long_entry | short_entry)
+    exit_idx = {Side.BUY: np.flatnonzero(long_exit), Side.SELL: np.flatnonzero(short_exit)}
+    rsi_hit = {Side.BUY: long_rsi_exit, Side.SELL: short_rsi_exit}
+
+    rng = random.Random(seed)
+
+    def fill(price):
+        slippage = rng.uniform(-slippage_pct, slippage_pct)
+        return round(float(price) * (1 + slippage), 2)
+
+    def bar_time(i):
+        return timestamps[i].astype(datetime)
+
+    def mark_to_market(position, price):
+        if position is None:
+            return 0.0
+        sign = 1 if position["side"] is Side.BUY else -1
+        return sign * (price - position["entry_price"]) * position["qty"]
+
+    trades = []
+    open_position = None
+    booked_pnl = 0.0            # realized PnL as the OMS books it (fill prices, unrounded)
+    start = 0
+
+    while True:
+        k = np.searchsorted(entry_idx, start)
+        if k == len(entry_idx):
+            break
+        i = int(entry_idx[k])
+        # RMS daily-loss check on the entry order: the OMS total it is fed (update_pnl),
+        # realized + the open position marked at this bar's close
+        if booked_pnl + mark_to_market(open_position, closes[i]) < -max_daily_loss:
+            break
+        side = Side.BUY if long_entry[i] else Side.SELL
+        entry_price = fill(closes[i])
+
+        candidates = exit_idx[side]
+        e = np.searchsorted(candidates, i)
+        if e == len(candidates):
+            open_position = {"side": side, "qty": qty, "entry_price": entry_price,
+                             "entry_time": bar_time(i)}
+            break
+        j = int(candidates[e])
+
+        if not tradable[j]:
+            reason = "TIME_SQUARE_OFF"
+        else:
+            reason = "EXIT_RSI" if rsi_hit[side][j] else "EXIT_EMA"
+
+        exit_price = fill(closes[j])
+        position = {"side": side, "qty": qty, "entry_price": entry_price}
+        booked_pnl += mark_to_market(position, exit_price)
+        realized = round(mark_to_market(position, exit_price), 2)
+
+        trades.append(TradeSummary(
+            symbol=str(token),
+            side=side,
+            qty=qty,
+            entry_time=bar_time(i),
+            exit_time=bar_time(j),
+            entry_price=entry_price,
+            exit_price=exit_price,
+            realized_pnl=realized,
+            reason=reason
+        ))
+        start = j + 1
+
+    return {"trades": trades, "open_position": open_position, "report": daily_report(trades)}
+
+
+def daily_report(trades):
+    """Same numbers as MeanReversionStrategy.daily_report()."""
+    return trade_report(trades)
+
+
+# -------------------------
+# Runner
+# -------------------------
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        token = sys.argv[1]
+    else:
+        from load_csv import get_exchange_instrument_id
+        token = str(get_exchange_instrument_id("NIFTY25NOVFUT"))
+    data_path = sys.argv[2] if len(sys.argv) > 2 else "./data/market_data.pkl"
+
+    if MarketStore.is_store(data_path):
+        data = MarketStore(data_path)
+    else:
+        data = pickle.load(open(data_path, "rb"))
+    ts, closes = load_close_series(data, token)
+
+    t0 = time.perf_counter()
+    result = run_backtest(ts, closes, token=token)
+    elapsed_ms = (time.perf_counter() - t0) * 1e3
+
+    for t in result["trades"]:
+        print(t)
+    if result["open_position"]:
+        print("OPEN POSITION:", result["open_position"])
+    print("DAILY REPORT:", result["report"])
+    print(f"{len(closes)} bars backtested in {elapsed_ms:.2f} ms")
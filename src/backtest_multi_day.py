@@ -0,0 +1,219 @@
+"""
+Day-Sharded Multi-Day Backtest
+Replays stored market data through StraddleSeller / MeanReversionStrategy
+one trading day per worker process and merges the days into one report.
+
+• Each day runs in a fresh strategy instance with its own OMS, RMS and
+  journal (./journal/Backtest/<run>/<strategy>_<date>.jrnl), so days are
+  independent and N days take about N / cores days of work.
+• Bars reach the strategy through the same methods the live loop calls
+  (MeanReversionStrategy.process_bar, StraddleSeller.on_spot), merged by
+  minute across tokens like the feed distributor; there is no ZMQ feed.
+• Workers open the columnar market store with np.memmap (a pickle is
+  converted to a temporary store once); Telegram alerts are off.
+
+Run from repo root:
+    python src/backtest_multi_day.py [straddle|mean_reversion|both] [market_data.pkl | market_store dir] [workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from multiprocessing import Pool
+import numpy as np
+from feed_codec import from_epoch_minute
+from market_store import MarketStore, convert_pickle
+from trade_journal import trade_report
+
+STRATEGIES = ("straddle", "mean_reversion")
+MINUTES_PER_DAY = 1440
+
+_store = None       # per worker
+
+
+# -------------------------
+# Day slicing
+# -------------------------
+def trading_days(store):
+    """Epoch days that have at least one bar, ascending."""
+    days = [np.unique(store.series(token, "minute") // MINUTES_PER_DAY) for token in store.tokens()]
+    return [int(d) for d in np.unique(np.concatenate(days))] if days else []
+
+
+def day_messages(store, day):
+    """
+    Every bar of one epoch day as decoded feed messages, ordered by minute
+    and then token (the feed distributor's time-ordered replay).
+    """
+    start, end = day * MINUTES_PER_DAY, (day + 1) * MINUTES_PER_DAY
+    parts = []
+    for rank, token in enumerate(store.tokens()):
+        minutes = store.series(token, "minute")
+        lo, hi = np.searchsorted(minutes, [start, end])
+        if hi > lo:
+            parts.append((token, rank, *(store.series(token, c)[lo:hi] for c in ("minute", "open", "high", "low", "close"))))
+    if not parts:
+        return []
+
+    tokens = [p[0] for p in parts]
+    token_idx = np.concatenate([np.full(len(p[2]), i) for i, p in enumerate(parts)])
+    rank = np.concatenate([np.full(len(p[2]), p[1]) for p in parts])
+    minute, open_, high, low, close = (np.concatenate([p[k] for p in parts]) for k in range(2, 7))
+    order = np.lexsort((rank, minute))
+
+    return [
+        {"symbol": tokens[t], "timestamp": from_epoch_minute(m), "price": c,
+         "open": o, "high": h, "low": l, "close": c}
+        for t, m, o, h, l, c in zip(token_idx[order].tolist(), minute[order].tolist(), open_[order].tolist(),
+                                    high[order].tolist(), low[order].tolist(), close[order].tolist())
+    ]
+
+
+# -------------------------
+# Per-day runs
+# -------------------------
+def _run_mean_reversion(msgs, journal_file):
+    import strategy_mean_reversion as mr
+
+    strat = mr.MeanReversionStrategy(feed_addr="inproc://backtest", snapshot_addr=None, journal_file=journal_file)
+    try:
+        bar = None
+        for msg in msgs:
+            if msg["symbol"] != mr.SYMBOL_TOKEN:
+                continue
+            bar = strat.parse_bar(msg)
+            try:
+                strat.process_bar(bar)
+            except StopIteration:
+                break
+        if strat.position and bar:
+            strat.place_exit_and_compute_pnl(bar["timestamp"], reason="END_OF_DATA")
+        return [t["summary"] for t in strat.trade_log if "summary" in t], None
+    finally:
+        strat.oms.close()
+        strat.market.close()
+        strat.context.term()
+
+
+def _run_straddle(msgs, journal_file):
+    import strategy_straddle_seller as ss
+
+    underlying = str(ss.SYMBOL_UNDERLYING)
+    strat = ss.StraddleSeller(feed_addr="inproc://backtest", snapshot_addr=None, journal_file=journal_file)
+    aborted = None
+    try:
+        ts = None
+        for msg in msgs:
+            strat.market.last[msg["symbol"]] = msg
+            if msg["symbol"] != underlying:
+                continue
+            ts = msg["timestamp"]
+            if not strat.on_spot(float(msg["price"]), ts):
+                break
+        if strat.position and ts:
+            strat.monitor_exit(ts, force_reason="END_OF_DATA")
+    except SystemExit as e:         # StraddleSeller exits when option premiums are missing (only when flat)
+        aborted = f"exit({e.code})"
+    finally:
+        strat.oms.close()
+        strat.close_get_market_data()
+    # trades closed before an abort still count
+    return [t["summary"] for t in strat.trade_log if "summary" in t], aborted
+
+
+RUNNERS = {"straddle": _run_straddle, "mean_reversion": _run_mean_reversion}
+
+
+def _init_worker(store_dir):
+    global _store
+    from telegram_alert import set_alerts_enabled
+    set_alerts_enabled(False)
+    _store = MarketStore(store_dir)
+
+
+def run_day(task):
+    strategy, day, journal_dir = task
+    date = from_epoch_minute(day * MINUTES_PER_DAY).date()
+    t0 = time.process_time()
+    msgs = day_messages(_store, day)
+    journal_file = os.path.join(journal_dir, f"{strategy}_{date}.jrnl") if journal_dir else None
+
+    trades, aborted = RUNNERS[strategy](msgs, journal_file)
+    return {
+        "strategy": strategy,
+        "date": date,
+        "bars": len(msgs),
+        "trades": trades,
+        "report": trade_report(trades),
+        "aborted": aborted,
+        "cpu_s": time.process_time() - t0,
+    }
+
+
+def run_days(store_dir, strategies=STRATEGIES, workers=None, journal_dir=None):
+    """Per-day results (sorted by strategy, date) and wall-clock seconds."""
+    days = trading_days(MarketStore(store_dir))
+    tasks = [(strategy, day, journal_dir) for strategy in strategies for day in days]
+    t0 = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(store_dir,)) as pool:
+        results = list(pool.imap_unordered(run_day, tasks))
+    wall_s = time.perf_counter() - t0
+    results.sort(key=lambda r: (r["strategy"], r["date"]))
+    return results, wall_s
+
+
+def merge_report(results):
+    """One multi-day report per strategy: totals over every trade plus the per-day rows."""
+    merged = {}
+    for strategy in sorted({r["strategy"] for r in results}):
+        rows = [r for r in results if r["strategy"] == strategy]
+        trades = [t for r in rows for t in r["trades"]]
+        equity = np.concatenate(([0.0], np.cumsum([r["report"]["total_pnl"] for r in rows])))
+        merged[strategy] = {
+            **trade_report(trades),
+            "days": len(rows),
+            "aborted_days": sum(1 for r in rows if r["aborted"]),
+            "max_daily_drawdown": round(float(np.max(np.maximum.accumulate(equity) - equity)), 2),
+            "per_day": rows,
+        }
+    return merged
+
+
+def print_report(merged, wall_s, workers):
+    for strategy, rep in merged.items():
+        print(f"\n{strategy}: {rep['days']} days, {rep['total_trades']} trades, wins={rep['wins']}, "
+              f"losses={rep['losses']}, PnL={rep['total_pnl']}, daily loss={rep['daily_loss']}, "
+              f"max drawdown={rep['max_daily_drawdown']}, aborted days={rep['aborted_days']}")
+        print(f"  {'date':<10} {'bars':>6} {'trades':>6} {'wins':>5} {'PnL':>10} {'note':>10}")
+        for r in rep["per_day"]:
+            print(f"  {str(r['date']):<10} {r['bars']:>6} {r['report']['total_trades']:>6} "
+                  f"{r['report']['wins']:>5} {r['report']['total_pnl']:>10.2f} {r['aborted'] or '':>10}")
+
+    cpu_s = sum(r["cpu_s"] for rep in merged.values() for r in rep["per_day"])
+    print(f"\nwall {wall_s:.2f} s for {cpu_s:.2f} CPU s of day runs with {workers} workers "
+          f"(parallel speedup x{cpu_s / wall_s:.2f})")
+
+
+# -------------------------
+# Runner
+# -------------------------
+if __name__ == "__main__":
+    which = sys.argv[1] if len(sys.argv) > 1 else "both"
+    data_path = sys.argv[2] if len(sys.argv) > 2 else "./data/market_data.pkl"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    strategies = STRATEGIES if which == "both" else (which,)
+
+    journal_dir = os.path.join("./journal/Backtest", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    os.makedirs(journal_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_dir = data_path
+        if not MarketStore.is_store(data_path):
+            store_dir = os.path.join(tmp, "market_store")
+            convert_pickle(data_path, store_dir)
+        results, wall_s = run_days(store_dir, strategies, workers, journal_dir)
+
+    print_report(merge_report(results), wall_s, workers)
+    print(f"journals: {journal_dir}")
@@ -0,0 +1,103 @@
+"""
+Streaming Bar Aggregator
+Builds 1 / 3 / 5 / 15-minute (any period) OHLCV bars from the 1-minute
+feed incrementally: O(1) per update per timeframe, no window scans.
+
+• BarBuilder keeps one open bar per timeframe. Bars are aligned on epoch
+  minutes (minute - minute % period), which puts 3 / 5 / 15-minute bars
+  on 09:15, 09:20, ... like the exchange. A bar is stamped with its first
+  minute, as the 1-minute feed bars are.
+• A bar is emitted as soon as its last minute arrives (no waiting for the
+  next bar), or when a later minute shows it was left incomplete (gap).
+  flush() returns the open partial bars, e.g. at market close.
+• volume is the sum of the input volumes; the feed has none, so by
+  default every 1-minute bar counts 1 (volume = bars aggregated).
+• BarAggregator holds the builders for many tokens. FeedDistributor(
+  bar_periods=(5, ...)) publishes completed bars on BAR<period>:<token>
+  topics (feed_codec WIRE_OHLCV); a strategy can also embed one and feed
+  it decoded messages via update_msg().
+
+Bars are (minute, open, high, low, close, volume) tuples, the feed bar
+tuple plus volume, so they can go straight to feed_codec.
+"""
+
+from feed_codec import to_epoch_minute
+
+PERIODS = (1, 3, 5, 15)
+
+
+# -------------------------
+# One token
+# -------------------------
+class BarBuilder:
+    __slots__ = ("periods", "open_bars")
+
+    def __init__(self, periods=PERIODS):
+        if any(p < 1 for p in periods):
+            raise ValueError("periods must be >= 1 minute")
+        self.periods = tuple(periods)
+        self.open_bars = [None] * len(self.periods)   # per period: [start, o, h, l, c, v] or None
+
+    def update(self, minute, open_, high, low, close, volume=1, out=None):
+        """
+        Add one 1-minute bar; returns `out` (a new list by default) with a
+        (period, bar) pair appended for every bar it completes.
+        """
+        if out is None:
+            out = []
+        for i, period in enumerate(self.periods):
+            start = minute - minute % period
+            bar = self.open_bars[i]
+            if bar is not None and bar[0] != start:
+                # a later bucket started before this one saw its last minute
+                out.append((period, tuple(bar)))
+                bar = None
+            if bar is None:
+                bar = [start, open_, high, low, close, volume]
+            else:
+                if high > bar[2]:
+                    bar[2] = high
+                if low < bar[3]:
+                    bar[3] = low
+                bar[4] = close
+                bar[5] += volume
+            if minute == start + period - 1:
+                out.append((period, tuple(bar)))
+                bar = None
+            self.open_bars[i] = bar
+        return out
+
+    def flush(self):
+        """[(period, partial bar)] for every open bar; the builder starts empty again."""
+        out = [(period, tuple(bar)) for period, bar in zip(self.periods, self.open_bars) if bar is not None]
+        self.open_bars = [None] * len(self.periods)
+        return out
+
+
+# -------------------------
+# Many tokens
+# -------------------------
+class BarAggregator:
+    def __init__(self, periods=PERIODS):
+        self.periods = tuple(periods)
+        self.builders = {}          # token -> BarBuilder
+
+    def update(self, token, minute, open_, high, low, close, volume=1):
+        """[(period, bar)] completed by this 1-minute bar of `token`."""
+        builder = self.builders.get(token)
+        if builder is None:
+            builder = self.builders[token] = BarBuilder(self.periods)
+        return builder.update(minute, open_, high, low, close, volume)
+
+    def update_msg(self, msg):
+        """Same as update() for a decoded feed message (feed_codec dict)."""
+        close = msg["close"] if "close" in msg else msg["price"]
+        return self.update(msg["symbol"], to_epoch_minute(msg["timestamp"]),
+                           msg.get("open", close), msg.get("high", close), msg.get("low", close), close,
+                           msg.get("volume", 1))
+
+    def flush(self):
+        """[(token, period, partial bar)] for every token's open bars."""
+        return [(token, period, bar)
+                for token, builder in self.builders.items()
+                for period, bar in builder.flush()]
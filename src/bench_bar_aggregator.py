@@ -0,0 +1,64 @@
+"""
+Bar Aggregator Benchmark
+Cost per 1-minute update of building 1 / 3 / 5 / 15-minute OHLCV bars
+for TOKENS tokens: streaming BarAggregator vs rescanning each token's
+last-minute window every minute (what a strategy does without it).
+
+Run from repo root:
+    python src/bench_bar_aggregator.py
+"""
+
+import time
+from collections import deque
+import numpy as np
+from bar_aggregator import BarAggregator, PERIODS
+
+TOKENS = 20
+MINUTES = 375 * 5
+
+
+def stream(tokens=TOKENS, minutes=MINUTES, seed=0):
+    """[(token, minute, o, h, l, c)] in feed order (time, then token)."""
+    rng = np.random.default_rng(seed)
+    closes = 25000 * np.exp(np.cumsum(rng.normal(0, 0.0005, (minutes, tokens)), axis=0))
+    start = 29369355            # 2025-11-03 09:15
+    return [(str(t), start + m, c, c + 1.0, c - 1.0, c)
+            for m in range(minutes) for t, c in enumerate(closes[m].tolist())]
+
+
+def rescan(bars, periods=PERIODS):
+    """Every minute: rebuild each period's current bar from a window of the token's recent minutes."""
+    windows = {}
+    longest = max(periods)
+    completed = 0
+    for token, minute, o, h, l, c in bars:
+        window = windows.get(token)
+        if window is None:
+            window = windows[token] = deque(maxlen=longest)
+        window.append((minute, o, h, l, c))
+        for period in periods:
+            start = minute - minute % period
+            rows = [row for row in window if row[0] >= start]
+            bar = (start, rows[0][1], max(r[2] for r in rows), min(r[3] for r in rows), rows[-1][4], len(rows))
+            if minute == start + period - 1:
+                completed += 1
+    return completed
+
+
+def streaming(bars, periods=PERIODS):
+    aggregator = BarAggregator(periods)
+    completed = 0
+    for bar in bars:
+        completed += len(aggregator.update(*bar))
+    return completed
+
+
+if __name__ == "__main__":
+    bars = stream()
+    print(f"{len(bars):,} one-minute updates ({TOKENS} tokens x {MINUTES} minutes), periods {PERIODS}")
+    for label, fn in (("window rescan", rescan), ("BarAggregator", streaming)):
+        t0 = time.perf_counter()
+        completed = fn(bars)
+        elapsed = time.perf_counter() - t0
+        print(f"  {label:<14} {elapsed / len(bars) * 1e6:7.2f} us/update  {len(bars) / elapsed:>12,.0f} updates/s  "
+              f"{completed:,} bars")
@@ -0,0 +1,119 @@
+"""
+Contract Index Startup Benchmark
+Process startup + first lookup with the contract master loaded the old
+way (pandas.read_csv at import) vs the compiled index (contract_index.py),
+plus lookup rates of the index.
+
+Runs on a synthetic contract master of ROWS contracts with EXTRA_COLUMNS
+unused columns (a full exchange master is ~100k rows); pass a CSV path
+to use a real one:
+    python src/bench_contract_index.py [./data/contracts.csv]
+"""
+
+import csv
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.dirname(os.path.abspath(__file__))
+ROWS = 100000
+EXTRA_COLUMNS = 20
+RUNS = 7
+
+BEFORE = """
+import pandas as pd
+contracts = pd.read_csv("./data/contracts.csv", low_memory=False)
+desc_to_id = dict(zip(contracts["Description"], contracts["exchangeInstrumentID"]))
+desc_to_id.get("NIFTY-SPOT", "NOT FOUND")
+"""
+
+AFTER = """
+from load_csv import get_exchange_instrument_id
+get_exchange_instrument_id("NIFTY-SPOT")
+"""
+
+
+def write_contracts(path, rows=ROWS):
+    """NIFTY-SPOT plus a future and CE / PE options on 50-point strikes per (underlying, expiry), padded with extra columns."""
+    series = [(u, e) for u in ("NIFTY", "BANKNIFTY", "FINNIFTY", "MIDCPNIFTY", "SENSEX")
+              for e in ("25NOV", "25DEC", "26JAN", "26FEB", "26MAR")]
+    strikes = range(10000, 10000 + 50 * max(1, (rows // len(series) - 1) // 2), 50)
+    pad = list(range(EXTRA_COLUMNS))
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Description", "exchangeInstrumentID", *(f"col{i}" for i in pad)])
+        writer.writerow(["NIFTY-SPOT", 26000, *pad])
+        token = 30000
+        for underlying, expiry in series:
+            writer.writerow([f"{underlying}{expiry}FUT", token, *pad])
+            token += 1
+            for strike in strikes:
+                for kind in ("CE", "PE"):
+                    writer.writerow([f"{underlying}{expiry}{strike}{kind}", token, *pad])
+                    token += 1
+
+
+def startup(code, cwd, runs=RUNS):
+    """Median wall time (s) of a fresh interpreter running `code` in cwd."""
+    env = dict(os.environ, PYTHONPATH=SRC)
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True)
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, SRC)
+    from contract_index import build_index, ContractIndex, read_contracts_csv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "data"))
+        csv_path = os.path.join(tmp, "data", "contracts.csv")
+        index_path = os.path.join(tmp, "data", "contracts.idx")
+        if len(sys.argv) > 1:
+            with open(sys.argv[1], "rb") as src, open(csv_path, "wb") as dst:
+                dst.write(src.read())
+        else:
+            write_contracts(csv_path)
+
+        t0 = time.perf_counter()
+        rows = build_index(csv_path, index_path)
+        build_s = time.perf_counter() - t0
+        print(f"{rows:,} contracts | csv {os.path.getsize(csv_path) / 1e6:.1f} MB -> "
+              f"index {os.path.getsize(index_path) / 1e6:.1f} MB in {build_s:.2f} s")
+
+        empty = startup("pass", tmp)
+        before = startup(BEFORE, tmp)
+        after = startup(AFTER, tmp)
+        print(f"\nstartup + first lookup (median of {RUNS} runs)")
+        print(f"  interpreter only      {empty * 1000:8.1f} ms")
+        print(f"  pandas read_csv       {before * 1000:8.1f} ms")
+        print(f"  compiled index        {after * 1000:8.1f} ms   (x{(before - empty) / max(after - empty, 1e-9):.0f} less overhead)")
+
+        # -------------------------
+        # Lookup rates
+        # -------------------------
+        index = ContractIndex(index_path)
+        expected = read_contracts_csv(csv_path)
+        descriptions = list(expected)[::max(1, len(expected) // 10000)]
+        assert all(index.token(d) == expected[d] for d in descriptions)
+        tokens = [expected[d] for d in descriptions]
+        assert all(index.description(t) == d for d, t in zip(descriptions, tokens))
+
+        for label, fn, keys in (("by description", index.token, descriptions),
+                                ("by token", index.description, tokens)):
+            t0 = time.perf_counter()
+            for key in keys:
+                fn(key)
+            us = (time.perf_counter() - t0) / len(keys) * 1e6
+            print(f"  lookup {label:<16} {us:6.2f} us")
+        t0 = time.perf_counter()
+        for strike in range(20000, 21000, 50):
+            index.contract("NIFTY", "25NOV", strike, "CE")
+        print(f"  lookup {'by fields':<16} {(time.perf_counter() - t0) / 20 * 1e6:6.2f} us")
+        index.close()
@@ -0,0 +1,83 @@
+"""
+Feed Batching Benchmark
+Bars/sec and frames/sec through FeedDistributor -> SUB socket for
+batch sizes 1, 16 and 256 at speed=0, plus bars lost to the HWM.
+
+Per-frame logging is disabled so only encode + transport + decode is timed.
+
+Run from repo root:
+    python src/bench_feed_batching.py
+"""
+
+import logging
+import threading
+import time
+import zmq
+from feed_codec import decode_messages, to_epoch_minute
+from simulator_feed_distributor import FeedDistributor
+
+ADDR = "tcp://127.0.0.1:5601"
+TOKENS = 20
+BARS_PER_TOKEN = 5000
+BATCH_SIZES = [1, 16, 256]
+
+
+def synthetic_bars():
+    start = to_epoch_minute("2025-10-31 09:15")
+    return {
+        str(40000 + t): [(start + m, 100.0, 101.0, 99.0, 100.0 + m % 7) for m in range(BARS_PER_TOKEN)]
+        for t in range(TOKENS)
+    }
+
+
+def subscriber(ctx, result, ready):
+    sub = ctx.socket(zmq.SUB)
+    sub.connect(ADDR)
+    sub.setsockopt_string(zmq.SUBSCRIBE, "MARKET:")
+    ready.set()
+
+    bars = frames = 0
+    first = last = None
+    while sub.poll(1000):
+        topic, raw_msg = sub.recv_multipart()
+        now = time.perf_counter()
+        first = first or now
+        last = now
+        bars += len(decode_messages(raw_msg))
+        frames += 1
+    sub.close()
+    result.update(bars=bars, frames=frames, elapsed=(last - first) if first else 0.0)
+
+
+def run_case(batch_size, bars):
+    feed = FeedDistributor(None, speed=0, batch_size=batch_size, bind_addr=ADDR)
+    feed.bars = bars
+
+    result, ready = {}, threading.Event()
+    t = threading.Thread(target=subscriber, args=(feed.context, result, ready))
+    t.start()
+    ready.wait()
+    time.sleep(0.5)     # slow joiner
+
+    t0 = time.perf_counter()
+    feed.replay_once()
+    send_elapsed = time.perf_counter() - t0
+    t.join()
+
+    feed.socket.close(linger=0)
+    feed.context.term()
+    return send_elapsed, result
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    bars = synthetic_bars()
+    total = TOKENS * BARS_PER_TOKEN
+
+    print(f"{total} bars ({TOKENS} tokens x {BARS_PER_TOKEN}), speed=0")
+    print(f"{'batch':>6} {'sent bars/s':>13} {'recv bars/s':>13} {'recv frames/s':>14} {'lost bars':>10}")
+    for n in BATCH_SIZES:
+        send_elapsed, r = run_case(n, bars)
+        recv_rate = r["bars"] / r["elapsed"] if r["elapsed"] else float("nan")
+        frame_rate = r["frames"] / r["elapsed"] if r["elapsed"] else float("nan")
+        print(f"{n:>6} {total / send_elapsed:>13,.0f} {recv_rate:>13,.0f} {frame_rate:>14,.0f} {total - r['bars']:>10}")
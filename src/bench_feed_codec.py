@@ -0,0 +1,54 @@
+"""
+Feed Codec Benchmark
+Encode / decode throughput and bytes per message: legacy per-tick pickle
+dict (with fromisoformat on the subscriber) vs the binary record in
+feed_codec.py.
+
+Run from repo root:
+    python src/bench_feed_codec.py
+"""
+
+import pickle
+import time
+from datetime import datetime
+from feed_codec import WIRE_BINARY, WIRE_PICKLE, encode_bar, decode_message, to_epoch_minute
+
+N = 200000
+TOKEN = "37054"
+MINUTE_STR = "2025-10-31 09:15"
+PRICE = 25980.0
+
+
+def legacy_encode():
+    return pickle.dumps({"symbol": TOKEN, "timestamp": MINUTE_STR, "price": PRICE})
+
+def legacy_decode(raw):
+    msg = pickle.loads(raw)
+    return float(msg["price"]), datetime.fromisoformat(msg["timestamp"])
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    for _ in range(N):
+        fn(*args)
+    return N / (time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    minute = to_epoch_minute(MINUTE_STR)
+    bar = (TOKEN, minute, PRICE, PRICE, PRICE, PRICE)
+
+    rows = []
+    raw = legacy_encode()
+    rows.append(("pickle (legacy)", len(raw), timed(legacy_encode), timed(legacy_decode, raw)))
+
+    for name, fmt in (("pickle (v1)", WIRE_PICKLE), ("binary (v2)", WIRE_BINARY)):
+        raw = encode_bar(*bar, wire_format=fmt)
+        rows.append((name, len(raw),
+                     timed(lambda: encode_bar(*bar, wire_format=fmt)),
+                     timed(decode_message, raw)))
+
+    print(f"{N} messages per run")
+    print(f"{'format':<16} {'bytes/msg':>10} {'encode msg/s':>14} {'decode msg/s':>14}")
+    for name, size, enc, dec in rows:
+        print(f"{name:<16} {size:>10} {enc:>14,.0f} {dec:>14,.0f}")
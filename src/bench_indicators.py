@@ -0,0 +1,82 @@
+"""
+Indicator Microbenchmark
+Per-bar cost of the streaming indicators (indicators.py) against the old
+window-rescan implementation, for growing BB_N / RSI_N.
+
+Run from repo root:
+    python src/bench_indicators.py
+"""
+
+import random
+import time
+from collections import deque
+from indicators import BollingerBands, WilderRSI, EMA
+
+BARS = 20000
+PERIODS = [14, 20, 50, 200, 1000]
+BB_K = 2.0
+
+
+# -------------------------
+# Old window-rescan reference (list copy + full scan per bar)
+# -------------------------
+def rescan_bollinger(closes, n, k):
+    if len(closes) < n:
+        return None, None, None
+    window = list(closes)[-n:]
+    m = sum(window)/n
+    sd = (sum((v-m)**2 for v in window)/n)**0.5
+    return m - k*sd, m, m + k*sd
+
+def rescan_rsi(closes, n):
+    if len(closes) < n + 1:
+        return None
+    window = list(closes)[-(n+1):]
+    gains = losses = 0.0
+    for i in range(1, len(window)):
+        diff = window[i] - window[i-1]
+        gains += max(diff, 0)
+        losses += max(-diff, 0)
+    if losses == 0:
+        return 100
+    rs = gains / losses
+    return 100 - (100/(1+rs))
+
+
+def random_walk(n, start=26000.0, seed=7):
+    rnd = random.Random(seed)
+    price = start
+    out = []
+    for _ in range(n):
+        price += rnd.gauss(0, 8)
+        out.append(round(price, 1))
+    return out
+
+
+def bench_streaming(prices, period):
+    bb, rsi, ema = BollingerBands(period, BB_K), WilderRSI(period), EMA(period)
+    t0 = time.perf_counter()
+    for p in prices:
+        ema.update(p)
+        bb.update(p)
+        rsi.update(p)
+    return (time.perf_counter() - t0) / len(prices)
+
+def bench_rescan(prices, period):
+    closes = deque(maxlen=period + 1)
+    t0 = time.perf_counter()
+    for p in prices:
+        closes.append(p)
+        rescan_bollinger(closes, period, BB_K)
+        rescan_rsi(closes, period)
+    return (time.perf_counter() - t0) / len(prices)
+
+
+if __name__ == "__main__":
+    prices = random_walk(BARS)
+    print(f"{BARS} bars per run, time per bar (microseconds)")
+    print(f"{'period':>8} {'streaming':>12} {'rescan':>12} {'speedup':>9}")
+    for n in PERIODS:
+        s = bench_streaming(prices, n) * 1e6
+        r = bench_rescan(prices, n) * 1e6
+        print(f"{n:>8} {s:>12.2f} {r:>12.2f} {r/s:>8.1f}x")
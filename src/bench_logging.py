@@ -0,0 +1,79 @@
+"""
+Logging Overhead Benchmark
+Ticks/sec through MeanReversionStrategy.get_market_data() + process_bar()
+with the per-tick log lines written synchronously, through the queue
+listener, sampled, and with logging off.
+
+Bars are pushed straight into the strategy's MarketSubscriber queue (no
+feed process) and Telegram alerts are switched off. Log files go
+to a temporary directory; the console handler is left out.
+
+Run from repo root:
+    python src/bench_logging.py
+"""
+
+import logging
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+import log_setup
+import strategy_mean_reversion as mr
+from telegram_alert import set_alerts_enabled
+
+DAYS = 20
+MODES = [
+    # name, queued, hot level, every Nth tick
+    ("sync, every tick", False, logging.INFO, 1),
+    ("queued, every tick", True, logging.INFO, 1),
+    ("queued, every 10th", True, logging.DEBUG, 10),
+    ("off", True, None, 1),
+]
+
+
+def make_bars(days=DAYS, seed=7):
+    rng = random.Random(seed)
+    price = 25000.0
+    bars = []
+    day = datetime(2025, 11, 3, 9, 15)
+    for _ in range(days):
+        for i in range(360):            # 09:15 - 15:14, before square-off
+            price += rng.gauss(0, 8)
+            bars.append({"symbol": mr.SYMBOL_TOKEN, "timestamp": day + timedelta(minutes=i),
+                         "price": round(price, 2)})
+        day += timedelta(days=1)
+    return bars
+
+
+def run(bars, log_dir, queued, level, every):
+    log_file = os.path.join(log_dir, "mean_reversion.log")
+    mr.logger = log_setup.get_logger("MeanReversionStrategy", log_file, console_level=None, queued=queued)
+    strategy = mr.MeanReversionStrategy(feed_addr="tcp://localhost:5699", snapshot_addr=None)
+    strategy.hot = log_setup.TickLog(mr.logger, level=level, every=every)
+    strategy.market.pending.extend(bars)
+
+    t0 = time.perf_counter()
+    for _ in range(len(bars)):
+        strategy.process_bar(strategy.get_market_data(timeout_ms=0))
+    tick_s = time.perf_counter() - t0
+
+    log_setup._close("MeanReversionStrategy")    # drain the queue
+    total_s = time.perf_counter() - t0
+    strategy.market.close()
+    strategy.context.term()
+
+    with open(log_file) as f:
+        lines = sum(1 for _ in f)
+    return len(bars) / tick_s, len(bars) / total_s, lines
+
+
+if __name__ == "__main__":
+    set_alerts_enabled(False)
+    bars = make_bars()
+    print(f"{len(bars)} ticks")
+    print(f"{'mode':>20} {'ticks/s':>10} {'incl. drain':>12} {'log lines':>10}")
+    for name, queued, level, every in MODES:
+        with tempfile.TemporaryDirectory() as log_dir:
+            rate, drained, lines = run(bars, log_dir, queued, level, every)
+        print(f"{name:>20} {rate:>10,.0f} {drained:>12,.0f} {lines:>10}")
@@ -0,0 +1,101 @@
+"""
+Margin Engine Benchmark
+Pre-trade margin check cost with a growing book, and the hedge offsets
+the scenario scan gives.
+
+• check_order latency (p50 / p99) with 10 / 100 / 500 open option and
+  futures legs on one underlying, RMS with and without a MarginEngine.
+• fill() (incremental re-pricing) cost at the same sizes.
+• Short straddle vs its legs margined alone, and a short future hedged
+  by a long call.
+
+Uses a synthetic contract master (no data files needed).
+
+Run from repo root:
+    python src/bench_margin_engine.py
+"""
+
+import logging
+import time
+import numpy as np
+from margin_engine import MarginEngine
+from simulator_rms import RMS
+
+SPOT = 25000.0
+STRIKES = range(20000, 30000, 10)           # 1000 strikes x CE / PE
+CHECKS = 2000
+
+
+def contract_master():
+    contracts = [("26000", "NIFTY-SPOT"), ("52889", "NIFTY25NOVFUT")]
+    token = 60001
+    for strike in STRIKES:
+        for kind in ("CE", "PE"):
+            contracts.append((str(token), f"NIFTY25NOV{strike}{kind}"))
+            token += 1
+    return contracts
+
+
+def premium(strike, kind):
+    intrinsic = max(SPOT - strike, 0.0) if kind == "CE" else max(strike - SPOT, 0.0)
+    return intrinsic + 100.0
+
+
+def book(engine, legs):
+    """Open `legs` alternating short / long option positions around the money, plus a future."""
+    engine.update_price("26000", SPOT)
+    engine.fill("52889", 5, SPOT)
+    token = 60001 + 2 * (len(STRIKES) // 2 - legs // 4)      # strikes centred on SPOT
+    for n in range(legs - 1):
+        strike = STRIKES[(token - 60001) // 2]
+        kind = "CE" if token % 2 else "PE"
+        engine.fill(str(token), -1 if n % 2 else 2, premium(strike, kind))
+        token += 1
+    return token
+
+
+def percentiles(fn, n=CHECKS):
+    out = np.empty(n)
+    for i in range(n):
+        t0 = time.perf_counter_ns()
+        fn(i)
+        out[i] = time.perf_counter_ns() - t0
+    return np.percentile(out / 1000, [50, 99])
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    contracts = contract_master()
+    print(f"{len(contracts)} contracts, {CHECKS} checks per case")
+    print(f"{'legs':>6} {'margin':>12} {'plain p50':>10} {'check p50':>10} {'check p99':>10} {'fill p50':>10}  (us)")
+
+    plain = RMS(max_exposure=10**6, max_daily_loss=float("inf"))
+    plain_p50, _ = percentiles(lambda i: plain.check_order("60999", "SELL", 1, 150.0))
+
+    for legs in (10, 100, 500):
+        engine = MarginEngine(contracts)
+        next_token = book(engine, legs)
+        rms = RMS(max_exposure=10**6, max_daily_loss=float("inf"), margin=engine, max_margin=float("inf"))
+        symbol = str(next_token)
+
+        # each accepted check reserves exposure only; the margin book stays at `legs`
+        check_p50, check_p99 = percentiles(lambda i: rms.check_order(symbol, "SELL", 1, 150.0))
+        fill_p50, _ = percentiles(lambda i: engine.fill(symbol, 1 if i % 2 else -1, 150.0))
+        print(f"{legs:>6} {engine.total():>12,.0f} {plain_p50:>10.1f} {check_p50:>10.1f} "
+              f"{check_p99:>10.1f} {fill_p50:>10.1f}")
+
+    # -------------------------
+    # Offsets
+    # -------------------------
+    engine = MarginEngine(contracts)
+    engine.update_price("26000", SPOT)
+    index = {description: token for token, description in contracts}
+    ce, pe = index["NIFTY25NOV25000CE"], index["NIFTY25NOV25000PE"]
+    call = engine.what_if([(ce, "SELL", 1, 200.0)])
+    put = engine.what_if([(pe, "SELL", 1, 200.0)])
+    straddle = engine.what_if([(ce, "SELL", 1, 200.0), (pe, "SELL", 1, 200.0)])
+    print(f"\nshort straddle {straddle:,.2f} vs legs alone {call:,.2f} + {put:,.2f} = {call + put:,.2f}")
+
+    future = engine.what_if([("52889", "SELL", 1, SPOT)])
+    hedged = engine.what_if([("52889", "SELL", 1, SPOT), (ce, "BUY", 1, 200.0)])
+    print(f"short future {future:,.2f}, hedged with a long ATM call {hedged:,.2f}")
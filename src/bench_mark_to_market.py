@@ -0,0 +1,68 @@
+"""
+Mark-to-Market Benchmark
+Cost per price tick of portfolio unrealized PnL with P open positions:
+full recompute over every position (the old get_unrealized_pnl, which
+needs the whole market_prices dict) vs. OMS.update_price (one symbol
+re-marked, running total adjusted). Both give the same PnL.
+
+Logging is disabled.
+
+Run from repo root:
+    python src/bench_mark_to_market.py
+"""
+
+import logging
+import random
+import time
+from records import Side
+from simulator_oms import OMS
+from simulator_rms import RMS
+
+POSITION_COUNTS = [10, 100, 500]
+TICKS = 200000
+
+
+def full_recompute(positions, market_prices):
+    pnl = 0
+    for sym, pos in positions.items():
+        if pos.side is Side.BUY:
+            pnl += (market_prices[sym] - pos.avg_price) * pos.qty
+        else:
+            pnl += (pos.avg_price - market_prices[sym]) * pos.qty
+    return pnl
+
+
+def run(count, ticks=TICKS, seed=3):
+    rng = random.Random(seed)
+    oms = OMS(rms=RMS(max_exposure=10**6, max_daily_loss=float("inf")))
+    symbols = [str(60000 + i) for i in range(count)]
+    prices = {}
+    for i, sym in enumerate(symbols):
+        prices[sym] = 100.0 + i
+        oms.place_order(sym, Side.BUY if i % 2 else Side.SELL, 1 + i % 5, prices[sym], timestamp=i + 1)
+        oms.update_price(sym, prices[sym])
+    updates = [(symbols[rng.randrange(count)], rng.uniform(50.0, 300.0)) for _ in range(ticks)]
+
+    t0 = time.perf_counter()
+    for sym, price in updates:
+        prices[sym] = price
+        full = full_recompute(oms.positions, prices)
+    full_s = time.perf_counter() - t0
+
+    update_price = oms.update_price
+    t0 = time.perf_counter()
+    for sym, price in updates:
+        incremental = update_price(sym, price)
+    incremental_s = time.perf_counter() - t0
+
+    oms.close()
+    return full_s / ticks * 1e6, incremental_s / ticks * 1e6, full, incremental
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print(f"{'positions':>9} {'full (us/tick)':>15} {'incremental (us/tick)':>22} {'speedup':>8}  PnL check")
+    for count in POSITION_COUNTS:
+        full_us, inc_us, full, incremental = run(count)
+        print(f"{count:>9} {full_us:>15.2f} {inc_us:>22.3f} {full_us / inc_us:>7.0f}x  "
+              f"{full:.2f} vs {incremental:.2f}")
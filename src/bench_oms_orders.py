@@ -0,0 +1,58 @@
+"""
+OMS Order Throughput Benchmark
+place_order() throughput at 1e5 and 1e6 orders with the indexed, bounded
+order store, and how many orders / fills stay in memory.
+
+Logging is disabled so the numbers show order-book cost, not log I/O.
+
+Run from repo root:
+    python src/bench_oms_orders.py
+"""
+
+import logging
+import gc
+import os
+import time
+from simulator_oms import OMS
+from simulator_rms import RMS
+
+SYMBOLS = ["26000", "37054", "52889", "52896"]
+ORDER_COUNTS = [100000, 1000000]
+
+
+def rss_mb():
+    """Current resident set size (Linux)."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def run(n, **store_kwargs):
+    oms = OMS(rms=RMS(max_exposure=10, max_daily_loss=float("inf")), **store_kwargs)
+    t0 = time.perf_counter()
+    for i in range(n):
+        side = "BUY" if (i // len(SYMBOLS)) % 2 == 0 else "SELL"
+        oms.place_order(SYMBOLS[i % len(SYMBOLS)], side, 1, 25000.0 + i % 50, timestamp=i)
+    elapsed = time.perf_counter() - t0
+
+    # indexed lookups on the final book
+    t1 = time.perf_counter()
+    for i in range(n - 1000, n):
+        oms.get_order(i + 1)
+    oms.get_orders(symbol="26000")
+    lookup_us = (time.perf_counter() - t1) * 1e6
+    oms.store.close()
+    return oms, elapsed, lookup_us
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print(f"{'orders':>9} {'bound':>8} {'orders/s':>11} {'in-memory orders':>17} {'fills':>8} {'lookups (us)':>13} {'RSS growth (MB)':>16}")
+    for n in ORDER_COUNTS:
+        for bound in (10000, None):
+            gc.collect()
+            base = rss_mb()
+            oms, elapsed, lookup_us = run(n, max_orders=bound, max_fills=bound)
+            growth = rss_mb() - base
+            print(f"{n:>9} {str(bound):>8} {n / elapsed:>11,.0f} {len(oms.store.orders):>17} "
+                  f"{len(oms.store.fills):>8} {lookup_us:>13.1f} {growth:>16.1f}")
+            del oms
@@ -0,0 +1,96 @@
+"""
+OMS Service Latency Benchmark
+place_order() round trip: in-process OMS vs OMSClient -> OMSService over
+tcp and ipc (p50 / p99 / max), plus pipelined throughput with WINDOW
+orders in flight.
+
+The service runs in a child process without a journal; logging is
+disabled in both processes, so the numbers are OMS + transport cost.
+
+Run from repo root:
+    python src/bench_oms_service.py
+"""
+
+import logging
+import multiprocessing
+import tempfile
+import time
+import numpy as np
+from simulator_oms import OMS
+from simulator_rms import RMS
+from oms_client import OMSClient
+
+SYMBOLS = ["26000", "37054", "52889", "52896"]
+ORDERS = 20000
+WINDOW = 64
+
+
+def make_rms():
+    return RMS(max_exposure=10, max_daily_loss=float("inf"))
+
+
+def order_args(i):
+    side = "BUY" if (i // len(SYMBOLS)) % 2 == 0 else "SELL"
+    return SYMBOLS[i % len(SYMBOLS)], side, 1, 25000.0 + i % 50, i + 1
+
+
+def serve(addr, ready):
+    logging.disable(logging.CRITICAL)
+    from oms_service import OMSService
+    service = OMSService(addr, rms=make_rms(), journal_file=None)
+    ready.set()
+    service.run()
+
+
+def latencies(place, n=ORDERS):
+    out = np.empty(n)
+    for i in range(n):
+        args = order_args(i)
+        t0 = time.perf_counter_ns()
+        place(*args)
+        out[i] = time.perf_counter_ns() - t0
+    return out / 1000      # us
+
+
+def pipelined(client, n=ORDERS, window=WINDOW):
+    in_flight = []
+    t0 = time.perf_counter()
+    for i in range(n):
+        in_flight.append(client.submit_order(*order_args(i)))
+        if len(in_flight) >= window:
+            client.result(in_flight.pop(0))
+    for req_id in in_flight:
+        client.result(req_id)
+    return n / (time.perf_counter() - t0)
+
+
+def report(label, us):
+    p50, p99 = np.percentile(us, [50, 99])
+    print(f"{label:>18} {p50:>9.1f} {p99:>9.1f} {us.max():>9.1f} {len(us) / (us.sum() / 1e6):>14,.0f}")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print(f"{ORDERS} orders per case, pipelined window {WINDOW}")
+    print(f"{'path':>18} {'p50 us':>9} {'p99 us':>9} {'max us':>9} {'orders/s':>14}")
+
+    oms = OMS(rms=make_rms())
+    report("in-process", latencies(oms.place_order))
+    oms.close()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, addr in (("tcp", "tcp://127.0.0.1:5607"), ("ipc", f"ipc://{tmp}/oms.sock")):
+            ready = multiprocessing.Event()
+            proc = multiprocessing.Process(target=serve, args=(addr, ready), daemon=True)
+            proc.start()
+            ready.wait()
+
+            client = OMSClient(addr)
+            client.place_order(*order_args(0))      # connect / warm up
+            report(f"{name} round trip", latencies(client.place_order))
+            rate = pipelined(client)
+            print(f"{name + ' pipelined':>18} {'':>9} {'':>9} {'':>9} {rate:>14,.0f}")
+            client.close()
+
+            proc.terminate()
+            proc.join()
@@ -0,0 +1,75 @@
+"""
+Option Chain Pricing Benchmark
+price_chain() time for STRIKES strikes x CE / PE x 375 minutes (one
+session) and a 5-session week, vs pricing each option bar with a scalar
+math.erf Black-Scholes loop.
+
+Uses a random-walk spot series (no data files needed).
+
+Run from repo root:
+    python src/bench_option_chain.py
+"""
+
+import math
+import time
+import numpy as np
+from option_chain import price_chain, strike_grid, expiry_minute, VolSurface, RATE, MINUTES_PER_YEAR, STRIKES
+
+SESSION = 375
+SPOT = 25000.0
+EXPIRY = "25NOV"
+REPEATS = 20
+
+
+def spot_series(minutes, seed=0):
+    close = SPOT * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.0005, minutes)))
+    start = expiry_minute(EXPIRY) - 20 * 1440
+    return np.arange(start, start + minutes), np.stack([close, close * 1.0003, close * 0.9997, close])
+
+
+def scalar_chain(minutes, underlying, strikes, surface):
+    """Same prices, one option bar at a time (close only)."""
+    expiry = expiry_minute(EXPIRY)
+    n = lambda x: 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
+    out = []
+    for minute, spot in zip(minutes.tolist(), underlying[3].tolist()):
+        t = max(expiry - minute, 1.0) / MINUTES_PER_YEAR
+        forward = spot * math.exp(RATE * t)
+        for strike in strikes.tolist():
+            sigma = max(surface.atm + surface.skew * math.log(strike / forward), surface.floor)
+            vol_t = sigma * math.sqrt(t)
+            d1 = (math.log(forward / strike) + 0.5 * vol_t * vol_t) / vol_t
+            d2 = d1 - vol_t
+            df = math.exp(-RATE * t)
+            out.append((df * (forward * n(d1) - strike * n(d2)), df * (strike * n(-d2) - forward * n(-d1))))
+    return out
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == "__main__":
+    surface = VolSurface(atm=0.14, skew=-0.1)
+    print(f"{'case':>26} {'option bars':>12} {'vectorized ms':>14} {'scalar ms':>10} {'x':>6}")
+    for label, sessions in (("1 session", 1), ("5 sessions", 5)):
+        minutes, underlying = spot_series(SESSION * sessions)
+        grid = strike_grid(underlying[3], strikes=STRIKES)[:STRIKES]
+        vec = best_of(lambda: price_chain(minutes, underlying, grid, EXPIRY, surface))
+        scalar = best_of(lambda: scalar_chain(minutes, underlying, grid, surface), repeats=3) * 4   # x 4 OHLC
+        bars = len(grid) * 2 * len(minutes)
+        print(f"{f'{label}, {len(grid)} strikes':>26} {bars:>12,} {vec * 1000:>14.1f} {scalar * 1000:>10.1f} "
+              f"{scalar / vec:>6.0f}")
+
+    # vectorized and scalar agree (close, before tick rounding)
+    minutes, underlying = spot_series(SESSION)
+    grid = strike_grid(underlying[3], strikes=STRIKES)[:STRIKES]
+    calls, puts = price_chain(minutes, underlying, grid, EXPIRY, surface)
+    ref = np.array(scalar_chain(minutes, underlying, grid, surface)).reshape(len(minutes), len(grid), 2)
+    err = max(np.abs(calls[3].T - np.maximum(ref[..., 0], 0.05)).max(), np.abs(puts[3].T - np.maximum(ref[..., 1], 0.05)).max())
+    print(f"\nmax |vectorized - scalar| = {err:.3f} (prices rounded to 0.01)")
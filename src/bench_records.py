@@ -0,0 +1,95 @@
+"""
+Record Layout Benchmark
+Dict orders/fills (the previous OMS layout) vs the slotted records in
+records.py: bytes per record, creation rate and field-access rate.
+
+Run from repo root:
+    python src/bench_records.py
+"""
+
+import time
+import tracemalloc
+from datetime import datetime
+from records import Order, Fill, Side, OrderStatus
+
+N = 200000
+TS = datetime(2025, 11, 20, 9, 20)
+BUY = Side.BUY
+FILLED = OrderStatus.FILLED
+
+
+def make_dict_order(i):
+    return {
+        "order_id": i,
+        "symbol": "26000",
+        "side": "BUY",
+        "qty": 1,
+        "price": 25000.0,
+        "timestamp": TS,
+        "status": "NEW"
+    }
+
+
+def make_dict_fill(i):
+    return {
+        "order_id": i,
+        "symbol": "26000",
+        "side": "BUY",
+        "qty": 1,
+        "filled_price": 25001.5,
+        "timestamp": TS
+    }
+
+
+def make_slot_order(i):
+    return Order(i, "26000", BUY, 1, 25000.0, TS)
+
+
+def make_slot_fill(i):
+    return Fill(i, "26000", BUY, 1, 25001.5, TS)
+
+
+def bytes_per_record(factory):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    records = [factory(i) for i in range(N)]
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    # the list holding them costs one pointer per record in both layouts
+    return used / len(records) - 8
+
+
+def creation_rate(factory):
+    t0 = time.perf_counter()
+    for i in range(N):
+        factory(i)
+    return N / (time.perf_counter() - t0)
+
+
+def dict_access_rate(records):
+    t0 = time.perf_counter()
+    for r in records:
+        r["status"] = "FILLED" if r["side"] == "BUY" and r["qty"] > 0 else r["status"]
+    return len(records) / (time.perf_counter() - t0)
+
+
+def slot_access_rate(records):
+    t0 = time.perf_counter()
+    for r in records:
+        r.status = FILLED if r.side is BUY and r.qty > 0 else r.status
+    return len(records) / (time.perf_counter() - t0)
+
+
+if __name__ == "__main__":
+    print(f"{'record':>12} {'bytes/record':>13} {'created/s':>12} {'accessed/s':>12}")
+    rows = [
+        ("dict order", make_dict_order, dict_access_rate),
+        ("Order", make_slot_order, slot_access_rate),
+        ("dict fill", make_dict_fill, None),
+        ("Fill", make_slot_fill, None),
+    ]
+    for name, factory, access in rows:
+        size = bytes_per_record(factory)
+        created = creation_rate(factory)
+        accessed = f"{access([factory(i) for i in range(N)]):>12,.0f}" if access else f"{'-':>12}"
+        print(f"{name:>12} {size:>13.0f} {created:>12,.0f} {accessed}")
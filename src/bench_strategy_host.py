@@ -0,0 +1,136 @@
+"""
+Strategy Host Benchmark
+CPU time and memory of N MeanReversionStrategy configurations run as
+N processes (one interpreter, ZMQ context and decoder each, like run.py)
+vs. one StrategyHost process, on the same feed.
+
+• The feed is published from this process on a local PUB socket: DAYS
+  days of 1-minute bars for the strategy token, then a 15:30 bar that
+  ends every strategy. Publishing starts once every child has subscribed.
+• Children run without journals, Telegram alerts or hot-path log lines.
+• CPU = user + sys of the children, memory = sum of their peak RSS
+  (os.wait4), so interpreter start-up and imports are included.
+
+Run from repo root:
+    python src/bench_strategy_host.py [strategies]
+"""
+
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+import zmq
+from feed_codec import encode_bar, to_epoch_minute
+
+ADDR = "tcp://127.0.0.1:5603"
+DAYS = 20
+CONFIGS = [
+    {"bb_n": bb_n, "bb_k": bb_k, "ema_n": ema_n}
+    for bb_n in (10, 20, 30) for bb_k in (1.5, 2.0) for ema_n in (10, 20)
+]
+
+
+# -------------------------
+# Children
+# -------------------------
+def child(mode, n, ready_fd):
+    """mode "process": one strategy with config n; mode "host": n strategies in one StrategyHost."""
+    from telegram_alert import set_alerts_enabled
+    set_alerts_enabled(False)
+
+    if mode == "process":
+        import strategy_mean_reversion as mr
+        strat = mr.MeanReversionStrategy(feed_addr=ADDR, snapshot_addr=None, journal_file=None,
+                                         **CONFIGS[n % len(CONFIGS)])
+        run = strat.run
+    else:
+        import strategy_host
+        host = strategy_host.StrategyHost(ADDR, snapshot_addr=None)
+        for i in range(n):
+            strategy_host.host_mean_reversion(host, f"MR{i}", journal=False, **CONFIGS[i % len(CONFIGS)])
+        run = host.run
+
+    os.write(ready_fd, b"1")
+    os.close(ready_fd)
+    run()
+
+
+def spawn(mode, arg):
+    """Start one child; returns (Popen, read end of its ready pipe)."""
+    r, w = os.pipe()
+    env = dict(os.environ, LOG_HOT="OFF")
+    proc = subprocess.Popen([sys.executable, __file__, "--child", mode, str(arg), str(w)],
+                            pass_fds=(w,), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(w)
+    return proc, r
+
+
+# -------------------------
+# Feed
+# -------------------------
+def make_frames(token, days=DAYS, seed=7):
+    rng = random.Random(seed)
+    price = 25000.0
+    frames = []
+    day = datetime(2025, 11, 3, 9, 15)
+    for _ in range(days):
+        for i in range(375):            # 09:15 - 15:29
+            price += rng.gauss(0, 8)
+            minute = to_epoch_minute(day + timedelta(minutes=i))
+            frames.append(encode_bar(token, minute, price, price, price, price))
+        day += timedelta(days=1)
+    last = to_epoch_minute(day - timedelta(days=1) + timedelta(minutes=375))   # 15:30
+    frames.append(encode_bar(token, last, price, price, price, price))
+    return frames
+
+
+def run_case(pub, topic, frames, mode, strategies):
+    if mode == "process":
+        children = [spawn(mode, i) for i in range(strategies)]
+    else:
+        children = [spawn(mode, strategies)]
+
+    for _, r in children:
+        os.read(r, 1)
+        os.close(r)
+    time.sleep(0.5)     # slow joiner
+
+    t0 = time.perf_counter()
+    for frame in frames:
+        pub.send_multipart([topic, frame])
+
+    cpu_s = rss_kb = 0
+    for proc, _ in children:
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        cpu_s += usage.ru_utime + usage.ru_stime
+        rss_kb += usage.ru_maxrss
+    return cpu_s, rss_kb / 1024, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]))
+        sys.exit(0)
+
+    from load_csv import get_exchange_instrument_id
+    token = str(get_exchange_instrument_id("NIFTY25NOVFUT"))
+    strategies = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+
+    ctx = zmq.Context()
+    pub = ctx.socket(zmq.PUB)
+    pub.setsockopt(zmq.SNDHWM, 0)       # no drops: every child sees every bar
+    pub.bind(ADDR)
+    frames = make_frames(token)
+    topic = f"MARKET:{token}".encode()
+
+    print(f"{strategies} strategies, {len(frames)} bars")
+    print(f"{'mode':>22} {'CPU s':>8} {'peak RSS MB':>12} {'feed->done s':>13}")
+    for mode, label in (("process", "process per strategy"), ("host", "one strategy host")):
+        cpu_s, rss_mb, wall_s = run_case(pub, topic, frames, mode, strategies)
+        print(f"{label:>22} {cpu_s:>8.2f} {rss_mb:>12.1f} {wall_s:>13.2f}")
+
+    pub.close()
+    ctx.term()
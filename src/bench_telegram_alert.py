@@ -0,0 +1,89 @@
+"""
+Telegram Alert Benchmark
+Tick-loop latency with a synchronous requests.post per alert (old path)
+vs the background TelegramDispatcher, against a local stub HTTP server
+that answers every post after STUB_DELAY seconds.
+
+Also checks that every queued alert reached the stub after flush() and
+how many posts the coalescing needed.
+
+Run from repo root:
+    python src/bench_telegram_alert.py
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+import requests
+from telegram_alert import TelegramDispatcher, PRIORITY_TRADE, PRIORITY_INFO
+
+STUB_DELAY = 0.05
+TICKS = 2000
+ALERT_EVERY = 50        # one alert per 50 ticks -> 40 alerts
+
+
+class StubTelegram(BaseHTTPRequestHandler):
+    received = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+        text = parse_qs(body).get("text", [""])[0]
+        time.sleep(STUB_DELAY)
+        with self.lock:
+            self.received.append(text)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"ok":true}')
+
+    def log_message(self, *args):
+        pass
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def tick_loop(alert):
+    latencies = []
+    for i in range(TICKS):
+        t0 = time.perf_counter()
+        if i % ALERT_EVERY == 0:
+            priority = PRIORITY_TRADE if i % (2 * ALERT_EVERY) == 0 else PRIORITY_INFO
+            alert(f"alert {i}", priority)
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def report(name, latencies):
+    us = [v * 1e6 for v in latencies]
+    print(f"{name:<12} total={sum(latencies)*1e3:9.1f} ms  p50={percentile(us, 50):7.1f} us  "
+          f"p99={percentile(us, 99):9.1f} us  max={max(us):9.1f} us")
+
+
+if __name__ == "__main__":
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubTelegram)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/sendMessage"
+    alerts = TICKS // ALERT_EVERY
+
+    def sync_post(message, priority):
+        requests.post(url, data={"chat_id": "0", "text": message}, timeout=5)
+
+    print(f"{TICKS} ticks, {alerts} alerts, stub delay {STUB_DELAY*1e3:.0f} ms")
+    report("sync", tick_loop(sync_post))
+
+    StubTelegram.received.clear()
+    dispatcher = TelegramDispatcher(url=url, chat_id="0", min_interval=0.2, coalesce_window=0.05)
+    report("dispatcher", tick_loop(dispatcher.send))
+
+    t0 = time.perf_counter()
+    dispatcher.flush()
+    dispatcher.shutdown()
+    delivered = sum(text.count("alert ") for text in StubTelegram.received)
+    print(f"flush took {(time.perf_counter() - t0)*1e3:.1f} ms, "
+          f"{delivered}/{alerts} alerts delivered in {len(StubTelegram.received)} posts, dropped={dispatcher.dropped}")
+    server.shutdown()
@@ -0,0 +1,373 @@
+"""
+Tick-to-Order Latency Benchmark
+End-to-end latency from FeedDistributor.publish() to MeanReversionStrategy
+holding its fill, over inproc / ipc / tcp, with the OMS in-process or
+behind OMSService on the same transport.
+
+The path is the production code: FeedDistributor.publish() (with
+trace=time.monotonic_ns it stamps every bar and sends the stamps as an
+extra frame), MarketSubscriber, and the strategy's get_market_data() /
+on_bar() with its logging, marks, RMS reservations and entry / exit
+rules. The harness only wraps methods on the strategy's instances to
+take time.monotonic_ns (one system-wide clock, so stamps from the feed
+process compare with the strategy's):
+    publish     feed, when publish() is called (trace frame, "sent_ns")
+    recv        MarketSubscriber.recv() returned the decoded bar
+    indicators  update_indicators() returned, inside process_bar()
+    done        on_bar() returned: entry / exit decided, any order filled
+    fill        the tick's last place_order() returned (ticks with orders)
+and, as a duration rather than a stamp:
+    rms         time inside rms.reserve / rms.check_basket on the tick
+                (ticks with an RMS check): the strategy's reservations,
+                and with the in-process OMS also the check it runs for
+                exits; with the service it is the round trip to it
+
+The strategy runs with fast indicator settings (BENCH_PARAMS) on a random
+walk, so about one tick in five places an order through its own entry /
+exit rules: publish -> done covers every tick, publish -> fill the ticks
+that traded.
+
+Each case runs twice:
+    paced   PACED_RATE ticks/s (ReplayClock): latency without queueing
+    max     as fast as the feed can send: sustained ticks/s, where
+            latency includes time spent queued behind earlier ticks
+
+The feed and OMS service run in child processes for ipc / tcp and in
+threads for inproc. Component logs and journals go to a temporary
+directory (no console output), Telegram alerts are off. The strategy's
+symbol comes from ./data/contracts.csv, so run from repo root.
+
+Results (p50 / p90 / p99 / max per stage, a log-binned histogram of
+publish -> done, ticks/s, git commit) are written as JSON:
+    python src/bench_tick_to_order.py [--ticks N] [--out file.json]
+    python src/bench_tick_to_order.py --compare old.json new.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+import numpy as np
+import zmq
+import log_setup
+from feed_codec import to_epoch_minute
+from market_subscriber import MarketSubscriber
+from simulator_feed_distributor import FeedDistributor
+from telegram_alert import set_alerts_enabled
+import strategy_mean_reversion as mr
+
+TICKS = 5000
+PACED_RATE = 1000           # ticks/s
+SESSION = 360               # bars per day, 09:15 - 15:14 (before the strategy's square-off)
+BENCH_PARAMS = {"bb_n": 5, "bb_k": 0.5, "rsi_n": 2, "ema_n": 50}
+STAGES = ("recv", "indicators", "done")      # stamp differences; "rms" is a duration
+HIST_EDGES_US = [0, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000, float("inf")]
+RESULTS_DIR = "./bench_results"
+
+
+def quiet_logs(log_dir):
+    """Component logs to files in log_dir only (same loggers, reconfigured; the table goes to stdout)."""
+    import oms_service
+    for name in ("FeedDistributor", "MeanReversionStrategy", "OMS", "RMS", "OMSService"):
+        log_setup.get_logger(name, os.path.join(log_dir, f"{name}.log"), console_level=None)
+    return oms_service
+
+
+# -------------------------
+# Feed side
+# -------------------------
+def synthetic_bars(ticks, seed=0):
+    start = to_epoch_minute("2025-11-03 09:15")
+    closes = 25000 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.0005, ticks)))
+    minutes = [start + (i // SESSION) * 1440 + i % SESSION for i in range(ticks)]
+    return {mr.SYMBOL_TOKEN: [(m, c, c, c, c) for m, c in zip(minutes, closes.tolist())]}
+
+
+def make_feed(addr, ticks, paced):
+    feed = FeedDistributor(None, speed=0, bind_addr=addr, snapshot_addr=None, trace=time.monotonic_ns,
+                           replay_speed=60 * PACED_RATE if paced else "max")
+    feed.socket.setsockopt(zmq.SNDHWM, 0)
+    feed.bars = synthetic_bars(ticks)
+    return feed
+
+
+def serve_feed(addr, ticks, paced, log_dir, ready, go):
+    quiet_logs(log_dir)
+    feed = make_feed(addr, ticks, paced)
+    ready.set()
+    go.wait()
+    feed.replay_once()
+    feed.socket.close()         # default linger: everything queued is still delivered
+    feed.context.term()
+
+
+def serve_oms(addr, journal_file, ready, log_dir=None, stop=None):
+    """OMSService with its default RMS; log_dir reconfigures logging (child processes)."""
+    from oms_service import OMSService
+    if log_dir:
+        quiet_logs(log_dir)
+    service = OMSService(addr, journal_file=journal_file)
+    ready.set()
+    service.run(stop)
+
+
+# -------------------------
+# Strategy side
+# -------------------------
+def run_strategy(strat, ticks, timeout_ms=2000):
+    """
+    Drive the strategy like its run() loop (get_market_data -> on_bar) until
+    `ticks` bars arrived or the feed went quiet. Returns stamps (n, 4):
+    publish / recv / indicators / done, fills (n,): the fill stamp, 0 for
+    ticks without an order, and rms (n,): time spent in RMS checks, 0 for
+    ticks without one; all in ns.
+    """
+    stamps = np.zeros((ticks, 4), dtype=np.int64)
+    fills = np.zeros(ticks, dtype=np.int64)
+    rms = np.zeros(ticks, dtype=np.int64)
+    n = 0
+    depth = 0       # RMS.reserve calls check_basket: time the outermost call only
+
+    recv, update_indicators, place_order = strat.market.recv, strat.update_indicators, strat.oms.place_order
+
+    def timed_recv(timeout_ms=1000):
+        msg = recv(timeout_ms)
+        if msg is not None:
+            stamps[n, 1] = time.monotonic_ns()
+            stamps[n, 0] = msg["sent_ns"]
+        return msg
+
+    def timed_update_indicators(close_price):
+        result = update_indicators(close_price)
+        stamps[n, 2] = time.monotonic_ns()
+        return result
+
+    def timed_place_order(*args, **kwargs):
+        result = place_order(*args, **kwargs)
+        fills[n] = time.monotonic_ns()
+        return result
+
+    def timed_rms(check):
+        def timed(*args, **kwargs):
+            nonlocal depth
+            depth += 1
+            t0 = time.monotonic_ns()
+            try:
+                return check(*args, **kwargs)
+            finally:
+                depth -= 1
+                if not depth:
+                    rms[n] += time.monotonic_ns() - t0
+        return timed
+
+    strat.market.recv = timed_recv
+    strat.update_indicators = timed_update_indicators
+    strat.oms.place_order = timed_place_order
+    strat.rms.reserve = timed_rms(strat.rms.reserve)
+    strat.rms.check_basket = timed_rms(strat.rms.check_basket)
+
+    while n < ticks:
+        bar = strat.get_market_data(timeout_ms)
+        if bar is None:
+            break
+        strat.on_bar(bar)
+        stamps[n, 3] = time.monotonic_ns()
+        n += 1
+    return stamps[:n], fills[:n], rms[:n]
+
+
+def summarize(stamps, fills, rms, ticks):
+    us = np.diff(stamps, axis=1) / 1000
+    total = (stamps[:, -1] - stamps[:, 0]) / 1000
+    traded = fills > 0
+    to_fill = (fills[traded] - stamps[traded, 0]) / 1000
+
+    def pct(values):
+        if not len(values):
+            return None
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        return {"p50": round(p50, 1), "p90": round(p90, 1), "p99": round(p99, 1), "max": round(values.max(), 1)}
+
+    elapsed = (stamps[-1, -1] - stamps[0, 0]) / 1e9 if len(stamps) else 0
+    counts, _ = np.histogram(total, bins=HIST_EDGES_US)
+    return {
+        "ticks_sent": ticks,
+        "ticks_done": len(stamps),
+        "orders": int(traded.sum()),
+        "rms_checks": int((rms > 0).sum()),
+        "ticks_per_s": round(len(stamps) / elapsed, 1) if elapsed > 0 else None,
+        "latency_us": {"publish_to_done": pct(total), "publish_to_fill": pct(to_fill),
+                       **{stage: pct(us[:, i]) for i, stage in enumerate(STAGES)},
+                       "rms": pct(rms[rms > 0] / 1000)},
+        "histogram_us": {"edges": [e if e != float("inf") else "inf" for e in HIST_EDGES_US], "counts": counts.tolist()},
+    }
+
+
+# -------------------------
+# Cases
+# -------------------------
+def addresses(transport, tmp):
+    if transport == "inproc":
+        return "inproc://feed", "inproc://oms"
+    if transport == "ipc":
+        return f"ipc://{tmp}/feed.sock", f"ipc://{tmp}/oms.sock"
+    return "tcp://127.0.0.1:5621", "tcp://127.0.0.1:5622"
+
+
+def run_case(transport, oms_mode, paced, ticks, tmp):
+    feed_addr, oms_addr = addresses(transport, tmp)
+    name = f"{transport}_{oms_mode}_{'paced' if paced else 'max'}"
+    oms_journal = os.path.join(tmp, f"{name}_oms.jrnl")
+    children, threads, stop = [], [], threading.Event()
+
+    if transport == "inproc":
+        feed = make_feed(feed_addr, ticks, paced)
+        context = feed.context      # inproc endpoints only connect within one context
+        go = threading.Event()
+        if oms_mode == "service":
+            # service and OMSClient share zmq.Context.instance()
+            ready = threading.Event()
+            threads.append(threading.Thread(target=serve_oms, args=(oms_addr, oms_journal, ready, None, stop),
+                                            daemon=True))
+            threads[-1].start()
+            ready.wait()
+
+        def feed_thread():
+            go.wait()
+            feed.replay_once()
+        threads.append(threading.Thread(target=feed_thread, daemon=True))
+        threads[-1].start()
+    else:
+        context = zmq.Context.instance()
+        ready, go = multiprocessing.Event(), multiprocessing.Event()
+        children.append(multiprocessing.Process(target=serve_feed, args=(feed_addr, ticks, paced, tmp, ready, go),
+                                                daemon=True))
+        if oms_mode == "service":
+            oms_ready = multiprocessing.Event()
+            children.append(multiprocessing.Process(target=serve_oms, args=(oms_addr, oms_journal, oms_ready, tmp),
+                                                    daemon=True))
+        for child in children:
+            child.start()
+        ready.wait()
+        if oms_mode == "service":
+            oms_ready.wait()
+
+    # no queue limit on the strategy's SUB socket (the feed's is off too), no linger on close
+    context.setsockopt(zmq.RCVHWM, 0)
+    context.setsockopt(zmq.LINGER, 0)
+    strat = mr.MeanReversionStrategy(snapshot_addr=None, journal_file=os.path.join(tmp, f"{name}.jrnl"),
+                                     market=MarketSubscriber(context, feed_addr),
+                                     oms_addr=oms_addr if oms_mode == "service" else None, **BENCH_PARAMS)
+    time.sleep(0.5)             # slow joiner
+    go.set()
+
+    stamps, fills, rms = run_strategy(strat, ticks)
+
+    strat.market.close()
+    strat.oms.close()
+    stop.set()
+    for child in children:
+        child.terminate()
+        child.join()
+    if transport == "inproc":
+        feed.socket.close(linger=0)
+        for t in threads:
+            t.join(1)
+        feed.context.term()
+    return summarize(stamps, fills, rms, ticks)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_case(name, result):
+    lat = result["latency_us"]
+    done, fill = lat["publish_to_done"], lat["publish_to_fill"] or {"p50": 0, "p99": 0}
+    stages = " ".join(f"{(lat.get(s) or {'p50': 0})['p50']:>8.1f}" for s in STAGES + ("rms",))
+    print(f"{name:<26} {result['ticks_done']:>6}/{result['ticks_sent']:<6} {result['orders']:>6} "
+          f"{result['ticks_per_s'] or 0:>9,.0f} {done['p50']:>8.1f} {done['p90']:>8.1f} {done['p99']:>8.1f} "
+          f"{done['max']:>9.1f} {fill['p50']:>8.1f} {fill['p99']:>8.1f}   {stages}")
+
+
+def compare(old_file, new_file):
+    old, new = (json.load(open(f)) for f in (old_file, new_file))
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    print(f"{'case':<26} {'done p50 us':>27} {'done p99 us':>27} {'fill p50 us':>27} {'rms p50 us':>27} "
+          f"{'ticks/s':>27}")
+
+    def change(x, y):
+        return f"{x:>9.1f} -> {y:<9.1f} {(y - x) / x * 100 if x else 0:+5.0f}%"
+
+    for name, result in new["cases"].items():
+        before = old["cases"].get(name)
+        if before is None or before["latency_us"].get("publish_to_done") is None:
+            continue
+        a, b = before["latency_us"], result["latency_us"]
+        fa, fb = (lat["publish_to_fill"] or {"p50": 0} for lat in (a, b))
+        ra, rb = (lat.get("rms") or {"p50": 0} for lat in (a, b))
+        print(f"{name:<26} {change(a['publish_to_done']['p50'], b['publish_to_done']['p50'])} "
+              f"{change(a['publish_to_done']['p99'], b['publish_to_done']['p99'])} {change(fa['p50'], fb['p50'])} "
+              f"{change(ra['p50'], rb['p50'])} {change(before['ticks_per_s'] or 0, result['ticks_per_s'] or 0)}")
+
+
+# -------------------------
+# Runner
+# -------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--transports", default="inproc,ipc,tcp")
+    parser.add_argument("--oms", default="local,service", help="local (in-process OMS) and / or service")
+    parser.add_argument("--out", default=None, help=f"JSON file, default {RESULTS_DIR}/tick_to_order_<commit>_<time>.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        sys.exit(0)
+    if not mr.SYMBOL_TOKEN.isdigit():
+        sys.exit("No contract token for the strategy's symbol: run from repo root (needs ./data/contracts.csv)")
+
+    set_alerts_enabled(False)
+    commit = git_commit()
+    report = {
+        "benchmark": "tick_to_order",
+        "commit": commit,
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} cpu",
+        "ticks": args.ticks,
+        "paced_rate": PACED_RATE,
+        "strategy_params": BENCH_PARAMS,
+        "cases": {},
+    }
+
+    print(f"{args.ticks} ticks per case, paced at {PACED_RATE}/s or max; latency in us")
+    print(f"{'case':<26} {'done':>13} {'orders':>6} {'ticks/s':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>9} "
+          f"{'fill p50':>8} {'fill p99':>8}   {'recv':>8} {'indic.':>8} {'done':>8} {'rms':>8}  (stage p50)")
+    with tempfile.TemporaryDirectory() as tmp:
+        quiet_logs(tmp)
+        for transport in args.transports.split(","):
+            for oms_mode in args.oms.split(","):
+                for paced in (True, False):
+                    name = f"{transport}/{oms_mode}/{'paced' if paced else 'max'}"
+                    result = report["cases"][name] = run_case(transport, oms_mode, paced, args.ticks, tmp)
+                    print_case(name, result)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"tick_to_order_{commit or 'nogit'}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nsaved {out}")
@@ -0,0 +1,87 @@
+"""
+Trade Journal Benchmark
+• append rate: group commit vs write + fsync per record
+• scan rate: np.memmap over 1e6 records (counts per kind, realized PnL,
+  fill notional per symbol), file open included
+
+Run from repo root:
+    python src/bench_trade_journal.py [journal dir]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from records import Fill, Side
+from trade_journal import (TradeJournal, read_journal, RECORD, HEADER, MAGIC, JOURNAL_VERSION,
+                           KIND_FILL, KIND_POSITION)
+
+SYMBOLS = ["26000", "37054", "52889", "52896"]
+FSYNC_EACH_RECORDS = 2000
+SCAN_RECORDS = 1000000
+
+
+def make_fill(i):
+    return Fill(i, SYMBOLS[i % len(SYMBOLS)], Side.BUY if i % 2 else Side.SELL, 1,
+                25000.0 + i % 50, 1_700_000_000_000_000 + i * 60_000_000)
+
+
+def bench_fsync_each(path, n):
+    with open(path, "ab") as f:
+        f.write(HEADER.pack(MAGIC, JOURNAL_VERSION, RECORD.size))
+        t0 = time.perf_counter()
+        for i in range(n):
+            fill = make_fill(i)
+            f.write(RECORD.pack(2, 1, 0, fill.qty, fill.order_id, fill.timestamp, 0,
+                                fill.filled_price, 0.0, 0.0, fill.symbol.encode(), b""))
+            f.flush()
+            os.fsync(f.fileno())
+        return n / (time.perf_counter() - t0)
+
+
+def bench_group_commit(path, n):
+    journal = TradeJournal(path)
+    t0 = time.perf_counter()
+    for i in range(n):
+        fill = make_fill(i)
+        journal.fill(fill)
+        journal.position(fill.symbol, None, fill.timestamp, realized_pnl=(i % 7) - 3.0, order_id=i)
+    append_s = time.perf_counter() - t0
+    journal.flush()
+    durable_s = time.perf_counter() - t0
+    journal.close()
+    records = 2 * n
+    return records / append_s, records / durable_s, journal.commits
+
+
+def bench_scan(path):
+    t0 = time.perf_counter()
+    records = read_journal(path)
+    kind = records["kind"]
+    kinds = np.bincount(kind)
+    realized = records["pnl"][kind == KIND_POSITION].sum()
+    is_fill = kind == KIND_FILL
+    symbol = records["symbol"]
+    notional = records["price"] * records["qty"]
+    by_symbol = {s: round(float(notional[is_fill & (symbol == s.encode())].sum()), 2) for s in SYMBOLS}
+    elapsed = time.perf_counter() - t0
+    return len(records), elapsed, kinds, realized, by_symbol
+
+
+if __name__ == "__main__":
+    base = sys.argv[1] if len(sys.argv) > 1 else None
+    with tempfile.TemporaryDirectory(dir=base) as tmp:
+        rate = bench_fsync_each(os.path.join(tmp, "fsync_each.jrnl"), FSYNC_EACH_RECORDS)
+        print(f"fsync per record : {rate:>12,.0f} records/s  ({FSYNC_EACH_RECORDS} records)")
+
+        path = os.path.join(tmp, "group.jrnl")
+        append_rate, durable_rate, commits = bench_group_commit(path, SCAN_RECORDS // 2)
+        print(f"group commit     : {append_rate:>12,.0f} records/s appended, "
+              f"{durable_rate:,.0f} records/s durable, {commits} fsyncs ({SCAN_RECORDS} records)")
+
+        rows, elapsed, kinds, realized, notional = bench_scan(path)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"mmap scan        : {rows:,} records ({size_mb:.1f} MB) in {elapsed * 1e3:.1f} ms "
+              f"= {rows / elapsed:,.0f} records/s")
+        print(f"                   realized={realized:.2f}, fill notional by symbol={notional}")
@@ -0,0 +1,244 @@
+"""
+Contract Master Index
+Compiled binary form of data/contracts.csv, opened with mmap so lookups
+need neither pandas nor a parse of the CSV at startup.
+
+File layout (little-endian):
+    header      16 bytes: b"CIDX", version (u2), padding (u2), rows (u4), padding
+    tokens      i8 x rows   exchangeInstrumentID, in description order
+    desc_end    u4 x rows   end offset of each description in the blob
+    by_token    u4 x rows   row numbers in token order
+    blob        UTF-8 descriptions, sorted, back to back
+
+• by description: binary search over the sorted descriptions.
+• by token: binary search over by_token.
+• by contract fields: (underlying, expiry, strike, CE / PE / FUT / SPOT)
+  compose the description ('NIFTY25NOV24800CE'), then as above.
+Only the pages a lookup touches are read.
+
+load_csv compiles the index on first use when it is missing or older than
+the CSV. Usage (from repo root):
+    python src/contract_index.py build ./data/contracts.csv ./data/contracts.idx
+    python src/contract_index.py lookup ./data/contracts.idx NIFTY-SPOT
+"""
+
+import bisect
+import csv
+import mmap
+import os
+import re
+import struct
+import sys
+
+INDEX_VERSION = 1
+MAGIC = b"CIDX"
+HEADER = struct.Struct("<4sHHI4x")
+
+DESCRIPTION_COLUMN = "Description"
+TOKEN_COLUMN = "exchangeInstrumentID"
+
+
+# -------------------------
+# Contract descriptions
+# -------------------------
+CONTRACT_RE = re.compile(r"^([A-Z]+)(\d{2}[A-Z]{3})(?:(\d+(?:\.\d+)?)(CE|PE)|FUT)$")
+
+
+def parse_description(description: str):
+    """
+    (underlying, expiry, strike, kind) for a contract description, e.g.
+    'NIFTY25NOV24800CE' -> ('NIFTY', '25NOV', 24800.0, 'CE'),
+    'NIFTY25NOVFUT'     -> ('NIFTY', '25NOV', None, 'FUT'),
+    'NIFTY-SPOT'        -> ('NIFTY', None, None, 'SPOT').
+    Returns None for descriptions in another format.
+    """
+    if description.endswith("-SPOT"):
+        return description[:-5], None, None, "SPOT"
+    m = CONTRACT_RE.match(description)
+    if m is None:
+        return None
+    underlying, expiry, strike, option_type = m.groups()
+    if option_type is None:
+        return underlying, expiry, None, "FUT"
+    return underlying, expiry, float(strike), option_type
+
+
+def make_description(underlying, expiry=None, strike=None, kind="SPOT"):
+    """Inverse of parse_description."""
+    if kind == "SPOT":
+        return f"{underlying}-SPOT"
+    if kind == "FUT":
+        return f"{underlying}{expiry}FUT"
+    strike = float(strike)
+    return f"{underlying}{expiry}{int(strike) if strike.is_integer() else strike}{kind}"
+
+
+# -------------------------
+# Build
+# -------------------------
+def read_contracts_csv(csv_path):
+    """{description: token} from the contract master CSV (later rows win, like the old dict(zip()))."""
+    rows = {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        d, t = header.index(DESCRIPTION_COLUMN), header.index(TOKEN_COLUMN)
+        for row in reader:
+            try:
+                rows[row[d]] = int(float(row[t]))
+            except (IndexError, ValueError):
+                continue        # short row / missing token
+    return rows
+
+
+def build_index(csv_path, index_path):
+    """Compile csv_path into index_path (written to a temp file, then renamed). Returns the row count."""
+    rows = read_contracts_csv(csv_path)
+    descriptions = sorted(rows, key=lambda d: d.encode())
+    encoded = [d.encode() for d in descriptions]
+    tokens = [rows[d] for d in descriptions]
+
+    ends, end = [], 0
+    for e in encoded:
+        end += len(e)
+        ends.append(end)
+    by_token = sorted(range(len(tokens)), key=tokens.__getitem__)
+
+    n = len(descriptions)
+    tmp = f"{index_path}.{os.getpid()}.tmp"        # concurrent first runs each write their own
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, INDEX_VERSION, 0, n))
+        f.write(struct.pack(f"<{n}q", *tokens))
+        f.write(struct.pack(f"<{n}I", *ends))
+        f.write(struct.pack(f"<{n}I", *by_token))
+        f.write(b"".join(encoded))
+    os.replace(tmp, index_path)
+    return n
+
+
+# -------------------------
+# Reader
+# -------------------------
+class _Keys:
+    """Sorted descriptions as a lazy sequence of bytes, for bisect."""
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return self.index.rows
+
+    def __getitem__(self, i):
+        return self.index._key(i)
+
+
+class _TokenKeys:
+    def __init__(self, index):
+        self.tokens = index.tokens
+        self.by_token = index.by_token
+
+    def __len__(self):
+        return len(self.by_token)
+
+    def __getitem__(self, i):
+        return self.tokens[self.by_token[i]]
+
+
+class ContractIndex:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path}: not a contract index")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, n = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != INDEX_VERSION:
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"{path}: not a version {INDEX_VERSION} contract index")
+
+        self.rows = n
+        view = memoryview(self._map)
+        pos = HEADER.size
+        self.tokens = view[pos:pos + 8 * n].cast("q")
+        pos += 8 * n
+        self.desc_end = view[pos:pos + 4 * n].cast("I")
+        pos += 4 * n
+        self.by_token = view[pos:pos + 4 * n].cast("I")
+        pos += 4 * n
+        self._blob = pos
+        self._views = [view, self.tokens, self.desc_end, self.by_token]
+
+    def _key(self, i):
+        start = self._blob + (self.desc_end[i - 1] if i else 0)
+        return self._map[start:self._blob + self.desc_end[i]]
+
+    def __len__(self):
+        return self.rows
+
+    def __contains__(self, description):
+        return self.token(description) is not None
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def token(self, description, default=None):
+        """exchangeInstrumentID for a description."""
+        key = description.encode()
+        i = bisect.bisect_left(_Keys(self), key)
+        if i < self.rows and self._key(i) == key:
+            return self.tokens[i]
+        return default
+
+    def description(self, token, default=None):
+        """Description for an exchangeInstrumentID (int or str)."""
+        token = int(token)
+        keys = _TokenKeys(self)
+        i = bisect.bisect_left(keys, token)
+        if i < len(keys) and keys[i] == token:
+            return self._key(self.by_token[i]).decode()
+        return default
+
+    def contract(self, underlying, expiry=None, strike=None, kind="SPOT", default=None):
+        """Token by contract fields, e.g. contract('NIFTY', '25NOV', 24800, 'CE')."""
+        return self.token(make_description(underlying, expiry, strike, kind), default)
+
+    def items(self):
+        """(description, token) for every contract, in description order."""
+        for i in range(self.rows):
+            yield self._key(i).decode(), self.tokens[i]
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+        self._file.close()
+
+
+def open_index(csv_path, index_path=None):
+    """ContractIndex for csv_path, compiling it first when the index is missing or older than the CSV."""
+    index_path = index_path or os.path.splitext(csv_path)[0] + ".idx"
+    if not os.path.exists(index_path) or (
+            os.path.exists(csv_path) and os.path.getmtime(index_path) < os.path.getmtime(csv_path)):
+        build_index(csv_path, index_path)
+    return ContractIndex(index_path)
+
+
+# -------------------------
+# CLI
+# -------------------------
+if __name__ == "__main__":
+    if len(sys.argv) >= 3 and sys.argv[1] == "build":
+        csv_path = sys.argv[2]
+        index_path = sys.argv[3] if len(sys.argv) > 3 else os.path.splitext(csv_path)[0] + ".idx"
+        print(f"{build_index(csv_path, index_path)} contracts -> {index_path}")
+    elif len(sys.argv) >= 4 and sys.argv[1] == "lookup":
+        index = ContractIndex(sys.argv[2])
+        for key in sys.argv[3:]:
+            found = index.description(key) if key.isdigit() else index.token(key)
+            print(f"{key}: {found if found is not None else 'NOT FOUND'}")
+        index.close()
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,220 @@
+"""
+Feed Wire Format
+Shared encoder / decoder for FeedDistributor messages.
+
+Every payload starts with a version byte:
+• WIRE_PICKLE (0x01) : version byte + pickled dict (legacy format)
+• WIRE_BINARY (0x02) : fixed 41-byte record
+      B  version
+      I  token id            (uint32)
+      i  epoch minute        (int32, naive exchange-local time)
+      4d open, high, low, close (float64)
+• WIRE_BATCH  (0x03) : several bars of one token in a single frame
+      B  version
+      I  token id
+      H  bar count
+      count x (i epoch minute, 4d OHLC)      36 bytes per bar
+• WIRE_OHLCV  (0x04) : fixed 51-byte aggregated bar (bar_aggregator.py)
+      B  version
+      I  token id
+      i  epoch minute of the bar's first minute
+      H  period in minutes
+      5d open, high, low, close, volume
+  (a pickle-format batch is WIRE_PICKLE + pickled list of dicts)
+
+Payloads without a version byte (plain pickle, starting with 0x80) are
+still accepted so old feeds keep working.
+
+A traced feed (FeedDistributor trace=) sends a third frame after the
+payload: one int64 publish time per bar in the frame (encode_trace).
+
+decode_message() always returns the dict shape subscribers already use:
+    {"symbol": "26000", "timestamp": datetime, "price": close,
+     "open": ..., "high": ..., "low": ..., "close": ...}
+decode_messages() returns a list of those dicts for single or batch frames.
+WIRE_OHLCV messages also carry "volume" and "period".
+"""
+
+import pickle
+import struct
+from datetime import datetime, timedelta
+
+WIRE_PICKLE = 0x01
+WIRE_BINARY = 0x02
+WIRE_BATCH = 0x03
+WIRE_OHLCV = 0x04
+
+BAR_STRUCT = struct.Struct("<BIi4d")
+BAR_SIZE = BAR_STRUCT.size
+
+OHLCV_STRUCT = struct.Struct("<BIiH5d")
+
+BATCH_HEADER = struct.Struct("<BIH")
+BATCH_BAR = struct.Struct("<i4d")
+MAX_BATCH = 0xFFFF
+
+EPOCH = datetime(1970, 1, 1)
+_ONE_MINUTE = timedelta(minutes=1)
+_PICKLE_PREFIX = pickle.dumps(None)[:1]     # protocol marker (0x80)
+
+# Bars for many tokens share the same minute, and the token set is small:
+# memoize the datetime / str conversions (cleared when they grow too large)
+_CACHE_MAX = 65536
+_ts_cache = {}
+_token_cache = {}
+
+
+# -------------------------
+# Time helpers
+# -------------------------
+def to_epoch_minute(ts):
+    """Accepts 'YYYY-MM-DD HH:MM' strings or naive datetimes."""
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    return (ts - EPOCH) // _ONE_MINUTE
+
+def from_epoch_minute(minute):
+    ts = _ts_cache.get(minute)
+    if ts is None:
+        if len(_ts_cache) >= _CACHE_MAX:
+            _ts_cache.clear()
+        ts = _ts_cache[minute] = EPOCH + timedelta(minutes=minute)
+    return ts
+
+def _token_str(token):
+    name = _token_cache.get(token)
+    if name is None:
+        if len(_token_cache) >= _CACHE_MAX:
+            _token_cache.clear()
+        name = _token_cache[token] = str(token)
+    return name
+
+
+# -------------------------
+# Encoder
+# -------------------------
+def encode_bar(token, minute, open_, high, low, close, wire_format=WIRE_BINARY):
+    """Encode one bar; `minute` is an epoch minute (see to_epoch_minute)."""
+    if wire_format == WIRE_BINARY:
+        return BAR_STRUCT.pack(WIRE_BINARY, int(token), minute, open_, high, low, close)
+    if wire_format == WIRE_PICKLE:
+        msg = {
+            "symbol": str(token),
+            "timestamp": from_epoch_minute(minute).strftime("%Y-%m-%d %H:%M"),
+            "price": close
+        }
+        return bytes((WIRE_PICKLE,)) + pickle.dumps(msg)
+    raise ValueError(f"Unknown wire format: {wire_format}")
+
+def encode_ohlcv(token, period, minute, open_, high, low, close, volume):
+    """Encode one aggregated `period`-minute bar (always binary)."""
+    return OHLCV_STRUCT.pack(WIRE_OHLCV, int(token), minute, period, open_, high, low, close, volume)
+
+def encode_batch(token, bars, wire_format=WIRE_BINARY):
+    """Encode bars [(minute, open, high, low, close), ...] of one token into one frame."""
+    if len(bars) > MAX_BATCH:
+        raise ValueError(f"Batch too large: {len(bars)} > {MAX_BATCH}")
+    if wire_format == WIRE_BINARY:
+        parts = [BATCH_HEADER.pack(WIRE_BATCH, int(token), len(bars))]
+        parts.extend(BATCH_BAR.pack(*bar) for bar in bars)
+        return b"".join(parts)
+    if wire_format == WIRE_PICKLE:
+        msgs = [
+            {
+                "symbol": str(token),
+                "timestamp": from_epoch_minute(minute).strftime("%Y-%m-%d %H:%M"),
+                "price": close
+            }
+            for minute, _, _, _, close in bars
+        ]
+        return bytes((WIRE_PICKLE,)) + pickle.dumps(msgs)
+    raise ValueError(f"Unknown wire format: {wire_format}")
+
+
+def encode_trace(stamps):
+    """Trace frame: int64 publish times, one per bar of the payload frame."""
+    return struct.pack(f"<{len(stamps)}q", *stamps)
+
+
+# -------------------------
+# Decoder
+# -------------------------
+def decode_message(payload):
+    """Decode any supported payload into the normalized message dict."""
+    version = payload[0]
+
+    if version == WIRE_BINARY:
+        _, token, minute, o, h, l, c = BAR_STRUCT.unpack(payload)
+        return {
+            "symbol": _token_str(token),
+            "timestamp": from_epoch_minute(minute),
+            "price": c,
+            "open": o,
+            "high": h,
+            "low": l,
+            "close": c
+        }
+
+    if version == WIRE_OHLCV:
+        _, token, minute, period, o, h, l, c, v = OHLCV_STRUCT.unpack(payload)
+        return {
+            "symbol": _token_str(token),
+            "timestamp": from_epoch_minute(minute),
+            "price": c,
+            "open": o,
+            "high": h,
+            "low": l,
+            "close": c,
+            "volume": v,
+            "period": period
+        }
+
+    if version == WIRE_BATCH:
+        raise ValueError("Batch frame passed to decode_message, use decode_messages")
+
+    return _normalize(_load_pickle(payload))
+
+def decode_messages(payload):
+    """Decode a single or batch payload into a list of message dicts."""
+    version = payload[0]
+
+    if version == WIRE_BATCH:
+        _, token, count = BATCH_HEADER.unpack_from(payload)
+        symbol = _token_str(token)
+        end = BATCH_HEADER.size + count * BATCH_BAR.size
+        return [
+            {
+                "symbol": symbol,
+                "timestamp": from_epoch_minute(minute),
+                "price": c,
+                "open": o,
+                "high": h,
+                "low": l,
+                "close": c
+            }
+            for minute, o, h, l, c in BATCH_BAR.iter_unpack(payload[BATCH_HEADER.size:end])
+        ]
+
+    if version == WIRE_BINARY or version == WIRE_OHLCV:
+        return [decode_message(payload)]
+
+    obj = _load_pickle(payload)
+    if isinstance(obj, list):
+        return [_normalize(msg) for msg in obj]
+    return [_normalize(obj)]
+
+def decode_trace(frame):
+    return list(struct.unpack(f"<{len(frame) // 8}q", frame))
+
+def _load_pickle(payload):
+    if payload[0] == WIRE_PICKLE:
+        return pickle.loads(payload[1:])
+    if payload[:1] == _PICKLE_PREFIX:
+        return pickle.loads(payload)
+    raise ValueError(f"Unknown wire format version: {payload[0]}")
+
+def _normalize(msg):
+    ts = msg.get("timestamp")
+    if isinstance(ts, str):
+        msg["timestamp"] = datetime.fromisoformat(ts)
+    return msg
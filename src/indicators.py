@@ -0,0 +1,170 @@
+"""
+Streaming Indicators
+Incremental (O(1) per bar) versions of the indicators used by the strategies:
+• RollingStats : rolling mean / population std-dev over the last N values
+• BollingerBands : mean ± K * std-dev built on RollingStats
+• WilderRSI : RSI with Wilder-smoothed average gain / loss
+• EMA : exponential moving average seeded with the first price
+
+Every class keeps only running state (sums / previous averages) plus, where a
+value has to leave the window, a fixed-size deque. No list copies per bar.
+"""
+
+from collections import deque
+
+
+# -------------------------
+# Rolling Mean / Variance
+# -------------------------
+class RollingStats:
+    """
+    Rolling mean and population variance over the last `period` values.
+    Uses a Welford-style add/remove update so the running state stays
+    numerically stable for index-level prices (~26000) over long replays.
+    """
+    __slots__ = ("period", "window", "mean", "_m2")
+
+    def __init__(self, period):
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.mean = 0.0
+        self._m2 = 0.0      # sum of squared deviations from the mean
+
+    def update(self, value):
+        value = float(value)
+        n = len(self.window)
+
+        if n < self.period:
+            # Window still filling -> plain Welford add
+            n += 1
+            delta = value - self.mean
+            self.mean += delta / n
+            self._m2 += delta * (value - self.mean)
+        else:
+            # Window full -> replace oldest value with the new one
+            old = self.window[0]
+            old_mean = self.mean
+            self.mean += (value - old) / n
+            self._m2 += (value - old) * (value - self.mean + old - old_mean)
+            if self._m2 < 0.0:
+                self._m2 = 0.0
+
+        self.window.append(value)
+
+    @property
+    def ready(self):
+        return len(self.window) == self.period
+
+    @property
+    def variance(self):
+        n = len(self.window)
+        return self._m2 / n if n else None
+
+    @property
+    def stddev(self):
+        var = self.variance
+        return var ** 0.5 if var is not None else None
+
+
+# -------------------------
+# Bollinger Bands
+# -------------------------
+class BollingerBands:
+    """Returns (lower, mid, upper) once `period` values are seen, else (None, None, None)."""
+    __slots__ = ("k", "stats")
+
+    def __init__(self, period, k):
+        self.k = k
+        self.stats = RollingStats(period)
+
+    def update(self, close_price):
+        self.stats.update(close_price)
+        return self.value
+
+    @property
+    def value(self):
+        if not self.stats.ready:
+            return None, None, None
+        m = self.stats.mean
+        sd = self.stats.stddev
+        return m - self.k*sd, m, m + self.k*sd
+
+
+# -------------------------
+# Wilder RSI
+# -------------------------
+class WilderRSI:
+    """
+    Seeds avg gain / loss with the simple mean of the first `period` price
+    changes, then applies Wilder smoothing:
+        avg = (avg * (period - 1) + current) / period
+    """
+    __slots__ = ("period", "prev_close", "count", "avg_gain", "avg_loss", "_gain_sum", "_loss_sum")
+
+    def __init__(self, period):
+        if period < 1:
+            raise ValueError("period must be >= 1")
+        self.period = period
+        self.prev_close = None
+        self.count = 0          # number of price changes seen
+        self.avg_gain = None
+        self.avg_loss = None
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+
+    def update(self, close_price):
+        close_price = float(close_price)
+        prev = self.prev_close
+        self.prev_close = close_price
+        if prev is None:
+            return None
+
+        diff = close_price - prev
+        gain = diff if diff > 0 else 0.0
+        loss = -diff if diff < 0 else 0.0
+        self.count += 1
+
+        if self.avg_gain is None:
+            self._gain_sum += gain
+            self._loss_sum += loss
+            if self.count < self.period:
+                return None
+            self.avg_gain = self._gain_sum / self.period
+            self.avg_loss = self._loss_sum / self.period
+        else:
+            n = self.period
+            self.avg_gain = (self.avg_gain * (n - 1) + gain) / n
+            self.avg_loss = (self.avg_loss * (n - 1) + loss) / n
+
+        return self.value
+
+    @property
+    def value(self):
+        if self.avg_gain is None:
+            return None
+        if self.avg_loss == 0:
+            return 100
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100/(1+rs))
+
+
+# -------------------------
+# EMA
+# -------------------------
+class EMA:
+    """EMA with alpha = 2/(period+1); the first price seeds the average."""
+    __slots__ = ("period", "alpha", "value")
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2/(period+1)
+        self.value = None
+
+    def update(self, close_price):
+        if self.value is None:
+            self.value = float(close_price)
+        else:
+            self.value = (close_price - self.value)*self.alpha + self.value
+        return self.value
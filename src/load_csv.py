@@ -1,10 +1,29 @@
-import pandas as pd
-import os
+from contract_index import open_index, parse_description, make_description
 # -------------------------
-# Load Contracts CSV
+# Contract master: compiled index (contract_index.py), opened on first lookup
 # -------------------------
-contracts = pd.read_csv("./data/contracts.csv", low_memory=False)
-desc_to_id = dict(zip(contracts["Description"], contracts["exchangeInstrumentID"]))
+CONTRACTS_CSV = "./data/contracts.csv"
+CONTRACTS_INDEX = "./data/contracts.idx"
+
+_index = None
+
+
+def get_index():
+    """The ContractIndex for data/contracts.csv (compiled on first use if missing or stale)."""
+    global _index
+    if _index is None:
+        _index = open_index(CONTRACTS_CSV, CONTRACTS_INDEX)
+    return _index
+
+
+def __getattr__(name):
+    # desc_to_id: the full {Description: exchangeInstrumentID} dict, built only if asked for. It is
+    # then a plain module global, so later load_csv.desc_to_id lookups never come back here.
+    global desc_to_id
+    if name == "desc_to_id":
+        desc_to_id = dict(get_index().items())
+        return desc_to_id
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # -------------------------
 # get_exchange_instrument_id() function : return id respective of NAME/DESCRIPTION
@@ -14,4 +33,20 @@ def get_exchange_instrument_id(description: str) -> str:
     Return the exchangeInstrumentID for a given Description.
     If not found, returns 'NOT FOUND'.
     """
-    return desc_to_id.get(description, "NOT FOUND")
\ No newline at end of file
+    return get_index().token(description, "NOT FOUND")
+
+
+# -------------------------
+# get_description() / get_contract_id() functions : reverse and by-field lookups
+# -------------------------
+def get_description(token) -> str:
+    """Return the Description for an exchangeInstrumentID, or 'NOT FOUND'."""
+    return get_index().description(token, "NOT FOUND")
+
+
+def get_contract_id(underlying, expiry=None, strike=None, kind="SPOT"):
+    """
+    Return the exchangeInstrumentID for contract fields, e.g.
+    get_contract_id('NIFTY', '25NOV', 24800, 'CE'), or 'NOT FOUND'.
+    """
+    return get_index().contract(underlying, expiry, strike, kind, "NOT FOUND")
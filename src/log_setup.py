@@ -0,0 +1,148 @@
+"""
+Logging Setup
+Shared non-blocking logging for the feed, OMS, RMS and strategies.
+
+• get_logger() gives a component logger whose only handler is a
+  QueueHandler; file / console writes happen on a QueueListener thread,
+  not on the tick path. Listeners are flushed and stopped at exit.
+• Message args are merged on the calling thread (records may change
+  later), the Formatter work (timestamps, layout) runs on the listener.
+• Per-tick lines go through a TickLog: its own level, emitted for every
+  Nth tick only. Defaults per component are in HOT_PATH and can be
+  overridden from the environment (inherited by run.py subprocesses):
+      LOG_HOT=OFF                       all components
+      LOG_HOT_FEEDDISTRIBUTOR=INFO:1    one component, LEVEL[:every]
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# component -> (hot-path level, log every Nth tick); None level = off
+HOT_PATH = {
+    "FeedDistributor": (logging.DEBUG, 100),
+    "MeanReversionStrategy": (logging.DEBUG, 10),
+    "StraddleSeller": (logging.DEBUG, 10),
+    "RMS": (logging.DEBUG, 1),
+}
+DEFAULT_HOT_PATH = (logging.DEBUG, 1)
+
+_listeners = {}
+_DEFAULT = object()
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def get_logger(name, log_file, file_level=logging.DEBUG, console_level=logging.INFO,
+               fmt=LOG_FORMAT, queued=True):
+    """
+    Configure logger `name` to write to log_file (and the console unless
+    console_level is None). Calling it again replaces the previous setup.
+    queued=False attaches the handlers directly (synchronous writes).
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    _close(name)
+
+    formatter = logging.Formatter(fmt)
+    handlers = []
+    fh = logging.FileHandler(log_file, mode="a")
+    fh.setLevel(file_level)
+    fh.setFormatter(formatter)
+    handlers.append(fh)
+    if console_level is not None:
+        ch = logging.StreamHandler()
+        ch.setLevel(console_level)
+        ch.setFormatter(formatter)
+        handlers.append(ch)
+
+    if queued:
+        q = queue.SimpleQueue()
+        logger.addHandler(_DeferredFormatQueueHandler(q))
+        listener = QueueListener(q, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = (listener, handlers)
+    else:
+        for h in handlers:
+            logger.addHandler(h)
+    return logger
+
+
+def _close(name):
+    logger = logging.getLogger(name)
+    entry = _listeners.pop(name, None)
+    if entry is not None:
+        listener, handlers = entry
+        listener.stop()
+        for h in handlers:
+            h.close()
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+        h.close()
+
+
+@atexit.register
+def shutdown():
+    """Drain every queue and close its handlers."""
+    for name in list(_listeners):
+        _close(name)
+
+
+# -------------------------
+# Hot path
+# -------------------------
+def _parse_level(value):
+    level, _, every = value.partition(":")
+    level = level.strip().upper()
+    level = None if level in ("", "OFF", "NONE") else logging.getLevelName(level)
+    if level is not None and not isinstance(level, int):
+        raise ValueError(f"Unknown log level in {value!r}")
+    return level, int(every) if every else 1
+
+
+def hot_path_config(name):
+    """(level, every) for component `name`: environment, then HOT_PATH, then the default."""
+    value = os.environ.get(f"LOG_HOT_{name.upper()}") or os.environ.get("LOG_HOT")
+    if value:
+        return _parse_level(value)
+    return HOT_PATH.get(name, DEFAULT_HOT_PATH)
+
+
+class TickLog:
+    """
+    Per-tick logging for one component. Call tick() once per tick; lines
+    logged through the TickLog are emitted only on sampled ticks, so an
+    unsampled tick costs a counter increment and nothing else.
+    """
+    def __init__(self, logger, level=_DEFAULT, every=None):
+        default_level, default_every = hot_path_config(logger.name)
+        self.logger = logger
+        self.level = default_level if level is _DEFAULT else level      # None = off
+        self.every = max(1, default_every if every is None else every)
+        self.count = 0
+        self.sampled = False
+
+    def tick(self):
+        """Advance one tick; returns True if this tick's lines are emitted."""
+        self.count += 1
+        self.sampled = (self.level is not None
+                        and (self.count - 1) % self.every == 0
+                        and self.logger.isEnabledFor(self.level))
+        return self.sampled
+
+    def __call__(self, msg, *args):
+        if self.sampled:
+            self.logger.log(self.level, msg, *args)
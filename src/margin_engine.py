@@ -0,0 +1,210 @@
+"""
+Margin Engine
+Portfolio margin for futures and option positions, used by the RMS
+pre-trade check (a simplified SPAN-style scenario scan).
+
+• Per-contract parameters (kind, underlying, strike) are parsed once from
+  the contract master into NumPy arrays indexed by a dense contract id;
+  from_contract_master() does that once per process and hands every
+  caller (one StraddleSeller per backtest day) an empty() engine sharing
+  them, with its own positions.
+• Margin of one underlying = worst loss over SCENARIOS moves of the
+  underlying within +/- SCAN_PCT (options at intrinsic value, futures at
+  their price, each against its current mark) + EXPOSURE_PCT of the
+  notional of futures and short options. All legs of an underlying are
+  netted in every scenario, so a short straddle is charged for its losing
+  side only and futures offset the options they hedge.
+• fill() updates the position arrays in place and re-prices only the
+  filled underlying; update_price() marks a contract (O(1)) and defers
+  that underlying's re-pricing to the next total() / what_if().
+• what_if(legs) prices just the underlyings an order touches, vectorized
+  over their legs x scenarios.
+
+Quantities are in units, like OMS orders (no lot multiplier).
+"""
+
+import numpy as np
+from contract_index import parse_description
+
+SCAN_PCT = 0.09
+SCENARIOS = 9
+EXPOSURE_PCT = 0.02
+
+KIND_SPOT = 0
+KIND_FUT = 1
+KIND_CE = 2
+KIND_PE = 3
+KINDS = {"SPOT": KIND_SPOT, "FUT": KIND_FUT, "CE": KIND_CE, "PE": KIND_PE}
+
+_master = None      # MarginEngine over the contract master, parsed on first from_contract_master()
+
+
+class MarginEngine:
+    def __init__(self, contracts, scan_pct=SCAN_PCT, scenarios=SCENARIOS, exposure_pct=EXPOSURE_PCT):
+        """contracts: iterable of (token, description) from the contract master."""
+        self.index = {}             # token (str) -> contract id
+        self.underlyings = {}       # underlying name -> underlying id
+        kinds, unders, strikes = [], [], []
+        for token, description in contracts:
+            fields = parse_description(str(description))
+            if fields is None:
+                continue
+            name, _, strike, kind = fields
+            self.index[str(token)] = len(kinds)
+            kinds.append(KINDS[kind])
+            unders.append(self.underlyings.setdefault(name, len(self.underlyings)))
+            strikes.append(np.nan if strike is None else strike)
+
+        # per contract: parameters (NumPy for the scan, lists for O(1) scalar access), never modified
+        self.kind = np.array(kinds, dtype=np.int8)
+        self.strike = np.array(strikes, dtype=np.float64)
+        self._kind = kinds
+        self._under = unders
+        self._reset(scan_pct, scenarios, exposure_pct)
+
+    def _reset(self, scan_pct, scenarios, exposure_pct):
+        """No positions, no marks."""
+        self.qty = np.zeros(len(self._kind))            # signed open quantity
+        self.mark = np.full(len(self._kind), np.nan)    # latest price
+
+        # per underlying
+        self.under_price = np.full(len(self.underlyings), np.nan)
+        self.has_spot = set()       # underlyings priced from their SPOT token (not a future)
+        self.legs = {}              # underlying id -> {contract ids with open qty}
+        self.margins = {}           # underlying id -> margin at the last pricing
+        self.dirty = set()          # underlyings re-marked since their last pricing
+
+        self.moves = 1.0 + np.linspace(-scan_pct, scan_pct, scenarios)
+        self.exposure_pct = exposure_pct
+
+    def empty(self, scan_pct=SCAN_PCT, scenarios=SCENARIOS, exposure_pct=EXPOSURE_PCT):
+        """New engine without positions that shares this one's contract parameters (no re-parse)."""
+        engine = object.__new__(type(self))
+        for name in ("index", "underlyings", "kind", "strike", "_kind", "_under"):
+            setattr(engine, name, getattr(self, name))
+        engine._reset(scan_pct, scenarios, exposure_pct)
+        return engine
+
+    @classmethod
+    def from_contract_master(cls, **kwargs):
+        """Engine over data/contracts.csv; the master is parsed once per process, each call gets its own positions."""
+        global _master
+        if _master is None:
+            from load_csv import get_index
+            _master = cls((token, description) for description, token in get_index().items())
+        return _master.empty(**kwargs)
+
+    # -------------------------
+    # Updates
+    # -------------------------
+    def update_price(self, symbol, price):
+        i = self.index.get(str(symbol))
+        if i is None:
+            return
+        self.mark[i] = price
+        u = self._under[i]
+        kind = self._kind[i]
+        if kind == KIND_SPOT:
+            self.has_spot.add(u)
+            self.under_price[u] = price
+        elif kind == KIND_FUT and u not in self.has_spot:
+            self.under_price[u] = price
+        if u in self.legs:
+            self.dirty.add(u)
+
+    def fill(self, symbol, signed_qty, price):
+        """Apply an executed quantity (BUY > 0, SELL < 0) and re-price its underlying."""
+        i = self.index.get(str(symbol))
+        if i is None:
+            return
+        self.qty[i] += signed_qty
+        if np.isnan(self.mark[i]):
+            self.mark[i] = price
+        u = self._under[i]
+        legs = self.legs.setdefault(u, set())
+        if self.qty[i] == 0:
+            legs.discard(i)
+        else:
+            legs.add(i)
+        if legs:
+            self.margins[u] = self._price(u, np.fromiter(legs, dtype=np.intp))
+        else:
+            del self.legs[u]
+            self.margins.pop(u, None)
+        self.dirty.discard(u)
+
+    # -------------------------
+    # Pricing
+    # -------------------------
+    def _price(self, u, idx, qty=None, mark=None):
+        """Margin of underlying u for contracts idx (optionally with what-if qty / marks)."""
+        qty = self.qty[idx] if qty is None else qty
+        mark = self.mark[idx] if mark is None else mark
+        kind = self.kind[idx]
+        strike = self.strike[idx]
+        is_option = kind >= KIND_CE
+
+        spot = self.under_price[u]
+        if np.isnan(spot):
+            # no underlying price yet: futures' own marks, else the option strikes (ATM)
+            futures = mark[~is_option]
+            spot = futures[~np.isnan(futures)].mean() if np.any(~np.isnan(futures)) else np.nanmean(strike)
+
+        intrinsic = np.where(kind == KIND_CE, np.maximum(spot - strike, 0.0), np.maximum(strike - spot, 0.0))
+        mark = np.where(np.isnan(mark), np.where(is_option, intrinsic, spot), mark)
+
+        # legs x scenarios: options at intrinsic value of the moved underlying, futures at their moved price
+        base = np.where(is_option, spot, mark)
+        moved = base[:, None] * self.moves
+        value = np.where((kind == KIND_CE)[:, None], np.maximum(moved - strike[:, None], 0.0),
+                         np.where((kind == KIND_PE)[:, None], np.maximum(strike[:, None] - moved, 0.0), moved))
+        pnl = (qty[:, None] * (value - mark[:, None])).sum(axis=0)
+        scan = max(0.0, -float(pnl.min()))
+
+        charged = ~is_option | (qty < 0)
+        exposure = self.exposure_pct * float(np.abs(qty[charged] * base[charged]).sum())
+        return scan + exposure
+
+    def _refresh(self):
+        for u in self.dirty:
+            self.margins[u] = self._price(u, np.fromiter(self.legs[u], dtype=np.intp))
+        self.dirty.clear()
+
+    def total(self):
+        """Portfolio margin at the latest marks."""
+        self._refresh()
+        return sum(self.margins.values())
+
+    def by_underlying(self):
+        self._refresh()
+        names = {u: name for name, u in self.underlyings.items()}
+        return {names[u]: margin for u, margin in self.margins.items()}
+
+    def what_if(self, legs):
+        """
+        Portfolio margin if every leg [(symbol, side, qty, price), ...] were
+        filled at its price; legs on contracts outside the master are ignored.
+        """
+        deltas = {}
+        for symbol, side, qty, price in legs:
+            i = self.index.get(str(symbol))
+            if i is not None:
+                signed = qty if side == "BUY" else -qty
+                deltas[i] = (deltas.get(i, (0, price))[0] + signed, price)
+
+        self._refresh()
+        total = sum(self.margins.values())
+        by_under = {}
+        for i in deltas:
+            by_under.setdefault(self._under[i], set()).add(i)
+        for u, touched in by_under.items():
+            # order contracts first, then the underlying's other open legs
+            touched = list(touched)
+            idx = np.array(touched + [i for i in self.legs.get(u, ()) if i not in deltas], dtype=np.intp)
+            n = len(touched)
+            qty = self.qty[idx]                 # fancy indexing: copies
+            mark = self.mark[idx]
+            qty[:n] += [deltas[i][0] for i in touched]
+            mark[:n] = np.where(np.isnan(mark[:n]), [deltas[i][1] for i in touched], mark[:n])
+            total += self._price(u, idx, qty, mark) - self.margins.get(u, 0.0)
+        return total
@@ -0,0 +1,198 @@
+"""
+Columnar Market Data Store
+On-disk replacement for market_data.pkl that opens instantly via np.memmap.
+
+Layout of a store directory:
+    index.json   {"version": 1, "rows": N, "tokens": {token: [offset, length]}}
+    minute.i4    int32   epoch minutes (see feed_codec.to_epoch_minute)
+    open.f8      float64
+    high.f8      float64
+    low.f8       float64
+    close.f8     float64
+
+Each column holds every token's bars back to back; a token's rows are
+column[offset:offset + length], in the same order as the pickle.
+Only the pages actually read are loaded into memory.
+
+Usage (from repo root):
+    python src/market_store.py convert ./data/market_data.pkl ./data/market_store
+    python src/market_store.py export-csv ./data/market_store ./data/market_feed_data.csv
+"""
+
+import csv
+import json
+import os
+import pickle
+import sys
+import numpy as np
+from feed_codec import to_epoch_minute, from_epoch_minute
+
+STORE_VERSION = 1
+INDEX_FILE = "index.json"
+COLUMNS = {
+    "minute": ("minute.i4", np.dtype("<i4")),
+    "open": ("open.f8", np.dtype("<f8")),
+    "high": ("high.f8", np.dtype("<f8")),
+    "low": ("low.f8", np.dtype("<f8")),
+    "close": ("close.f8", np.dtype("<f8")),
+}
+PRICE_FIELDS = ("Open", "High", "Low", "Close")
+
+
+# -------------------------
+# Converter
+# -------------------------
+def iter_pickle_bars(data):
+    """
+    Yield (token, [(minute, open, high, low, close), ...]) from the nested
+    pickle dict. Open/High/Low fall back to Close when missing for a token.
+    """
+    for token, closes in data["Close"].items():
+        ohl = []
+        for field in PRICE_FIELDS[:3]:
+            series = data.get(field, {}).get(token)
+            if series is None or len(series) != len(closes):
+                series = closes
+            ohl.append(series)
+
+        yield token, [
+            (to_epoch_minute(c["Minute"]), o["Price"], h["Price"], l["Price"], c["Price"])
+            for o, h, l, c in zip(ohl[0], ohl[1], ohl[2], closes)
+        ]
+
+def write_store(store_dir, series):
+    """
+    Write a columnar store from (token, (minute, open, high, low, close))
+    pairs, each column an array-like in time order; returns the row count.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+
+    files = {name: open(os.path.join(store_dir, fname), "wb") for name, (fname, _) in COLUMNS.items()}
+    tokens = {}
+    offset = 0
+    try:
+        for token, cols in series:
+            length = 0
+            for name, values in zip(COLUMNS, cols):
+                values = np.asarray(values, dtype=COLUMNS[name][1])
+                files[name].write(values.tobytes())
+                length = len(values)
+            tokens[str(token)] = [offset, length]
+            offset += length
+    finally:
+        for f in files.values():
+            f.close()
+
+    with open(os.path.join(store_dir, INDEX_FILE), "w") as f:
+        json.dump({"version": STORE_VERSION, "rows": offset, "tokens": tokens}, f)
+    return offset
+
+
+def convert_pickle(pickle_file, store_dir):
+    """Write a columnar store from market_data.pkl; returns the row count."""
+    data = pickle.load(open(pickle_file, "rb"))
+    return write_store(store_dir, (
+        (token, tuple(zip(*bars)) if bars else ((),) * len(COLUMNS))
+        for token, bars in iter_pickle_bars(data)
+    ))
+
+
+# -------------------------
+# Reader
+# -------------------------
+class MarketStore:
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, INDEX_FILE)) as f:
+            index = json.load(f)
+        if index.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported market store version: {index.get('version')}")
+
+        self.rows = index["rows"]
+        self.index = {token: tuple(span) for token, span in index["tokens"].items()}
+        self._columns = {}
+
+    @staticmethod
+    def is_store(path):
+        return os.path.isfile(os.path.join(path, INDEX_FILE))
+
+    def tokens(self):
+        return list(self.index)
+
+    def column(self, name):
+        """Whole column as a read-only memmap (opened on first use)."""
+        col = self._columns.get(name)
+        if col is None:
+            fname, dtype = COLUMNS[name]
+            if self.rows:
+                col = np.memmap(os.path.join(self.store_dir, fname), dtype=dtype, mode="r", shape=(self.rows,))
+            else:
+                col = np.empty(0, dtype=dtype)
+            self._columns[name] = col
+        return col
+
+    def series(self, token, name):
+        """Zero-copy view of one column for one token."""
+        offset, length = self.index[str(token)]
+        return self.column(name)[offset:offset + length]
+
+    def timestamps(self, token):
+        """Bar minutes of one token as datetime64[m]."""
+        return self.series(token, "minute").astype("datetime64[m]")
+
+    def iter_bars(self, token, chunk=4096):
+        """Yield (minute, open, high, low, close) tuples, converting one chunk at a time."""
+        cols = [self.series(token, name) for name in COLUMNS]
+        for start in range(0, len(cols[0]), chunk):
+            yield from zip(*(c[start:start + chunk].tolist() for c in cols))
+
+    def columns(self, token):
+        """(minute, open, high, low, close) views of one token, the form write_store takes."""
+        return tuple(self.series(token, name) for name in COLUMNS)
+
+    def bars(self, token):
+        """Re-iterable bar sequence for one token (what FeedDistributor replays)."""
+        return TokenBars(self, str(token))
+
+
+class TokenBars:
+    __slots__ = ("store", "token")
+
+    def __init__(self, store, token):
+        self.store = store
+        self.token = token
+
+    def __iter__(self):
+        return self.store.iter_bars(self.token)
+
+    def __len__(self):
+        return self.store.index[self.token][1]
+
+
+# -------------------------
+# CSV export (validation)
+# -------------------------
+def export_csv(store, csv_file):
+    with open(csv_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Token", "Minute", "Open", "High", "Low", "Close"])
+        for token in store.tokens():
+            for minute, o, h, l, c in store.iter_bars(token):
+                writer.writerow([token, from_epoch_minute(minute).strftime("%Y-%m-%d %H:%M"), o, h, l, c])
+
+
+# -------------------------
+# Runner
+# -------------------------
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("convert", "export-csv"):
+        print(__doc__)
+        sys.exit(1)
+
+    cmd, src, dst = sys.argv[1:]
+    if cmd == "convert":
+        rows = convert_pickle(src, dst)
+        print(f"Wrote {rows} bars to {dst}")
+    else:
+        export_csv(MarketStore(src), dst)
+        print(f"Exported {src} to {dst}")
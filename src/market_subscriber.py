@@ -0,0 +1,276 @@
+"""
+Market Subscriber
+One persistent SUB socket for many feed tokens, with a last-value cache.
+
+• subscribe / unsubscribe / set_tokens only touch the socket when the token
+  set actually changes (no repeated setsockopt per read).
+• `last[token]` is the latest bar of token X, so "latest price of token X"
+  is a dict lookup instead of a socket round trip.
+• recv() hands out bars one at a time in arrival order (batched frames are
+  unpacked into a local queue). A bar enters `last` when recv() returns
+  it; drain() / wait_for() read ahead but only cache queued bars up to the
+  minute of the bar recv() returned last, so the cache never holds prices
+  from after the bar being processed (no look-ahead in a fast replay).
+  Bars from a traced feed (FeedDistributor trace=) carry their publish
+  time as "sent_ns".
+• bootstrap() fills the cache from the feed's snapshot service, so a late
+  or restarted strategy has current prices before its first tick.
+• subscribe_bars() adds aggregated BAR<period>:<token> topics
+  (FeedDistributor bar_periods); recv() returns them with a "period"
+  key, and they never replace the 1-minute bar in `last`. They share the
+  token's "symbol", so consumers route on route_key(msg), not the symbol.
+• MarketView gives one strategy its own token set on a subscriber shared
+  by several strategies (StrategyHost); socket subscriptions are reference
+  counted, so one strategy dropping a token does not cut off another.
+"""
+
+import time
+from collections import deque
+import zmq
+from feed_codec import decode_message, decode_messages, decode_trace
+
+
+def route_key(msg):
+    """Dispatch key of a decoded bar: its token for 1-minute bars, 'BAR<period>:<token>' for aggregated ones."""
+    period = msg.get("period")
+    return msg["symbol"] if period is None else f"BAR{period}:{msg['symbol']}"
+
+
+# -------------------------
+# Snapshot client
+# -------------------------
+def fetch_snapshot(context, snapshot_addr, tokens=None, timeout_ms=1000):
+    """
+    Latest bar per token from FeedDistributor's snapshot service.
+    tokens=None asks for every token. Returns [] if the service does not answer.
+    """
+    if tokens is not None and not tokens:
+        return []
+
+    req = context.socket(zmq.REQ)
+    req.setsockopt(zmq.LINGER, 0)
+    req.connect(snapshot_addr)
+    try:
+        request = "" if tokens is None else ",".join(str(t) for t in tokens)
+        req.send(request.encode())
+        if not req.poll(timeout_ms):
+            return []
+        status, *frames = req.recv_multipart()
+        if status != b"OK":
+            return []
+        return [decode_message(frame) for frame in frames]
+    finally:
+        req.close()
+
+
+class MarketSubscriber:
+    def __init__(self, context, feed_addr):
+        self.sub = context.socket(zmq.SUB)
+        self.sub.connect(feed_addr)
+        self.topics = set()         # subscribed tokens (str)
+        self.last = {}              # token -> latest decoded bar
+        self.pending = deque()      # decoded bars not yet returned by recv()
+        self.now = None             # timestamp of the latest 1-minute bar recv() returned
+        self.refs = {}              # token -> number of MarketViews holding it
+
+    # -------------------------
+    # Subscriptions
+    # -------------------------
+    def subscribe(self, token):
+        """Returns True if this is a new subscription."""
+        token = str(token)
+        if token in self.topics:
+            return False
+        self.sub.setsockopt_string(zmq.SUBSCRIBE, f"MARKET:{token}")
+        self.topics.add(token)
+        return True
+
+    def unsubscribe(self, token):
+        token = str(token)
+        if token not in self.topics:
+            return False
+        self.sub.setsockopt_string(zmq.UNSUBSCRIBE, f"MARKET:{token}")
+        self.topics.discard(token)
+        self.last.pop(token, None)
+        return True
+
+    def subscribe_bars(self, token, period):
+        self.sub.setsockopt_string(zmq.SUBSCRIBE, f"BAR{period}:{token}")
+
+    def unsubscribe_bars(self, token, period):
+        self.sub.setsockopt_string(zmq.UNSUBSCRIBE, f"BAR{period}:{token}")
+
+    def set_tokens(self, tokens):
+        """Subscribe to exactly `tokens`, changing only the difference."""
+        wanted = {str(t) for t in tokens}
+        for token in self.topics - wanted:
+            self.unsubscribe(token)
+        for token in wanted - self.topics:
+            self.subscribe(token)
+
+    def acquire(self, token):
+        """Reference-counted subscribe for shared use (MarketView)."""
+        token = str(token)
+        self.refs[token] = self.refs.get(token, 0) + 1
+        self.subscribe(token)
+
+    def release(self, token):
+        token = str(token)
+        count = self.refs.get(token, 0) - 1
+        if count > 0:
+            self.refs[token] = count
+        else:
+            self.refs.pop(token, None)
+            self.unsubscribe(token)
+
+    # -------------------------
+    # Receiving
+    # -------------------------
+    def _ingest(self, frames):
+        msgs = decode_messages(frames[1])
+        if len(frames) > 2:
+            # traced feed: publish time per bar, kept as "sent_ns" for latency measurements
+            for msg, stamp in zip(msgs, decode_trace(frames[2])):
+                msg["sent_ns"] = stamp
+        self.pending.extend(msgs)
+
+    def _cache(self, msg):
+        """Make msg the token's cached bar unless the cache already holds a later one."""
+        if "period" in msg:
+            return
+        cached = self.last.get(msg["symbol"])
+        if cached is None or cached["timestamp"] <= msg["timestamp"]:
+            self.last[msg["symbol"]] = msg
+
+    def _catch_up(self):
+        """Cache the queued bars up to the current minute (stops at the first later 1-minute bar)."""
+        if self.now is None:
+            return
+        for msg in self.pending:
+            if "period" in msg:
+                continue
+            if msg["timestamp"] > self.now:
+                break
+            self._cache(msg)
+
+    def recv(self, timeout_ms=1000):
+        """Next bar in arrival order, or None after timeout_ms without data."""
+        if not self.pending:
+            if not self.sub.poll(timeout_ms):
+                return None
+            self._ingest(self.sub.recv_multipart())
+        msg = self.pending.popleft()
+        if "period" not in msg:
+            if self.now is None or msg["timestamp"] > self.now:
+                self.now = msg["timestamp"]
+            self._cache(msg)
+        return msg
+
+    def drain(self):
+        """Read every frame already waiting on the socket (non-blocking); caches bars up to the current minute."""
+        while self.sub.poll(0):
+            self._ingest(self.sub.recv_multipart())
+        self._catch_up()
+
+    def wait_for(self, token, timeout_ms):
+        """Read until `token` has a cached value (up to the current minute) or timeout_ms passes."""
+        token = str(token)
+        deadline = time.monotonic() + timeout_ms / 1000
+        self._catch_up()
+        while token not in self.last:
+            remaining_ms = (deadline - time.monotonic()) * 1000
+            if remaining_ms <= 0 or not self.sub.poll(remaining_ms):
+                break
+            self._ingest(self.sub.recv_multipart())
+            self._catch_up()
+        return token in self.last
+
+    def last_price(self, token):
+        """(price, timestamp) of the latest cached bar, or None."""
+        msg = self.last.get(str(token))
+        if msg is None:
+            return None
+        return float(msg.get("price") or msg.get("close")), msg["timestamp"]
+
+    def bootstrap(self, snapshot_addr, tokens=None, timeout_ms=1000):
+        """Seed the last-value cache from a snapshot; stream bars overwrite it as they arrive."""
+        msgs = fetch_snapshot(self.sub.context, snapshot_addr, tokens, timeout_ms)
+        for msg in msgs:
+            self.last.setdefault(msg["symbol"], msg)
+        return msgs
+
+    def close(self):
+        self.sub.close()
+
+
+# -------------------------
+# Shared subscriber view
+# -------------------------
+class MarketView:
+    """
+    One strategy's subscriptions on a MarketSubscriber owned by a
+    StrategyHost. Same subscription / cache API as MarketSubscriber, but the
+    host is the only reader of the socket: bars reach the strategy through
+    the host's dispatch table, and wait_for / drain never block.
+    """
+    def __init__(self, shared):
+        self.shared = shared
+        self.sub = None
+        self.topics = set()
+        self.bar_topics = set()     # (token, period)
+        self.last = shared.last     # the cache is shared, updated by the host
+
+    def subscribe(self, token):
+        token = str(token)
+        if token in self.topics:
+            return False
+        self.shared.acquire(token)
+        self.topics.add(token)
+        return True
+
+    def unsubscribe(self, token):
+        token = str(token)
+        if token not in self.topics:
+            return False
+        self.shared.release(token)
+        self.topics.discard(token)
+        return True
+
+    def subscribe_bars(self, token, period):
+        # zmq counts repeated subscriptions to a topic, so views sharing one stay independent
+        key = (str(token), period)
+        if key not in self.bar_topics:
+            self.shared.subscribe_bars(*key)
+            self.bar_topics.add(key)
+
+    def unsubscribe_bars(self, token, period):
+        key = (str(token), period)
+        if key in self.bar_topics:
+            self.shared.unsubscribe_bars(*key)
+            self.bar_topics.discard(key)
+
+    def set_tokens(self, tokens):
+        wanted = {str(t) for t in tokens}
+        for token in self.topics - wanted:
+            self.unsubscribe(token)
+        for token in wanted - self.topics:
+            self.subscribe(token)
+
+    def drain(self):
+        """No-op: the host has already dispatched everything received so far."""
+
+    def wait_for(self, token, timeout_ms):
+        """Cache check only; a new token's first bar arrives through the host loop."""
+        return str(token) in self.last
+
+    def last_price(self, token):
+        return self.shared.last_price(token)
+
+    def bootstrap(self, snapshot_addr, tokens=None, timeout_ms=1000):
+        return self.shared.bootstrap(snapshot_addr, tokens, timeout_ms)
+
+    def close(self):
+        for token in list(self.topics):
+            self.unsubscribe(token)
+        for key in list(self.bar_topics):
+            self.unsubscribe_bars(*key)
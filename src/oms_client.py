@@ -0,0 +1,144 @@
+"""
+OMS Client
+Strategy-side stand-in for simulator_oms.OMS that talks to OMSService.
+
+• place_order / get_positions / square_off_all / record_trade keep the
+  OMS signatures and return the same records (Fill, rejected Order,
+  {symbol: Position}), so a strategy only swaps the object it builds.
+• submit_order() sends without waiting and returns a request id;
+  result(req_id) blocks for that order's Fill / Order. Several orders
+  can be in flight at once (pipelining), e.g. both straddle legs.
+• cum_realized_pnl is the firm-wide realized PnL from the latest response,
+  unrealized_pnl the firm-wide unrealized PnL from the latest get_positions().
+• update_price(), record_trade() and rms.release() are one-way (NO_REPLY):
+  the service answers none of them, so nothing piles up unread in the
+  DEALER queue of a strategy that marks every bar and rarely trades.
+  Marks keep the service's unrealized PnL current; its RMS checks the
+  daily loss on the service's own realized + unrealized PnL.
+• client.rms (ServiceRMS) reserves exposure at the service's RMS, so
+  strategies check once and place with the token, as with a local RMS.
+"""
+
+import itertools
+import zmq
+from records import as_side
+import oms_protocol as proto
+
+SERVICE_ADDR = "tcp://localhost:5557"
+
+
+class OMSClient:
+    def __init__(self, addr=SERVICE_ADDR, timeout_ms=5000, context=None):
+        self.context = context or zmq.Context.instance()
+        self.socket = self.context.socket(zmq.DEALER)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(addr)
+        self.timeout_ms = timeout_ms
+
+        self.req_ids = itertools.count(1)
+        self.responses = {}         # req_id -> (status, body), arrived but not collected
+        self.cum_realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self.rms = ServiceRMS(self)
+
+    # -------------------------
+    # Transport
+    # -------------------------
+    def _send(self, payload):
+        self.socket.send(payload)
+
+    def _read(self):
+        payload = self.socket.recv()
+        op, req_id, status = proto.RESPONSE.unpack_from(payload)
+        self.responses[req_id] = (status, payload[proto.RESPONSE.size:])
+
+    def _wait(self, req_id, timeout_ms=None):
+        """(status, body) for req_id; reads (and keeps) other responses meanwhile."""
+        timeout_ms = self.timeout_ms if timeout_ms is None else timeout_ms
+        while req_id not in self.responses:
+            if not self.socket.poll(timeout_ms):
+                raise TimeoutError(f"OMS service did not answer request {req_id} within {timeout_ms} ms")
+            self._read()
+        status, body = self.responses.pop(req_id)
+        if status == proto.ST_ERROR:
+            raise RuntimeError(f"OMS service error: {body.decode()}")
+        return status, body
+
+    def _results(self, body):
+        results = proto.decode_results(body)
+        if results:
+            self.cum_realized_pnl = results[-1][1]
+        return [r for r, _ in results]
+
+    # -------------------------
+    # Pipelined orders
+    # -------------------------
+    def submit_order(self, symbol, side, qty, price, timestamp=None, reservation=None):
+        """Send an order without waiting; returns its request id for result()."""
+        req_id = next(self.req_ids)
+        self._send(proto.encode_place(req_id, symbol, as_side(side), qty, price, timestamp, reservation))
+        return req_id
+
+    def result(self, req_id, timeout_ms=None):
+        """Fill, or the rejected Order, for a submitted order."""
+        return self._results(self._wait(req_id, timeout_ms)[1])[0]
+
+    def poll_results(self):
+        """Read every response already waiting (non-blocking); returns the request ids now ready."""
+        while self.socket.poll(0):
+            self._read()
+        return list(self.responses)
+
+    # -------------------------
+    # OMS interface
+    # -------------------------
+    def place_order(self, symbol, side, qty, price, timestamp=None, reservation=None):
+        return self.result(self.submit_order(symbol, side, qty, price, timestamp, reservation))
+
+    def get_positions(self):
+        req_id = next(self.req_ids)
+        self._send(proto.REQUEST.pack(proto.OP_POSITIONS, req_id))
+        positions, self.cum_realized_pnl, self.unrealized_pnl = proto.decode_positions(self._wait(req_id)[1])
+        return positions
+
+    def update_price(self, symbol, price):
+        """Mark a symbol at the service (no response)."""
+        self._send(proto.encode_marks(next(self.req_ids), {symbol: price}, reply=False))
+
+    @property
+    def total_pnl(self):
+        """As of the latest response / get_positions(); the service's RMS uses its own, current PnL."""
+        return self.cum_realized_pnl + self.unrealized_pnl
+
+    def square_off_all(self, market_prices, timestamp=None):
+        req_id = next(self.req_ids)
+        self._send(proto.encode_square_off(req_id, market_prices, timestamp))
+        return self._results(self._wait(req_id)[1])
+
+    def record_trade(self, summary):
+        """Journal a closed-trade summary at the service (no response)."""
+        self._send(proto.encode_trade(next(self.req_ids), summary, reply=False))
+
+    def close(self):
+        self.socket.close()
+
+
+class ServiceRMS:
+    """RMS reservation calls against OMSService's RMS (daily loss is checked on the service's PnL)."""
+    def __init__(self, client):
+        self.client = client
+
+    def check_basket(self, legs):
+        client = self.client
+        req_id = next(client.req_ids)
+        client._send(proto.encode_reserve(req_id, [(s, as_side(side), q, p) for s, side, q, p in legs]))
+        status, body = client._wait(req_id)
+        return proto.decode_tokens(body) if status == proto.ST_OK else None
+
+    def reserve(self, symbol, side, qty, price):
+        tokens = self.check_basket(((symbol, side, qty, price),))
+        return tokens[0] if tokens else None
+
+    def release(self, token):
+        client = self.client
+        client._send(proto.encode_release(next(client.req_ids), token, reply=False))
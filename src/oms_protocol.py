@@ -0,0 +1,187 @@
+"""
+OMS Service Wire Format
+Compact binary frames between OMSClient (DEALER) and OMSService (ROUTER),
+one frame per request / response.
+
+request   op (u1), request id (u4), body
+response  op (u1), request id (u4), status (u1), body
+
+An op with the NO_REPLY bit set gets no response (MARK, RECORD_TRADE and
+RELEASE from OMSClient, which never wait for them); failures are only
+logged by the service.
+
+op              request body              response body
+PLACE           ORDER                     RESULT
+POSITIONS       -                         cum realized pnl (f8), unrealized pnl (f8), POSITION x n
+SQUARE_OFF      ts (i8), PRICE x n        RESULT x n
+RECORD_TRADE    TRADE                     -
+RESERVE         LEG x n                   token (u4) x n, or status REJECTED
+RELEASE         token (u4)                -
+MARK            PRICE x n                 -
+
+ORDER     side (u1), qty (i4), price (f8), ts (i8),
+          reservation token (u4, 0 = check at the service), symbol (24s)
+LEG       side, qty, price, symbol
+RESULT    status (u1), order_id (i8), side, qty, price, ts,
+          cum realized pnl (f8), symbol
+          status OK -> Fill (price = filled price),
+          REJECTED  -> rejected Order (price = limit price)
+POSITION  side, qty, avg_price (f8), symbol
+PRICE     price (f8), symbol
+TRADE     side, qty, entry ts, exit ts, entry price, exit price,
+          realized pnl, symbol, reason (16s)
+
+ts is epoch microseconds (trade_journal.to_epoch_us); 0 = "now" at the
+service. A response with status ERROR carries a UTF-8 message.
+"""
+
+import struct
+from records import Order, Fill, Position, TradeSummary, OrderStatus
+from trade_journal import SIDE_CODES, SIDES, to_epoch_us, from_epoch_us
+
+OP_PLACE = 1
+OP_POSITIONS = 2
+OP_SQUARE_OFF = 3
+OP_RECORD_TRADE = 4
+OP_RESERVE = 5
+OP_RELEASE = 6
+OP_MARK = 7
+
+NO_REPLY = 0x80     # op flag: the service sends no response
+
+ST_OK = 0
+ST_REJECTED = 1
+ST_ERROR = 2
+
+REQUEST = struct.Struct("<BI")
+RESPONSE = struct.Struct("<BIB")
+ORDER = struct.Struct("<BidqI24s")
+LEG = struct.Struct("<Bid24s")
+TOKEN = struct.Struct("<I")
+RESULT = struct.Struct("<BqBidqd24s")
+POSITION = struct.Struct("<Bid24s")
+PRICE = struct.Struct("<d24s")
+TIMESTAMP = struct.Struct("<q")
+PNL = struct.Struct("<dd")
+TRADE = struct.Struct("<Biqqddd24s16s")
+
+
+def _ts(ts):
+    return from_epoch_us(ts) if ts else None
+
+
+# -------------------------
+# Requests
+# -------------------------
+def encode_place(req_id, symbol, side, qty, price, timestamp=None, reservation=None):
+    return REQUEST.pack(OP_PLACE, req_id) + ORDER.pack(
+        SIDE_CODES[side], qty, price, to_epoch_us(timestamp), reservation or 0, str(symbol).encode())
+
+
+def decode_place(body):
+    """(symbol, side, qty, price, timestamp, reservation) for OMS.place_order."""
+    side, qty, price, ts, reservation, symbol = ORDER.unpack(body)
+    return symbol.rstrip(b"\0").decode(), SIDES[side], qty, price, _ts(ts), reservation or None
+
+
+def encode_reserve(req_id, legs):
+    return REQUEST.pack(OP_RESERVE, req_id) + b"".join(
+        LEG.pack(SIDE_CODES[side], qty, price, str(symbol).encode()) for symbol, side, qty, price in legs)
+
+
+def decode_reserve(body):
+    """[(symbol, side, qty, price)] for RMS.check_basket."""
+    return [(symbol.rstrip(b"\0").decode(), SIDES[side], qty, price)
+            for side, qty, price, symbol in LEG.iter_unpack(body)]
+
+
+def encode_release(req_id, token, reply=True):
+    return REQUEST.pack(OP_RELEASE if reply else OP_RELEASE | NO_REPLY, req_id) + TOKEN.pack(token)
+
+
+def encode_tokens(tokens):
+    return b"".join(TOKEN.pack(token) for token in tokens)
+
+
+def decode_tokens(body):
+    return [token for (token,) in TOKEN.iter_unpack(body)]
+
+
+def encode_square_off(req_id, market_prices, timestamp=None):
+    return b"".join([
+        REQUEST.pack(OP_SQUARE_OFF, req_id), TIMESTAMP.pack(to_epoch_us(timestamp)),
+        *(PRICE.pack(price, str(symbol).encode()) for symbol, price in market_prices.items()),
+    ])
+
+
+def decode_square_off(body):
+    """(market_prices, timestamp)"""
+    (ts,) = TIMESTAMP.unpack_from(body)
+    prices = {
+        symbol.rstrip(b"\0").decode(): price
+        for price, symbol in PRICE.iter_unpack(body[TIMESTAMP.size:])
+    }
+    return prices, _ts(ts)
+
+
+def encode_trade(req_id, summary, reply=True):
+    return REQUEST.pack(OP_RECORD_TRADE if reply else OP_RECORD_TRADE | NO_REPLY, req_id) + TRADE.pack(
+        SIDE_CODES[summary.side], summary.qty, to_epoch_us(summary.entry_time), to_epoch_us(summary.exit_time),
+        summary.entry_price, summary.exit_price, summary.realized_pnl,
+        str(summary.symbol).encode(), str(summary.reason).encode())
+
+
+def decode_trade(body):
+    side, qty, entry_ts, exit_ts, entry_price, exit_price, pnl, symbol, reason = TRADE.unpack(body)
+    return TradeSummary(symbol.rstrip(b"\0").decode(), SIDES[side], qty, _ts(entry_ts), _ts(exit_ts),
+                        entry_price, exit_price, pnl, reason.rstrip(b"\0").decode())
+
+
+# -------------------------
+# Responses
+# -------------------------
+def encode_result(result, cum_pnl):
+    """A Fill (status OK) or a rejected Order from OMS.place_order."""
+    if isinstance(result, Fill):
+        status, price = ST_OK, result.filled_price
+    else:
+        status, price = ST_REJECTED, result.price
+    return RESULT.pack(status, result.order_id, SIDE_CODES[result.side], result.qty, price,
+                       to_epoch_us(result.timestamp), cum_pnl, str(result.symbol).encode())
+
+
+def decode_results(body):
+    """[(Fill or rejected Order, cum realized pnl)]"""
+    out = []
+    for status, order_id, side, qty, price, ts, cum_pnl, symbol in RESULT.iter_unpack(body):
+        symbol, side, ts = symbol.rstrip(b"\0").decode(), SIDES[side], _ts(ts)
+        if status == ST_OK:
+            out.append((Fill(order_id, symbol, side, qty, price, ts), cum_pnl))
+        else:
+            out.append((Order(order_id, symbol, side, qty, price, ts, OrderStatus.REJECTED), cum_pnl))
+    return out
+
+
+def encode_positions(positions, cum_pnl, unrealized_pnl):
+    return PNL.pack(cum_pnl, unrealized_pnl) + b"".join(
+        POSITION.pack(SIDE_CODES[pos.side], pos.qty, pos.avg_price, str(symbol).encode())
+        for symbol, pos in positions.items())
+
+
+def decode_positions(body):
+    """(positions {symbol: Position}, cum realized pnl, unrealized pnl)"""
+    cum_pnl, unrealized_pnl = PNL.unpack_from(body)
+    positions = {
+        symbol.rstrip(b"\0").decode(): Position(SIDES[side], qty, avg_price)
+        for side, qty, avg_price, symbol in POSITION.iter_unpack(body[PNL.size:])
+    }
+    return positions, cum_pnl, unrealized_pnl
+
+
+def encode_marks(req_id, prices, reply=True):
+    return REQUEST.pack(OP_MARK if reply else OP_MARK | NO_REPLY, req_id) + b"".join(
+        PRICE.pack(price, str(symbol).encode()) for symbol, price in prices.items())
+
+
+def decode_marks(body):
+    return [(symbol.rstrip(b"\0").decode(), price) for price, symbol in PRICE.iter_unpack(body)]
@@ -0,0 +1,150 @@
+"""
+OMS / RMS Service
+One OMS and one RMS for every strategy process, behind a ROUTER socket
+(oms_protocol frames; OMSClient is the strategy side).
+
+• Exposure limits and max_daily_loss are enforced firm-wide, and order
+  ids come from a single counter, so they are unique across strategies.
+• Strategies reserve exposure at the service's RMS (ServiceRMS:
+  reserve / check_basket / release) and place with the token; the OMS
+  only accepts an outstanding token for the order it was booked for.
+• Requests are handled one at a time in arrival order; a client may keep
+  many orders in flight (pipelining) and match responses by request id.
+• Every order, fill and position change goes to one journal
+  (./journal/OMS/<timestamp>_oms.jrnl).
+
+Run from repo root:
+    python src/oms_service.py
+"""
+
+import os
+from datetime import datetime
+import zmq
+from log_setup import get_logger
+from simulator_oms import OMS
+from simulator_rms import RMS
+from trade_journal import TradeJournal
+import oms_protocol as proto
+
+# -------------------------
+# Logging Setup
+# -------------------------
+LOG_DIR = "./logs/OMSService/"
+os.makedirs(LOG_DIR, exist_ok=True)
+LOG_FILE = os.path.join(LOG_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + "_oms_service.log")
+
+JOURNAL_DIR = "./journal/OMS/"
+JOURNAL_FILE = os.path.join(JOURNAL_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + "_oms.jrnl")
+
+logger = get_logger("OMSService", LOG_FILE)
+
+BIND_ADDR = "tcp://*:5557"
+
+
+class OMSService:
+    def __init__(self, bind_addr=BIND_ADDR, rms=None, journal_file=JOURNAL_FILE, context=None, **oms_kwargs):
+        self.context = context or zmq.Context.instance()
+        self.socket = self.context.socket(zmq.ROUTER)
+        self.socket.bind(bind_addr)
+        self.bind_addr = bind_addr
+
+        self.rms = rms or RMS()
+        self.oms = OMS(rms=self.rms, journal=TradeJournal(journal_file) if journal_file else None, **oms_kwargs)
+        self.handlers = {
+            proto.OP_PLACE: self._place,
+            proto.OP_POSITIONS: self._positions,
+            proto.OP_SQUARE_OFF: self._square_off,
+            proto.OP_RECORD_TRADE: self._record_trade,
+            proto.OP_RESERVE: self._reserve,
+            proto.OP_RELEASE: self._release,
+            proto.OP_MARK: self._mark,
+        }
+        self.requests = 0
+        logger.info("OMS service listening on %s", bind_addr)
+
+    # -------------------------
+    # Request handlers: body -> (status, response body)
+    # -------------------------
+    def _place(self, body):
+        result = self.oms.place_order(*proto.decode_place(body))
+        return proto.ST_OK, proto.encode_result(result, self.oms.cum_realized_pnl)
+
+    def _positions(self, body):
+        return proto.ST_OK, proto.encode_positions(self.oms.get_positions(), self.oms.cum_realized_pnl,
+                                                   self.oms.unrealized_pnl)
+
+    def _square_off(self, body):
+        results = self.oms.square_off_all(*proto.decode_square_off(body))
+        return proto.ST_OK, b"".join(proto.encode_result(r, self.oms.cum_realized_pnl) for r in results)
+
+    def _record_trade(self, body):
+        self.oms.record_trade(proto.decode_trade(body))
+        return proto.ST_OK, b""
+
+    def _mark(self, body):
+        for symbol, price in proto.decode_marks(body):
+            self.oms.update_price(symbol, price)
+        return proto.ST_OK, b""
+
+    def _reserve(self, body):
+        tokens = self.rms.check_basket(proto.decode_reserve(body))
+        if tokens is None:
+            return proto.ST_REJECTED, b""
+        return proto.ST_OK, proto.encode_tokens(tokens)
+
+    def _release(self, body):
+        self.rms.release(proto.TOKEN.unpack(body)[0])
+        return proto.ST_OK, b""
+
+    def handle(self, payload):
+        """Response frame for one request, or None for a NO_REPLY request."""
+        op, req_id = proto.REQUEST.unpack_from(payload)
+        reply = not op & proto.NO_REPLY
+        op &= ~proto.NO_REPLY
+        body = payload[proto.REQUEST.size:]
+        try:
+            status, response = self.handlers[op](body)
+        except Exception as e:
+            logger.exception("Request %s (op %s) failed", req_id, op)
+            status, response = proto.ST_ERROR, str(e).encode()
+        self.requests += 1
+        if not reply:
+            return None
+        return proto.RESPONSE.pack(op, req_id, status) + response
+
+    # -------------------------
+    # Loop
+    # -------------------------
+    def run(self, stop=None):
+        """Serve until interrupted, or until the threading.Event `stop` is set."""
+        logger.info("OMS service started")
+        try:
+            while stop is None or not stop.is_set():
+                if not self.socket.poll(100):
+                    continue
+                # serve everything already queued before polling again
+                while True:
+                    try:
+                        identity, payload = self.socket.recv_multipart(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+                    response = self.handle(payload)
+                    if response is not None:
+                        self.socket.send_multipart([identity, response])
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user.")
+        finally:
+            logger.info("OMS service stopped after %d requests | cum realized PnL %.2f",
+                        self.requests, self.oms.cum_realized_pnl)
+            self.close()
+
+    def close(self):
+        self.socket.close()
+        self.oms.close()
+
+
+# -------------------------
+# Runner
+# -------------------------
+if __name__ == "__main__":
+    OMSService().run()
@@ -2,11 +2,13 @@
 # OMS SIGNAL MONITOR
 # -------------------
 
-import zmq, pickle
+import zmq
+from feed_codec import decode_messages
 ctx = zmq.Context()
 s = ctx.socket(zmq.SUB)
 s.connect("tcp://localhost:5555")
 s.setsockopt_string(zmq.SUBSCRIBE, "")
 while True:
-    msg = s.recv_pyobj()
-    print("SIGNAL:", msg)
+    frames = s.recv_multipart()     # topic, payload[, trace stamps from a traced feed]
+    for msg in decode_messages(frames[1]):
+        print("SIGNAL:", frames[0].decode(), msg)
@@ -0,0 +1,200 @@
+"""
+Synthetic Option Chains
+Black-Scholes (Black-76 on the forward) CE / PE bars priced from the
+underlying's spot or futures series in a market store, for replaying
+option legs the recorded data does not have.
+
+• VolSurface: flat (atm only), or a term / skew parameterization
+  sigma = atm + term * (T - REF_T) + skew * m + smile * m^2, m = ln(K / F).
+• price_chain() prices every strike x minute x {CE, PE} in one NumPy pass,
+  at the underlying's open / high / low / close (calls take the bar's high
+  at its high, puts at its low).
+• write_chain_store() writes the source store plus one token per option
+  it does not already have (tokens from the contract master, strikes
+  missing there are skipped), so FeedDistributor replays the legs
+  alongside spot and futures.
+
+Expiry is the last EXPIRY_WEEKDAY of the contract month at 15:30, time to
+expiry is calendar time, quantities are per unit.
+
+Usage (from repo root):
+    python src/option_chain.py ./data/market_store ./data/market_store_chain --expiry 25NOV
+"""
+
+import argparse
+import calendar
+import math
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from feed_codec import to_epoch_minute
+from market_store import MarketStore, write_store, convert_pickle
+
+EXPIRY_WEEKDAY = calendar.TUESDAY
+EXPIRY_TIME = (15, 30)
+MINUTES_PER_YEAR = 365 * 24 * 60
+REF_T = 30 / 365            # term slope is measured from a one-month option
+STRIKE_STEP = 50
+STRIKES = 40
+RATE = 0.065
+MIN_PRICE = 0.05            # tick size
+
+
+# -------------------------
+# Vol surface
+# -------------------------
+class VolSurface:
+    def __init__(self, atm=0.14, skew=0.0, smile=0.0, term=0.0, floor=0.01):
+        self.atm = atm
+        self.skew = skew
+        self.smile = smile
+        self.term = term
+        self.floor = floor
+
+    def __call__(self, moneyness, t):
+        """Implied vol for log-moneyness ln(K / F) and time to expiry t (years), broadcast."""
+        sigma = self.atm + self.term * (t - REF_T) + self.skew * moneyness + self.smile * moneyness ** 2
+        return np.maximum(sigma, self.floor)
+
+
+# -------------------------
+# Pricing
+# -------------------------
+def norm_cdf(x):
+    """Standard normal CDF (Abramowitz-Stegun 7.1.26 erf, |error| < 1e-7), vectorized."""
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.copysign(erf, x))
+
+
+def black76(forward, strike, t, sigma, rate=RATE):
+    """(call, put) prices, all inputs broadcast against each other."""
+    vol_t = sigma * np.sqrt(t)
+    d1 = (np.log(forward / strike) + 0.5 * vol_t * vol_t) / vol_t
+    d2 = d1 - vol_t
+    discount = np.exp(-rate * t)
+    call = discount * (forward * norm_cdf(d1) - strike * norm_cdf(d2))
+    put = discount * (strike * norm_cdf(-d2) - forward * norm_cdf(-d1))
+    return call, put
+
+
+def expiry_minute(expiry):
+    """Epoch minute of a contract expiry like '25NOV' (last EXPIRY_WEEKDAY of the month, 15:30)."""
+    day = datetime.strptime(expiry, "%y%b")
+    last = calendar.monthrange(day.year, day.month)[1]
+    expiry_day = datetime(day.year, day.month, last, *EXPIRY_TIME)
+    expiry_day -= timedelta(days=(expiry_day.weekday() - EXPIRY_WEEKDAY) % 7)
+    return to_epoch_minute(expiry_day)
+
+
+def strike_grid(prices, step=STRIKE_STEP, strikes=STRIKES):
+    """`strikes` strikes centred on the first price, widened to cover the series' range."""
+    lo = min(round(prices.min() / step), round(prices[0] / step) - strikes // 2)
+    hi = max(round(prices.max() / step), round(prices[0] / step) + (strikes - strikes // 2) - 1)
+    return np.arange(lo, hi + 1) * float(step)
+
+
+def price_chain(minutes, underlying, strikes, expiry, surface, rate=RATE, futures=False):
+    """
+    minutes: (n,) epoch minutes; underlying: (4, n) open / high / low /
+    close of the spot (futures=False) or futures series; strikes: (k,).
+    Returns (calls, puts), each (4, k, n) open / high / low / close.
+    """
+    t = np.maximum(expiry_minute(expiry) - np.asarray(minutes, dtype=np.float64), 1.0) / MINUTES_PER_YEAR
+    underlying = np.asarray(underlying, dtype=np.float64)
+    forward = underlying if futures else underlying * np.exp(rate * t)
+
+    forward = forward[:, None, :]                   # (4, 1, n)
+    strike = np.asarray(strikes, dtype=np.float64)[None, :, None]
+    sigma = surface(np.log(strike / forward), t)    # (4, k, n)
+    call, put = black76(forward, strike, t, sigma, rate)
+    call = np.maximum(np.round(call, 2), MIN_PRICE)
+    put = np.maximum(np.round(put, 2), MIN_PRICE)
+
+    # bar order: underlying high -> call high / put low, underlying low -> call low / put high
+    o, h, l, c = call
+    calls = np.stack([o, np.maximum(h, l), np.minimum(h, l), c])
+    o, h, l, c = put
+    puts = np.stack([o, np.maximum(h, l), np.minimum(h, l), c])
+    return calls, puts
+
+
+# -------------------------
+# Store output
+# -------------------------
+def write_chain_store(source, out_dir, underlying_token, underlying="NIFTY", expiry="25NOV",
+                      surface=None, strikes=STRIKES, step=STRIKE_STEP, rate=RATE, futures=False,
+                      lookup=None):
+    """
+    Copy store `source` to out_dir with a synthetic chain added; recorded
+    option tokens are kept as they are. lookup(underlying, expiry, strike,
+    kind) -> token or 'NOT FOUND' (load_csv.get_contract_id by default).
+    Returns (options added, options not in the contract master, pricing seconds).
+    """
+    if lookup is None:
+        from load_csv import get_contract_id as lookup
+    store = MarketStore(source)
+    minute, *ohlc = store.columns(underlying_token)
+    grid = strike_grid(np.asarray(ohlc[3]), step, strikes)
+
+    t0 = time.perf_counter()
+    calls, puts = price_chain(minute, ohlc, grid, expiry, surface or VolSurface(), rate, futures)
+    elapsed = time.perf_counter() - t0
+
+    chain = {}
+    skipped = 0
+    for k, strike in enumerate(grid):
+        for kind, prices in (("CE", calls), ("PE", puts)):
+            token = str(lookup(underlying, expiry, strike, kind))
+            if token == "NOT FOUND":
+                skipped += 1
+            elif token not in store.index:
+                chain[token] = (minute, *prices[:, k])
+
+    write_store(out_dir, [(token, store.columns(token)) for token in store.tokens()] + list(chain.items()))
+    return len(chain), skipped, elapsed
+
+
+# -------------------------
+# Runner
+# -------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="market_store dir or market_data.pkl")
+    parser.add_argument("out", help="output market_store dir (replay with FeedDistributor)")
+    parser.add_argument("--underlying", default="NIFTY")
+    parser.add_argument("--expiry", default="25NOV")
+    parser.add_argument("--token", default=None, help="underlying token, defaults to <underlying>-SPOT "
+                                                      "(or the <expiry> future with --futures)")
+    parser.add_argument("--futures", action="store_true", help="price off the futures series (Black-76)")
+    parser.add_argument("--strikes", type=int, default=STRIKES)
+    parser.add_argument("--step", type=float, default=STRIKE_STEP)
+    parser.add_argument("--rate", type=float, default=RATE)
+    parser.add_argument("--vol", type=float, default=0.14, help="ATM implied vol")
+    parser.add_argument("--skew", type=float, default=0.0)
+    parser.add_argument("--smile", type=float, default=0.0)
+    parser.add_argument("--term", type=float, default=0.0)
+    args = parser.parse_args()
+
+    from load_csv import get_contract_id
+    token = args.token or get_contract_id(args.underlying, args.expiry, kind="FUT" if args.futures else "SPOT")
+    if token == "NOT FOUND":
+        sys.exit(f"No underlying token for {args.underlying} in the contract master, pass --token")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = args.source
+        if not MarketStore.is_store(source):
+            source = os.path.join(tmp, "market_store")
+            convert_pickle(args.source, source)
+
+        added, skipped, elapsed = write_chain_store(
+            source, args.out, str(token), args.underlying, args.expiry,
+            VolSurface(args.vol, args.skew, args.smile, args.term),
+            args.strikes, args.step, args.rate, args.futures)
+    print(f"Added {added} option tokens to {args.out} ({skipped} not in the contract master), "
+          f"chain priced in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,122 @@
+"""
+Order Store
+Indexed, bounded book of orders and fills for the OMS.
+
+• orders are indexed by order_id, symbol and status; a status change moves
+  the order between status indexes, so NEW -> FILLED / REJECTED / CANCELLED
+  leaves the pending (NEW) set.
+• Terminal orders beyond max_orders are evicted oldest first.
+• Fills beyond max_fills are evicted oldest first and, if spill_path is
+  set, appended to that file as JSON lines before being dropped.
+"""
+
+import json
+from collections import deque
+from records import OrderStatus, as_status
+
+NEW = OrderStatus.NEW
+FILLED = OrderStatus.FILLED
+REJECTED = OrderStatus.REJECTED
+CANCELLED = OrderStatus.CANCELLED
+
+TRANSITIONS = {
+    NEW: {FILLED, REJECTED, CANCELLED},
+    FILLED: set(),
+    REJECTED: set(),
+    CANCELLED: set(),
+}
+
+
+class OrderStore:
+    def __init__(self, max_orders=None, max_fills=None, spill_path=None):
+        self.max_orders = max_orders
+        self.max_fills = max_fills
+        self.spill_path = spill_path
+        self._spill_file = None
+
+        self.orders = {}                                # order_id -> order
+        self.symbol_index = {}                          # symbol -> {order_id: None}
+        self.status_index = {s: {} for s in TRANSITIONS}  # status -> {order_id: None}
+        self.terminal = deque()                         # terminal order ids, oldest first
+
+        self.fills = deque()                            # retained fills, oldest first
+        self.fill_index = {}                            # order_id -> fill
+        self.spilled_fills = 0
+
+    # -------------------------
+    # Orders
+    # -------------------------
+    def add(self, order):
+        order_id = order.order_id
+        self.orders[order_id] = order
+        self.symbol_index.setdefault(order.symbol, {})[order_id] = None
+        self.status_index[order.status][order_id] = None
+        if not TRANSITIONS[order.status]:
+            self._retire(order_id)
+
+    def transition(self, order_id, status):
+        status = as_status(status)
+        order = self.orders[order_id]
+        current = order.status
+        if status not in TRANSITIONS[current]:
+            raise ValueError(f"Invalid order transition {current} -> {status} for order {order_id}")
+
+        del self.status_index[current][order_id]
+        self.status_index[status][order_id] = None
+        order.status = status
+        if not TRANSITIONS[status]:
+            self._retire(order_id)
+        return order
+
+    def _retire(self, order_id):
+        self.terminal.append(order_id)
+        if self.max_orders is not None:
+            while len(self.terminal) > self.max_orders:
+                self._evict_order(self.terminal.popleft())
+
+    def _evict_order(self, order_id):
+        order = self.orders.pop(order_id)
+        del self.status_index[order.status][order_id]
+        ids = self.symbol_index[order.symbol]
+        del ids[order_id]
+        if not ids:
+            del self.symbol_index[order.symbol]
+
+    def get(self, order_id):
+        return self.orders.get(order_id)
+
+    def by_symbol(self, symbol):
+        return [self.orders[i] for i in self.symbol_index.get(symbol, ())]
+
+    def by_status(self, status):
+        return [self.orders[i] for i in self.status_index[as_status(status)]]
+
+    def pending(self):
+        return self.by_status(NEW)
+
+    # -------------------------
+    # Fills
+    # -------------------------
+    def add_fill(self, fill):
+        self.fills.append(fill)
+        self.fill_index[fill.order_id] = fill
+        if self.max_fills is not None:
+            while len(self.fills) > self.max_fills:
+                self._evict_fill(self.fills.popleft())
+
+    def _evict_fill(self, fill):
+        if self.fill_index.get(fill.order_id) is fill:
+            del self.fill_index[fill.order_id]
+        if self.spill_path:
+            if self._spill_file is None:
+                self._spill_file = open(self.spill_path, "a")
+            self._spill_file.write(json.dumps(fill.as_dict(), default=str) + "\n")
+            self.spilled_fills += 1
+
+    def fill_for(self, order_id):
+        return self.fill_index.get(order_id)
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
@@ -0,0 +1,123 @@
+"""
+Trading Records
+Compact typed records shared by OMS, RMS, the order store and strategies.
+
+• Side / OrderStatus are str-valued enums, so they still compare equal to
+  the plain strings ("BUY", "FILLED", ...) used in logs and older callers.
+• Order / Fill / Position / TradeSummary use __slots__ (no per-record
+  __dict__, attribute access instead of string-key hashing).
+• as_dict() gives the old dict shape (enum members as plain strings) for
+  logging, JSON and reports.
+"""
+
+from enum import Enum
+
+
+# -------------------------
+# Enums
+# -------------------------
+class Side(str, Enum):
+    BUY = "BUY"
+    SELL = "SELL"
+
+    def __str__(self):
+        return self.value
+
+    @property
+    def opposite(self):
+        return Side.SELL if self is Side.BUY else Side.BUY
+
+
+class OrderStatus(str, Enum):
+    NEW = "NEW"
+    FILLED = "FILLED"
+    REJECTED = "REJECTED"
+    CANCELLED = "CANCELLED"
+
+    def __str__(self):
+        return self.value
+
+
+def as_side(value):
+    """Side member for a Side or "BUY"/"SELL" (skips the slow Enum call when already a member)."""
+    return value if value.__class__ is Side else Side(value)
+
+
+def as_status(value):
+    return value if value.__class__ is OrderStatus else OrderStatus(value)
+
+
+# -------------------------
+# Records
+# -------------------------
+class Record:
+    __slots__ = ()
+
+    def as_dict(self):
+        out = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            out[name] = value.value if isinstance(value, Enum) else value
+        return out
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.as_dict()})"
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    __hash__ = None
+
+
+class Order(Record):
+    __slots__ = ("order_id", "symbol", "side", "qty", "price", "timestamp", "status")
+
+    def __init__(self, order_id, symbol, side, qty, price, timestamp, status=OrderStatus.NEW):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.qty = qty
+        self.price = price
+        self.timestamp = timestamp
+        self.status = status
+
+
+class Fill(Record):
+    __slots__ = ("order_id", "symbol", "side", "qty", "filled_price", "timestamp")
+
+    def __init__(self, order_id, symbol, side, qty, filled_price, timestamp):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side
+        self.qty = qty
+        self.filled_price = filled_price
+        self.timestamp = timestamp
+
+
+class Position(Record):
+    __slots__ = ("side", "qty", "avg_price")
+
+    def __init__(self, side, qty, avg_price):
+        self.side = side
+        self.qty = qty
+        self.avg_price = avg_price
+
+
+class TradeSummary(Record):
+    """One closed trade as reported by a strategy (and rebuilt by backtests)."""
+    __slots__ = ("symbol", "side", "qty", "entry_time", "exit_time",
+                 "entry_price", "exit_price", "realized_pnl", "reason")
+
+    def __init__(self, symbol, side, qty, entry_time, exit_time,
+                 entry_price, exit_price, realized_pnl, reason):
+        self.symbol = symbol
+        self.side = side
+        self.qty = qty
+        self.entry_time = entry_time
+        self.exit_time = exit_time
+        self.entry_price = entry_price
+        self.exit_price = exit_price
+        self.realized_pnl = realized_pnl
+        self.reason = reason
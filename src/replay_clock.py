@@ -0,0 +1,91 @@
+"""
+Replay Clock
+Paces a replay by bar timestamps instead of a fixed sleep per message.
+
+• multiplier = 1 replays in real time, 60 plays one bar-minute per second,
+  600 ten per second; None / 0 / "max" does not sleep at all.
+• Every bar gets an absolute deadline measured from the start of the pass:
+      deadline = t0 + (minute - first_minute) * 60 / multiplier
+  so sleep overshoot on one bar is absorbed by the next, never accumulated.
+• Gaps longer than max_gap_minutes (overnight, weekends) are not replayed:
+  the clock re-anchors on the bar after the gap.
+"""
+
+import time
+
+
+class ReplayClock:
+    def __init__(self, multiplier=60, max_gap_minutes=60):
+        if multiplier in (None, 0, "max"):
+            multiplier = None
+        elif multiplier < 0:
+            raise ValueError("multiplier must be positive, 0 or 'max'")
+        self.multiplier = multiplier
+        self.max_gap_minutes = max_gap_minutes
+        self.start()
+
+    def start(self):
+        """Begin a new pass; the next bar becomes the anchor."""
+        self.t0 = None
+        self.anchor_minute = None
+        self.last_minute = None
+        self.sim_minutes = 0        # bar-time covered this pass, gaps excluded
+        self.bars = 0
+        self.max_lag = 0.0          # worst lateness vs deadline (seconds)
+        self.started_at = time.perf_counter()
+
+    def wait(self, minute, on_idle=None):
+        """
+        Block until the deadline of a bar stamped `minute` (epoch minute).
+        on_idle() is called once before an actual sleep, e.g. to flush batches.
+        """
+        self.bars += 1
+        now = time.perf_counter()
+
+        if self.t0 is None:
+            self.t0 = now
+            self.anchor_minute = self.last_minute = minute
+            return
+
+        step = minute - self.last_minute
+        self.last_minute = minute
+        gap = self.max_gap_minutes is not None and step > self.max_gap_minutes
+        if step > 0 and not gap:
+            self.sim_minutes += step
+
+        if self.multiplier is None:
+            return
+
+        if gap:
+            # Skip the gap: the bar after it is due when the bar before it was
+            self.t0 = max(now, self.deadline(minute - step))
+            self.anchor_minute = minute
+            return
+
+        deadline = self.deadline(minute)
+        if deadline <= now:
+            self.max_lag = max(self.max_lag, now - deadline)
+            return
+
+        if on_idle is not None:
+            on_idle()
+            now = time.perf_counter()
+        if deadline > now:
+            time.sleep(deadline - now)
+
+    def deadline(self, minute):
+        return self.t0 + (minute - self.anchor_minute) * 60.0 / self.multiplier
+
+    def stats(self):
+        """Achieved vs target replay rate for the current pass."""
+        elapsed = time.perf_counter() - self.started_at
+        achieved = self.sim_minutes * 60.0 / elapsed if elapsed > 0 else 0.0
+        return {
+            "bars": self.bars,
+            "elapsed_s": round(elapsed, 3),
+            "sim_minutes": self.sim_minutes,
+            "target_x": self.multiplier or "max",
+            "achieved_x": round(achieved, 2),
+            "bars_per_s": round(self.bars / elapsed, 1) if elapsed > 0 else 0.0,
+            "max_lag_ms": round(self.max_lag * 1e3, 3)
+        }
@@ -33,6 +33,9 @@ COMPONENTS = [
     {"script": None, "name": "OMS", "wait": 1},   # OMS module initialization
     {"script": None, "name": "RMS", "wait": 1},   # RMS module initialization
 
+    # ENABLE THIS for one firm-wide OMS / RMS (strategies built with oms_addr="tcp://localhost:5557")
+    # {"script": "src/oms_service.py", "name": "OMS/RMS Service", "wait": 1},
+
     # -------------------------------
     # STRATEGY EXECUTION CONTROL
     # -------------------------------
@@ -42,6 +45,10 @@ COMPONENTS = [
 
     # ENABLED: Mean Reversion Strategy
     {"script": "src/strategy_mean_reversion.py", "name": "Mean Reversion Strategy", "wait": 0},
+
+    # ENABLE THIS (instead of the entries above) to run every strategy listed in
+    # strategy_host.STRATEGIES in one process on one feed socket
+    # {"script": "src/strategy_host.py", "name": "Strategy Host", "wait": 0},
 ]
 
 
@@ -1,9 +1,15 @@
 import zmq
 import pickle
 import time
-import logging
 from datetime import datetime
 import os
+import heapq
+import threading
+from feed_codec import WIRE_BINARY, encode_bar, encode_batch, encode_ohlcv, encode_trace
+from bar_aggregator import BarAggregator
+from market_store import MarketStore, iter_pickle_bars
+from replay_clock import ReplayClock
+from log_setup import get_logger, TickLog
 
 # -------------------------
 # Logging Setup
@@ -12,56 +18,230 @@ LOG_DIR = "./logs/Feed_Distributor"
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + "_feed_distributor.log")
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.INFO,
-    format="%(asctime)s - %(message)s"
-)
+logger = get_logger("FeedDistributor", LOG_FILE, console_level=None, fmt="%(asctime)s - %(message)s")
 
 # -------------------------
 # Feed Distributor
 # -------------------------
 class FeedDistributor:
-    def __init__(self, pickle_file, speed=0.2):
+    """
+    time_ordered=True replays all tokens merged by bar minute (spot, futures
+    and option legs stay aligned); False replays token by token.
+
+    batch_size > 1 packs up to that many bars of a topic into one frame.
+    Partial batches are flushed once the oldest buffered bar is
+    flush_interval seconds old, and at the end of each replay pass.
+
+    snapshot_addr serves the latest bar per token over a ROUTER socket
+    (started by run()) so late or restarted subscribers can bootstrap
+    without waiting for the next tick, see serve_snapshots().
+
+    replay_speed paces the replay by bar timestamps (1, 60, 600, ... x real
+    time, or "max") with drift-free deadlines, see replay_clock.py. When it
+    is None the legacy fixed `speed` sleep after every message is used.
+
+    bar_periods, e.g. (3, 5, 15), also publishes each token's bars of those
+    periods on BAR<period>:<token> topics as they complete (bar_aggregator.py),
+    plus the partial bars at the end of each replay pass.
+
+    trace, a clock such as time.monotonic_ns, stamps every bar when
+    publish() is called and sends the stamps as a third frame (feed_codec
+    encode_trace), for end-to-end latency measurements; batched bars keep
+    the time they entered the batch.
+    """
+    def __init__(self, pickle_file, speed=0.2, wire_format=WIRE_BINARY,
+                 batch_size=1, flush_interval=0.05, bind_addr="tcp://*:5555",
+                 time_ordered=True, replay_speed=None, snapshot_addr="tcp://*:5556", bar_periods=(),
+                 trace=None):
         self.pickle_file = pickle_file
+        self.snapshot_addr = snapshot_addr
+        self.last_bars = {}         # token -> latest published bar (last-value cache)
         self.speed = speed
+        self.clock = ReplayClock(replay_speed) if replay_speed is not None else None
+        self.time_ordered = time_ordered
+        self.wire_format = wire_format
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.bar_periods = tuple(bar_periods)
+        self.trace = trace
+
+        self.batches = {}           # topic -> (token, [bars], [trace stamps])
+        self.oldest_pending = None  # monotonic time of first unflushed bar
 
         self.context = zmq.Context()
         self.socket = self.context.socket(zmq.PUB)
-        self.socket.bind("tcp://*:5555")
+        self.socket.bind(bind_addr)
 
-        logging.info("FeedDistributor initialized")
+        self.hot = TickLog(logger)     # per-bar SENT lines, sampled
+        logger.info("FeedDistributor initialized")
 
     def load_data(self):
+        """Accepts market_data.pkl or a columnar market_store directory (market_store.py)."""
+        if MarketStore.is_store(self.pickle_file):
+            store = MarketStore(self.pickle_file)
+            self.bars = {token: store.bars(token) for token in store.tokens()}
+            logger.info(f"Opened market store {self.pickle_file}: {len(self.bars)} tokens, {store.rows} bars")
+            return
+
         self.data = pickle.load(open(self.pickle_file, "rb"))
-        logging.info(f"Loaded market data: {list(self.data.keys())}")
+        logger.info(f"Loaded market data: {list(self.data.keys())}")
+        # token -> list of (epoch_minute, open, high, low, close); timestamps
+        # are parsed once here instead of by every subscriber
+        self.bars = dict(iter_pickle_bars(self.data))
 
-    def run(self):
-        logging.info("Starting feed distributor (rolling mode)...")
-        time.sleep(1)   # allow subscribers to connect
+    def publish(self, topic, token, bar):
+        """Send one bar, or buffer it when batching is enabled."""
+        stamp = self.trace() if self.trace is not None else None
+        self.last_bars[token] = bar
+        self.hot.tick()
 
-        while True:  # rolling loop
-            for token, bars in self.data['Close'].items():
+        if self.batch_size <= 1:
+            payload = encode_bar(token, *bar, wire_format=self.wire_format)
+            if stamp is None:
+                self.socket.send_multipart([topic, payload])
+            else:
+                self.socket.send_multipart([topic, payload, encode_trace((stamp,))])
+            self.hot("SENT MARKET:%s %s", token, bar)
+            return
+
+        now = time.monotonic()
+        pending = self.batches.get(topic)
+        if pending is None:
+            pending = self.batches[topic] = (token, [], [])
+            if self.oldest_pending is None:
+                self.oldest_pending = now
+        pending[1].append(bar)
+        if stamp is not None:
+            pending[2].append(stamp)
+
+        if len(pending[1]) >= self.batch_size:
+            self.flush_topic(topic)
+        if self.oldest_pending is not None and now - self.oldest_pending >= self.flush_interval:
+            self.flush()
+
+    def flush_topic(self, topic):
+        token, bars, stamps = self.batches.pop(topic)
+        payload = encode_batch(token, bars, wire_format=self.wire_format)
+        if stamps:
+            self.socket.send_multipart([topic, payload, encode_trace(stamps)])
+        else:
+            self.socket.send_multipart([topic, payload])
+        self.hot("SENT MARKET:%s batch of %d bars, last=%s", token, len(bars), bars[-1])
+        if not self.batches:
+            self.oldest_pending = None
+
+    def publish_bars(self, token, bars):
+        """Send aggregated (period, bar) pairs of one token, after its buffered 1-minute bars."""
+        market_topic = f"MARKET:{token}".encode()
+        if market_topic in self.batches:
+            self.flush_topic(market_topic)
+        for period, bar in bars:
+            self.socket.send_multipart([f"BAR{period}:{token}".encode(), encode_ohlcv(token, period, *bar)])
+            self.hot("SENT BAR%d:%s %s", period, token, bar)
+
+    def flush(self):
+        """Send every partially filled batch."""
+        for topic in list(self.batches):
+            self.flush_topic(topic)
+        self.oldest_pending = None
+
+    def iter_bars(self):
+        """Yield (token, bar) for one pass over the dataset."""
+        if not self.time_ordered:
+            for token, bars in self.bars.items():
                 for bar in bars:
+                    yield token, bar
+            return
+
+        # Lazy k-way merge on the minute: heapq.merge keeps one head bar per
+        # token in a heap (O(log k) per bar) and never builds the merged list.
+        # Each token's bars must already be in time order; ties keep token order.
+        streams = [
+            self._keyed(rank, token, bars)
+            for rank, (token, bars) in enumerate(self.bars.items())
+        ]
+        for _, _, token, bar in heapq.merge(*streams):
+            yield token, bar
+
+    @staticmethod
+    def _keyed(rank, token, bars):
+        # (minute, rank) orders the heap without ever comparing bar tuples
+        for bar in bars:
+            yield bar[0], rank, token, bar
+
+    def replay_once(self):
+        topics = {token: f"MARKET:{token}".encode() for token in self.bars}
+        aggregator = BarAggregator(self.bar_periods) if self.bar_periods else None
+
+        if self.clock:
+            self.clock.start()
+
+        for token, bar in self.iter_bars():
+            if self.clock:
+                # bars still buffered in batches go out before the clock sleeps
+                self.clock.wait(bar[0], on_idle=self.flush)
+
+            self.publish(topics[token], token, bar)
+            if aggregator is not None:
+                completed = aggregator.update(token, *bar)
+                if completed:
+                    self.publish_bars(token, completed)
 
-                    msg = {
-                        "symbol": token,
-                        "timestamp": bar["Minute"],
-                        "price": bar["Price"]
-                    }
+            if self.speed and not self.clock:
+                time.sleep(self.speed)
 
-                    topic = f"MARKET:{token}".encode()
+        if aggregator is not None:
+            for token, period, bar in aggregator.flush():
+                self.publish_bars(token, [(period, bar)])
+        self.flush()
+        if self.clock:
+            logger.info(f"Replay pass finished: {self.clock.stats()}")
 
-                    self.socket.send_multipart([topic, pickle.dumps(msg)])
+    def serve_snapshots(self):
+        """
+        ROUTER loop (own thread). Request: one frame with comma-separated
+        tokens, empty for all tokens. Reply: b"OK" followed by one binary
+        bar record per token that has been published; unknown tokens are
+        left out.
+        """
+        router = self.context.socket(zmq.ROUTER)
+        router.bind(self.snapshot_addr)
+        logger.info(f"Snapshot service listening on {self.snapshot_addr}")
 
-                    logging.info(f"SENT {topic.decode()} {msg}")
+        while True:
+            identity, empty, request = router.recv_multipart()
+            last_bars = self.last_bars.copy()
 
-                    time.sleep(self.speed)
+            if request:
+                tokens = request.decode().split(",")
+            else:
+                tokens = list(last_bars)
+
+            frames = [
+                encode_bar(token, *last_bars[token])
+                for token in tokens if token in last_bars
+            ]
+            router.send_multipart([identity, empty, b"OK", *frames])
+            logger.info(f"SNAPSHOT served {len(frames)}/{len(tokens)} tokens")
+
+    def start_snapshot_service(self):
+        if not self.snapshot_addr:
+            return
+        threading.Thread(target=self.serve_snapshots, name="snapshot-service", daemon=True).start()
+
+    def run(self):
+        logger.info("Starting feed distributor (rolling mode)...")
+        self.start_snapshot_service()
+        time.sleep(1)   # allow subscribers to connect
+
+        while True:  # rolling loop
+            self.replay_once()
 
-            logging.info("End of dataset reached, restarting...")
+            logger.info("End of dataset reached, restarting...")
             time.sleep(1)
 
 if __name__ == "__main__":
-    feed = FeedDistributor("./data/market_data.pkl", speed=0)
+    data_path = "./data/market_store" if MarketStore.is_store("./data/market_store") else "./data/market_data.pkl"
+    feed = FeedDistributor(data_path, replay_speed="max")
     feed.load_data()
     feed.run()
\ No newline at end of file
@@ -1,9 +1,11 @@
 # oms.py
-import logging
 import itertools
 import random
 from datetime import datetime
 import os
+from order_store import OrderStore
+from records import Order, Fill, Position, Side, OrderStatus, as_side
+from log_setup import get_logger
 
 # -------------------------
 # Logging Setup
@@ -12,20 +14,14 @@ LOG_DIR = "./logs/OMS/"
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + "_oms.log")
 
-logging.basicConfig(
-    filename=LOG_FILE,
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
-console = logging.StreamHandler()
-console.setLevel(logging.INFO)
-logging.getLogger().addHandler(console)
+logger = get_logger("OMS", LOG_FILE)
 
 
 class OMS:
     _id_counter = itertools.count(1)
 
-    def __init__(self, rms, slippage_pct=0.0005):
+    def __init__(self, rms, slippage_pct=0.0005, max_orders=100000, max_fills=100000, spill_path=None,
+                 journal=None):
         self.rms = rms
         self.slippage_pct = slippage_pct
         self.cum_realized_pnl = 0.0
@@ -34,62 +30,76 @@ class OMS:
 # Order Books
 # -------------------------
 
-        self.pending_orders = []     # accepted but not executed
-        self.executed_orders = []    # execution report list
+        # orders indexed by id / symbol / status, fills bounded (optionally spilled to disk)
+        self.store = OrderStore(max_orders=max_orders, max_fills=max_fills, spill_path=spill_path)
 
         # ------- Positions -------
-        self.positions = {}          # symbol -> {side, qty, avg_price}
+        self.positions = {}          # symbol -> Position
 
-    def place_order(self, symbol, side, qty, price, timestamp=None):
+        # ------- Mark-to-market (updated per price tick / fill, O(1)) -------
+        self.marks = {}              # symbol -> latest price
+        self.unrealized = {}         # symbol -> unrealized PnL of the open position at its mark
+        self.unrealized_pnl = 0.0    # sum of self.unrealized
+
+        # ------- Journal (trade_journal.TradeJournal, optional) -------
+        self.journal = journal
+
+    def place_order(self, symbol, side, qty, price, timestamp=None, reservation=None):
+        """
+        reservation: token from rms.reserve / rms.check_basket for this
+        order (already checked); without one the RMS check runs here. An
+        unknown or spent token, or one booked for another symbol, side or
+        qty, rejects the order; a mismatched token is released, so its
+        exposure does not stay booked.
+        """
 
         if timestamp is None:
             timestamp = datetime.now()
 
+        side = as_side(side)
         order_id = next(OMS._id_counter)
-        order = {
-            "order_id": order_id,
-            "symbol": symbol,
-            "side": side,
-            "qty": qty,
-            "price": price,
-            "timestamp": timestamp,
-            "status": "NEW"
-        }
+        order = Order(order_id, symbol, side, qty, price, timestamp)
 
-        logging.info(f"OMS NEW ORDER: {order}")
+        logger.info("OMS NEW ORDER: %s", order)
+        self.store.add(order)
+        if self.journal:
+            self.journal.order(order)
 
 # -------------------------
 # RMS Check
 # -------------------------
 
-        if not self.rms.check_order(symbol, side, qty, price, current_pnl=self.cum_realized_pnl):
-            order["status"] = "REJECTED"
-            logging.warning(f"OMS ORDER REJECTED BY RMS: {order}")
+        if reservation is None:
+            reservation = self.rms.reserve(symbol, side, qty, price)
+        elif not self.rms.matches(reservation, symbol, side, qty):
+            logger.warning("OMS RESERVATION %s DOES NOT MATCH: %s", reservation, order)
+            self.rms.release(reservation)
+            reservation = None
+        if reservation is None:
+            self.store.transition(order_id, OrderStatus.REJECTED)
+            if self.journal:
+                self.journal.order(order)
+            logger.warning("OMS ORDER REJECTED BY RMS: %s", order)
             return order
 
-        # Add to pending book
-        self.pending_orders.append(order)
-
         # ---- Simulated Execution (fills) ----
         slippage = random.uniform(-self.slippage_pct, self.slippage_pct)
         filled_price = round(price * (1 + slippage), 2)
 
-        fill = {
-            "order_id": order_id,
-            "symbol": symbol,
-            "side": side,
-            "qty": qty,
-            "filled_price": filled_price,
-            "timestamp": timestamp
-        }
+        fill = Fill(order_id, symbol, side, qty, filled_price, timestamp)
 
-        order["status"] = "FILLED"
-        self.executed_orders.append(fill)
+        self.store.transition(order_id, OrderStatus.FILLED)
+        self.store.add_fill(fill)
+        self.rms.commit(reservation)
+        self.rms.on_fill(symbol, side, qty, filled_price)
+        if self.journal:
+            self.journal.order(order)
+            self.journal.fill(fill)
 
-        logging.info(f"OMS EXECUTION: {fill}")
+        logger.info("OMS EXECUTION: %s", fill)
 
         # ---- POSITION UPDATE + PnL ----
-        self._update_position(symbol, side, qty, filled_price, order_id)
+        self._update_position(symbol, side, qty, filled_price, order_id, timestamp)
 
         return fill
 
@@ -97,59 +107,127 @@ class OMS:
 # _update_position() method
 # -------------------------
 
-    def _update_position(self, symbol, side, qty, price, order_id):
+    def _update_position(self, symbol, side, qty, price, order_id, timestamp=None):
         pos = self.positions.get(symbol)
+        pnl = 0.0
 
         # Opening new position
         if pos is None:
-            self.positions[symbol] = {
-                "side": side,
-                "qty": qty,
-                "avg_price": price
-            }
-            logging.info(f"NEW POSITION: {self.positions[symbol]}")
-            return
+            pos = self.positions[symbol] = Position(side, qty, price)
+            logger.info("NEW POSITION: %s", pos)
 
         # If opposite position exists → close partially or fully
-        if pos["side"] != side:
-            close_qty = min(pos["qty"], qty)
+        elif pos.side is not side:
+            close_qty = min(pos.qty, qty)
 
-            if pos["side"] == "BUY":
-                pnl = (price - pos["avg_price"]) * close_qty
+            if pos.side is Side.BUY:
+                pnl = (price - pos.avg_price) * close_qty
             else:
-                pnl = (pos["avg_price"] - price) * close_qty
+                pnl = (pos.avg_price - price) * close_qty
 
             self.cum_realized_pnl += pnl
             self.rms.update_realized_loss(pnl)
 
-            logging.info(
-                f"TRADE CLOSED: OrderID={order_id} "
-                f"PnL={pnl:.2f}, CumulativePnL={self.cum_realized_pnl:.2f}"
-            )
+            logger.info("TRADE CLOSED: OrderID=%s PnL=%.2f, CumulativePnL=%.2f",
+                        order_id, pnl, self.cum_realized_pnl)
 
-            pos["qty"] -= close_qty
+            pos.qty -= close_qty
 
-            if pos["qty"] == 0:
+            if pos.qty == 0:
                 del self.positions[symbol]
 
             # Leftover qty starts a new position
             leftover = qty - close_qty
             if leftover > 0:
-                self.positions[symbol] = {
-                    "side": side,
-                    "qty": leftover,
-                    "avg_price": price
-                }
+                self.positions[symbol] = Position(side, leftover, price)
 
         else:
             # Increasing same-side position
-            old_qty = pos["qty"]
+            old_qty = pos.qty
             new_qty = old_qty + qty
-            new_avg = (pos["avg_price"] * old_qty + price * qty) / new_qty
-            pos["qty"] = new_qty
-            pos["avg_price"] = new_avg
+            pos.avg_price = (pos.avg_price * old_qty + price * qty) / new_qty
+            pos.qty = new_qty
+
+            logger.info("UPDATED POSITION: %s", pos)
+
+        self._mark(symbol, self.marks.get(symbol, price))
+
+        if self.journal:
+            self.journal.position(symbol, self.positions.get(symbol), timestamp, pnl, order_id)
+
+# -------------------------
+# Mark-to-market
+# -------------------------
+
+    def _mark(self, symbol, price):
+        """Re-value one symbol's position at `price` and adjust the portfolio total."""
+        pos = self.positions.get(symbol)
+        old = self.unrealized.pop(symbol, 0.0)
+        if pos is None:
+            new = 0.0
+            if not self.positions:
+                # flat book: reset the running total (no float drift carried over)
+                self.unrealized_pnl = old = 0.0
+        else:
+            if pos.side is Side.BUY:
+                new = (price - pos.avg_price) * pos.qty
+            else:
+                new = (pos.avg_price - price) * pos.qty
+            self.unrealized[symbol] = new
+        self.unrealized_pnl += new - old
+        self.rms.update_pnl(self.cum_realized_pnl + self.unrealized_pnl)
+
+    def update_price(self, symbol, price):
+        """Latest price of a symbol; returns portfolio unrealized PnL."""
+        self.marks[symbol] = price
+        self.rms.update_price(symbol, price)
+        if symbol in self.positions:
+            self._mark(symbol, price)
+        return self.unrealized_pnl
+
+    @property
+    def total_pnl(self):
+        """Realized + unrealized PnL at the latest marks (pushed to the RMS daily-loss check)."""
+        return self.cum_realized_pnl + self.unrealized_pnl
+
+# -------------------------
+# Journal
+# -------------------------
 
-            logging.info(f"UPDATED POSITION: {pos}")
+    def record_trade(self, summary):
+        """Journal a strategy's closed-trade summary (what daily_report is built from)."""
+        if self.journal:
+            self.journal.trade(summary)
+
+    def close(self):
+        self.store.close()
+        if self.journal:
+            self.journal.close()
+
+# -------------------------
+# Order book queries
+# -------------------------
+
+    @property
+    def pending_orders(self):
+        """Accepted but not yet executed orders."""
+        return self.store.pending()
+
+    @property
+    def executed_orders(self):
+        """Retained execution reports, oldest first."""
+        return list(self.store.fills)
+
+    def get_order(self, order_id):
+        return self.store.get(order_id)
+
+    def get_orders(self, symbol=None, status=None):
+        if symbol is not None:
+            orders = self.store.by_symbol(symbol)
+            return [o for o in orders if o.status == status] if status else orders
+        if status is not None:
+            return self.store.by_status(status)
+        return list(self.store.orders.values())
 
 # -------------------------
 # get_positions() method definition
@@ -162,20 +240,20 @@ class OMS:
 # get_unrealized_pnl() method definition
 # -------------------------
 
-    def get_unrealized_pnl(self, market_prices):
-        pnl = 0
-        for sym, pos in self.positions.items():
-            if pos["side"] == "BUY":
-                pnl += (market_prices[sym] - pos["avg_price"]) * pos["qty"]
-            else:
-                pnl += (pos["avg_price"] - market_prices[sym]) * pos["qty"]
-        return pnl
+    def get_unrealized_pnl(self, market_prices=None):
+        """Portfolio unrealized PnL at the latest marks; market_prices, if given, are applied first."""
+        if market_prices:
+            for sym, price in market_prices.items():
+                self.update_price(sym, price)
+        return self.unrealized_pnl
     
 # -------------------------
 # square_off_all() method definition
 # -------------------------
-    def square_off_all(self, market_prices):
-        logging.info("SQUARE-OFF TRIGGERED")
-        for sym, pos in list(self.positions.items()):
-            side = "SELL" if pos["side"] == "BUY" else "BUY"
-            self.place_order(sym, side, pos["qty"], market_prices[sym])
+    def square_off_all(self, market_prices, timestamp=None):
+        """Returns the closing Fill (or rejected Order) per position."""
+        logger.info("SQUARE-OFF TRIGGERED")
+        return [
+            self.place_order(sym, pos.side.opposite, pos.qty, market_prices[sym], timestamp)
+            for sym, pos in list(self.positions.items())
+        ]
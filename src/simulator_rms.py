@@ -1,7 +1,29 @@
 # rms.py
-import logging
+"""
+RMS
+Pre-trade exposure (net qty per symbol) and daily-loss checks.
+
+• reserve() checks an order once and books its exposure under a token;
+  OMS.place_order(..., reservation=token) commits it on the fill, and
+  release() gives the exposure back if the order is never sent. The OMS
+  rejects tokens that are unknown, already committed / released, or
+  booked for another symbol, side or qty (matches()), and releases the
+  latter.
+• check_basket() validates every leg of a multi-leg order in one pass and
+  reserves all legs or none (e.g. both legs of a straddle).
+• check_order() is reserve + commit, for callers that place directly.
+• Orders that only reduce existing net positions (exits, square-offs)
+  skip the daily-loss, exposure and margin checks, so a breached limit
+  never traps a position open.
+• With a margin_engine.MarginEngine and max_margin, both checks also
+  reject orders whose portfolio margin after the fill would exceed
+  max_margin; the OMS feeds it fills (on_fill) and marks (update_price).
+"""
+import itertools
 from datetime import datetime
 import os
+from records import Side, as_side
+from log_setup import get_logger, TickLog
 
 # -------------------------
 # Logging Setup
@@ -10,20 +32,7 @@ LOG_DIR = "./logs/RMS/"
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + "_rms.log")
 
-rms_logger = logging.getLogger("RMS")
-rms_logger.setLevel(logging.DEBUG)
-rms_logger.handlers.clear()
-rms_logger.propagate = False
-
-fh = logging.FileHandler(LOG_FILE)
-fh.setLevel(logging.DEBUG)
-fh.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-rms_logger.addHandler(fh)
-
-ch = logging.StreamHandler()
-ch.setLevel(logging.INFO)
-ch.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-rms_logger.addHandler(ch)
+rms_logger = get_logger("RMS", LOG_FILE)
 
 rms_logger.info(f"RMS Logger initialized -> {LOG_FILE}")
 
@@ -33,43 +42,136 @@ rms_logger.info(f"RMS Logger initialized -> {LOG_FILE}")
 # RMS
 # -------------------------
 class RMS:
-    def __init__(self, max_exposure=100, max_daily_loss=20000):
+    def __init__(self, max_exposure=100, max_daily_loss=20000, margin=None, max_margin=None):
         self.max_exposure = max_exposure
         self.max_daily_loss = max_daily_loss
-        self.exposure = {}          # symbol -> net qty
+        self.margin = margin                # margin_engine.MarginEngine, optional
+        self.max_margin = max_margin
+        self.exposure = {}          # symbol -> net qty, reservations included
+        self.reservations = {}      # token -> (symbol, signed qty) not yet committed / released
+        self._tokens = itertools.count(1)
         self.realized_loss = 0.0
+        self.total_pnl = 0.0        # realized + unrealized, kept current by the OMS (update_pnl)
+        self.hot = TickLog(rms_logger)      # per-order ACCEPTED lines
 
     def update_realized_loss(self, pnl):
         """Called by OMS after each closed trade"""
         if pnl < 0:
             self.realized_loss += abs(pnl)
 
-    def check_order(self, symbol, side, qty, price, current_pnl=None):
+    def update_pnl(self, total_pnl):
+        """Called by OMS whenever realized + unrealized PnL changes (fills, marks)."""
+        self.total_pnl = total_pnl
+
+    # -------------------------
+    # Margin
+    # -------------------------
+    def _margin_ok(self, legs):
+        """legs: [(symbol, side, qty, price)]; True if the portfolio margin after them is within max_margin."""
+        if self.margin is None or self.max_margin is None:
+            return True
+        required = self.margin.what_if(legs)
+        if required > self.max_margin:
+            rms_logger.warning("RMS REJECTED: margin %.2f over limit %.2f (%d legs)",
+                               required, self.max_margin, len(legs))
+            return False
+        return True
 
+    def on_fill(self, symbol, side, qty, price):
+        """Called by OMS after each fill."""
+        if self.margin is not None:
+            self.margin.fill(symbol, qty if side == Side.BUY else -qty, price)
+
+    def update_price(self, symbol, price):
+        if self.margin is not None:
+            self.margin.update_price(symbol, price)
+
+    # -------------------------
+    # Reservations
+    # -------------------------
+    def check_basket(self, legs, current_pnl=None):
+        """
+        legs: [(symbol, side, qty, price), ...]. Reserves every leg, or
+        none if any symbol's resulting net qty or the daily loss is over
+        its limit. current_pnl defaults to the PnL the OMS reported
+        (update_pnl). Returns one token per leg, or None when rejected.
+        A basket that only reduces existing net positions is not checked.
+        """
         if current_pnl is None:
-            current_pnl = 0
+            current_pnl = self.total_pnl
+
+        # Net qty per symbol after all legs
+        deltas = []
+        after = {}
+        for symbol, side, qty, price in legs:
+            delta = qty if as_side(side) is Side.BUY else -qty
+            after[symbol] = after.get(symbol, self.exposure.get(symbol, 0)) + delta
+            deltas.append((symbol, delta))
+
+        # Exits pass even when a limit is breached: they are how it gets back under
+        if not self._reduces(after):
+            # Daily loss check
+            if current_pnl < -self.max_daily_loss:
+                rms_logger.error(f"RMS REJECTED: daily loss breached")
+                return None
+
+            # Exposure check on the net qty after all legs
+            for symbol, new_qty in after.items():
+                if abs(new_qty) > self.max_exposure:
+                    rms_logger.warning("RMS REJECTED: exposure limit exceeded for %s (%d legs)", symbol, len(legs))
+                    return None
+            if not self._margin_ok([(symbol, as_side(side), qty, price) for symbol, side, qty, price in legs]):
+                return None
+
+        # Accept: book the exposure now, commit / release later
+        self.exposure.update(after)
+        tokens = []
+        for reservation, (symbol, side, qty, price) in zip(deltas, legs):
+            token = next(self._tokens)
+            self.reservations[token] = reservation
+            tokens.append(token)
+            self.hot.tick()
+            self.hot("RMS ACCEPTED: %s %s %s price=%s", side, qty, symbol, price)
+        return tokens
+
+    def _reduces(self, after):
+        """True if every symbol's net qty in `after` is closer to flat than now, without flipping side."""
+        for symbol, new_qty in after.items():
+            qty = self.exposure.get(symbol, 0)
+            if abs(new_qty) > abs(qty) or new_qty * qty < 0:
+                return False
+        return True
 
-        net_qty = self.exposure.get(symbol, 0)
-        new_qty = net_qty + qty if side == "BUY" else net_qty - qty
+    def reserve(self, symbol, side, qty, price, current_pnl=None):
+        """Token for one accepted order, or None when rejected (single-leg check_basket)."""
+        tokens = self.check_basket([(symbol, side, qty, price)], current_pnl)
+        return tokens[0] if tokens else None
 
-        # Exposure check
-        if abs(new_qty) > self.max_exposure:
-            rms_logger.warning(f"RMS REJECTED: exposure limit exceeded")
-            return False
+    def matches(self, token, symbol, side, qty):
+        """True if `token` is an outstanding (not committed / released) reservation for exactly this order."""
+        return self.reservations.get(token) == (symbol, qty if as_side(side) is Side.BUY else -qty)
 
-        # Daily loss check (only if enabled)
-        if hasattr(self, "max_daily_loss") and current_pnl < -self.max_daily_loss:
-            rms_logger.error(f"RMS REJECTED: daily loss breached")
-            return False
+    def commit(self, token):
+        """The reserved order was executed: its exposure stays."""
+        self.reservations.pop(token, None)
+
+    def release(self, token):
+        """The reserved order was not executed: give its exposure back."""
+        reservation = self.reservations.pop(token, None)
+        if reservation is not None:
+            symbol, delta = reservation
+            self.exposure[symbol] -= delta
 
-        # Accept order
-        self.exposure[symbol] = new_qty
-        rms_logger.info(f"RMS ACCEPTED: {side} {qty} {symbol} price={price}")
+    def check_order(self, symbol, side, qty, price, current_pnl=None):
+        token = self.reserve(symbol, side, qty, price, current_pnl)
+        if token is None:
+            return False
+        self.commit(token)
         return True
 
     def release_order(self, symbol, side, qty):
         # Cancel exposure on rejected/cancelled order
-        if side == "BUY":
+        if side == Side.BUY:
             self.exposure[symbol] -= qty
         else:
             self.exposure[symbol] += qty
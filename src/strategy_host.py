@@ -0,0 +1,220 @@
+"""
+Strategy Host
+Runs several strategy instances in one process on one SUB socket, instead
+of one interpreter per strategy (run.py).
+
+• One MarketSubscriber: every feed frame is received and decoded once,
+  the last-value cache is shared, and each bar goes to the handlers
+  registered for its topic (topic -> handlers table): the token for
+  1-minute bars, "BAR<period>:<token>" for aggregated bars, so a 5-minute
+  bar never reaches a 1-minute handler.
+• Each strategy keeps its own subscriptions through a MarketView (the
+  straddle's ATM legs follow spot) and its own OMS, RMS and journal.
+• Exceptions are isolated per strategy: a failing handler is logged under
+  the strategy's name and the other strategies keep receiving bars. After
+  MAX_ERRORS failures, or a SystemExit, the strategy is stopped.
+  StopIteration from a handler means the strategy is done for the day.
+• run() returns when every strategy has stopped; each strategy's
+  daily report runs when it stops.
+
+Run from repo root:
+    python src/strategy_host.py
+"""
+
+import os
+from datetime import datetime
+import zmq
+from log_setup import get_logger
+from market_subscriber import MarketSubscriber, MarketView, route_key
+
+# -------------------------
+# Logging Setup
+# -------------------------
+LOG_DIR = "./logs/StrategyHost/"
+os.makedirs(LOG_DIR, exist_ok=True)
+STAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
+LOG_FILE = os.path.join(LOG_DIR, STAMP + "_strategy_host.log")
+
+logger = get_logger("StrategyHost", LOG_FILE)
+
+FEED_ADDR = "tcp://localhost:5555"
+SNAPSHOT_ADDR = "tcp://localhost:5556"
+MAX_ERRORS = 5      # handler exceptions before a strategy is stopped
+
+# -------------------------
+# Strategies to host (name, kind, constructor parameters)
+# -------------------------
+STRATEGIES = [
+    {"name": "MeanReversion", "kind": "mean_reversion"},
+    # {"name": "MeanReversion_BB30", "kind": "mean_reversion", "params": {"bb_n": 30, "bb_k": 2.5}},
+    # {"name": "StraddleSeller", "kind": "straddle"},
+    # shared OMS / RMS service: add "params": {"oms_addr": "tcp://localhost:5557"}
+]
+
+
+class HostedStrategy:
+    __slots__ = ("name", "strategy", "handlers", "start", "stop", "errors", "active")
+
+    def __init__(self, name, strategy, handlers, start=None, stop=None):
+        self.name = name
+        self.strategy = strategy
+        self.handlers = handlers    # topic (token or "BAR<period>:<token>") -> handler(msg)
+        self.start = start
+        self.stop = stop
+        self.errors = 0
+        self.active = True
+
+
+class StrategyHost:
+    def __init__(self, feed_addr=FEED_ADDR, snapshot_addr=SNAPSHOT_ADDR):
+        self.context = zmq.Context()
+        self.market = MarketSubscriber(self.context, feed_addr)
+        self.snapshot_addr = snapshot_addr
+        self.strategies = []
+        self.table = {}             # topic -> ((HostedStrategy, handler), ...), see route_key()
+
+    def view(self):
+        """A MarketView for a strategy constructed on this host (its `market=` argument)."""
+        return MarketView(self.market)
+
+    def add(self, name, strategy, handlers, start=None, stop=None):
+        """
+        handlers: {topic: handler(msg)}, msg being the decoded feed bar;
+        topic is a token for its 1-minute bars or "BAR<period>:<token>"
+        for its aggregated bars (FeedDistributor bar_periods). start() runs before the loop (snapshot bootstrap), stop() when the
+        strategy stops for any reason.
+        """
+        hosted = HostedStrategy(name, strategy, {str(t): h for t, h in handlers.items()}, start, stop)
+        for topic in hosted.handlers:
+            if topic.startswith("BAR"):
+                period, token = topic[3:].split(":", 1)
+                strategy.market.subscribe_bars(token, int(period))
+            else:
+                strategy.market.subscribe(topic)
+        self.strategies.append(hosted)
+        self._rebuild_table()
+        logger.info("Hosting %s on topics %s", name, sorted(hosted.handlers))
+        return hosted
+
+    def _rebuild_table(self):
+        table = {}
+        for hosted in self.strategies:
+            if hosted.active:
+                for token, handler in hosted.handlers.items():
+                    table.setdefault(token, []).append((hosted, handler))
+        self.table = {token: tuple(entries) for token, entries in table.items()}
+
+    # -------------------------
+    # Isolation
+    # -------------------------
+    def _call(self, hosted, fn, *args):
+        """Run one strategy callback; its exceptions never reach the other strategies."""
+        try:
+            fn(*args)
+        except StopIteration:
+            self._stop(hosted, "finished")
+        except SystemExit as e:
+            logger.error("%s exited (code %s)", hosted.name, e.code)
+            self._stop(hosted, f"exit({e.code})")
+        except Exception:
+            hosted.errors += 1
+            logger.exception("%s failed (%d/%d)", hosted.name, hosted.errors, MAX_ERRORS)
+            if hosted.errors >= MAX_ERRORS:
+                self._stop(hosted, "too many errors")
+
+    def _stop(self, hosted, reason):
+        if not hosted.active:
+            return
+        hosted.active = False
+        self._rebuild_table()
+        logger.info("Stopping %s: %s", hosted.name, reason)
+        if hosted.stop:
+            try:
+                hosted.stop()
+            except BaseException:
+                logger.exception("%s stop failed", hosted.name)
+        hosted.strategy.market.close()
+
+    # -------------------------
+    # Loop
+    # -------------------------
+    def dispatch(self, msg):
+        for hosted, handler in self.table.get(route_key(msg), ()):
+            self._call(hosted, handler, msg)
+
+    def run(self, timeout_ms=1000):
+        logger.info("Strategy host started with %d strategies", len(self.strategies))
+        try:
+            for hosted in self.strategies:
+                if hosted.start:
+                    self._call(hosted, hosted.start)
+
+            while self.table:
+                msg = self.market.recv(timeout_ms)
+                if msg is not None:
+                    self.dispatch(msg)
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user.")
+        finally:
+            for hosted in self.strategies:
+                self._stop(hosted, "host shutdown")
+            self.close()
+
+    def close(self):
+        self.market.close()
+        self.context.term()
+
+
+# -------------------------
+# Strategy adapters
+# -------------------------
+def host_mean_reversion(host, name, journal=True, **params):
+    """params: MeanReversionStrategy settings (bb_n, bb_k, rsi_n, ema_n, oms_addr)."""
+    import strategy_mean_reversion as mr
+
+    journal_file = os.path.join(mr.JOURNAL_DIR, f"{STAMP}_{name.lower()}.jrnl") if journal else None
+    strat = mr.MeanReversionStrategy(snapshot_addr=host.snapshot_addr, journal_file=journal_file,
+                                     market=host.view(), **params)
+
+    def on_bar(msg):
+        bar = strat.parse_bar(msg)
+        strat.hot.tick()
+        strat.hot("Market Data Received: %s", bar)
+        strat.on_bar(bar)
+
+    return host.add(name, strat, {mr.SYMBOL_TOKEN: on_bar}, start=strat.bootstrap, stop=strat.daily_report)
+
+
+def host_straddle(host, name, journal=True, **params):
+    import strategy_straddle_seller as ss
+
+    journal_file = os.path.join(ss.JOURNAL_DIR, f"{STAMP}_{name.lower()}.jrnl") if journal else None
+    strat = ss.StraddleSeller(snapshot_addr=host.snapshot_addr, journal_file=journal_file,
+                              market=host.view(), **params)
+
+    def on_spot(msg):
+        spot, ts = float(msg.get("price") or msg.get("close")), msg["timestamp"]
+        strat.hot.tick()
+        strat.hot("Received market data | Time: %s | Spot: %s", ts, spot)
+        if not strat.on_spot(spot, ts):
+            raise StopIteration
+
+    def stop():
+        if strat.position:
+            strat.monitor_exit(datetime.now())
+        strat.daily_report()
+
+    return host.add(name, strat, {ss.SYMBOL_UNDERLYING: on_spot}, start=strat.bootstrap, stop=stop)
+
+
+KINDS = {"mean_reversion": host_mean_reversion, "straddle": host_straddle}
+
+
+# -------------------------
+# Runner
+# -------------------------
+if __name__ == "__main__":
+    host = StrategyHost()
+    for spec in STRATEGIES:
+        KINDS[spec["kind"]](host, spec["name"], **spec.get("params", {}))
+    host.run()
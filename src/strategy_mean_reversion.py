@@ -16,20 +16,25 @@ Integrates with OMS and RMS:
     - self.oms.place_order(symbol, side, qty, price, timestamp)
     - self.oms.get_positions()
     - self.oms.square_off_all(...)
-    - self.rms.check_order(...)
+    - self.rms.reserve(...) / self.rms.check_basket(...) -> oms.place_order(..., reservation=token)
 """
 
-from telegram_alert import send_telegram
+from telegram_alert import send_telegram, PRIORITY_TRADE
 import zmq
-import pickle
 from datetime import datetime, time as dt_time
 from collections import deque
-import logging
+from log_setup import get_logger, TickLog
 from simulator_oms import OMS
+from oms_client import OMSClient
 from simulator_rms import RMS
+from records import Fill, Side, TradeSummary
+from trade_journal import TradeJournal, trade_report
 import os
 import time as timene
 from load_csv import get_exchange_instrument_id
+from indicators import BollingerBands, WilderRSI, EMA
+from bar_aggregator import BarAggregator
+from market_subscriber import MarketSubscriber
 
 # -------------------------
 # Logging Setup
@@ -38,24 +43,10 @@ LOG_DIR = "./logs/Strategy/MeanReversion/"
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + "_mean_reversion.log")
 
-logger = logging.getLogger("MeanReversionStrategy")
-logger.setLevel(logging.DEBUG)
+JOURNAL_DIR = "./journal/Strategy/MeanReversion/"
+JOURNAL_FILE = os.path.join(JOURNAL_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + "_mean_reversion.jrnl")
 
-# Clear existing handlers to avoid duplicate logs
-for h in list(logger.handlers):
-    logger.removeHandler(h)
-
-fh = logging.FileHandler(LOG_FILE, mode="a")
-fh.setLevel(logging.DEBUG)
-fh.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(fh)
-
-ch = logging.StreamHandler()
-ch.setLevel(logging.INFO)
-ch.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(ch)
-
-logger.propagate = False
+logger = get_logger("MeanReversionStrategy", LOG_FILE)
 logger.info(f"Strategy Mean Reversion Logger initialized -> {LOG_FILE}")
 
 
@@ -74,47 +65,6 @@ INTRADAY_SQUARE_OFF = dt_time(15, 15)
 MARKET_CLOSE_TIME = dt_time(15, 30)
 
 
-# -------------------------
-# Indicators
-# -------------------------
-def sma(values):
-    return sum(values)/len(values) if values else None
-
-def stddev(values):
-    m = sma(values)
-    return (sum((v-m)**2 for v in values)/len(values))**0.5 if values else None
-
-def ema(current_price, prev_ema, period):
-    if prev_ema is None:
-        return current_price
-    alpha = 2/(period+1)
-    return (current_price - prev_ema)*alpha + prev_ema
-
-def compute_bollinger(close_window):
-    if len(close_window) < BB_N:
-        return None, None, None
-    window = list(close_window)[-BB_N:]
-    m = sma(window)
-    sd = stddev(window)
-    return m - BB_K*sd, m, m + BB_K*sd
-
-def compute_rsi(close_window):
-    if len(close_window) < RSI_N + 1:
-        return None
-    gains, losses = [], []
-    window = list(close_window)[-(RSI_N+1):]
-    for i in range(1, len(window)):
-        diff = window[i] - window[i-1]
-        gains.append(max(diff, 0))
-        losses.append(max(-diff, 0))
-    avg_gain = sum(gains)/RSI_N
-    avg_loss = sum(losses)/RSI_N
-    if avg_loss == 0:
-        return 100
-    rs = avg_gain / avg_loss
-    return 100 - (100/(1+rs))
-
-
 # -------------------------
 # Strategy Engine
 # -------------------------
@@ -125,18 +75,42 @@ class MeanReversionStrategy:
     - Exit: Option D -> RSI crosses 50 OR price crosses EMA OR forced square-off at 15:15
     - PnL: computed using OMS fills (entry vs exit)
     """
-    def __init__(self, feed_addr="tcp://localhost:5555"):
-        self.context = zmq.Context()
-        self.sub = self.context.socket(zmq.SUB)
-        self.sub.connect(feed_addr)
-        self.sub.setsockopt_string(zmq.SUBSCRIBE, f"MARKET:{SYMBOL_TOKEN}")
+    def __init__(self, feed_addr="tcp://localhost:5555", snapshot_addr="tcp://localhost:5556",
+                 journal_file=JOURNAL_FILE, market=None, oms_addr=None,
+                 bb_n=BB_N, bb_k=BB_K, rsi_n=RSI_N, ema_n=EMA_N, bar_period=1):
+        # market: a MarketView on a StrategyHost's shared subscriber; None opens our own socket
+        self.context = None
+        if market is None:
+            self.context = zmq.Context()
+            market = MarketSubscriber(self.context, feed_addr)
+        self.market = market
+        self.market.subscribe(SYMBOL_TOKEN)
+        self.sub = self.market.sub
+        self.snapshot_addr = snapshot_addr
+        self.bootstrap_ts = None       # timestamp of the snapshot bar already processed
         logger.debug("Subscribed to ZEROMQ market data feed")
         logger.info("Mean Reversion Strategy initialized for symbol %s", SYMBOL_TOKEN)
 
+        self.hot = TickLog(logger)     # per-bar data / indicator lines, sampled
+
         self.closes = deque(maxlen=BAR_WINDOW)
         self.ema_val = None
-        self.rms = RMS()
-        self.oms = OMS(rms=self.rms)
+
+        # Streaming indicators (O(1) update per bar)
+        self.bb_ind = BollingerBands(bb_n, bb_k)
+        self.rsi_ind = WilderRSI(rsi_n)
+        self.ema_ind = EMA(ema_n)
+
+        # bar_period > 1: signals on bar_period-minute bars built from the 1-minute stream
+        self.bars = BarAggregator((bar_period,)) if bar_period > 1 else None
+
+        if oms_addr:
+            # shared OMS / RMS service (oms_service.py): firm-wide limits, it keeps the journal
+            self.oms = OMSClient(oms_addr)
+            self.rms = self.oms.rms
+        else:
+            self.rms = RMS()
+            self.oms = OMS(rms=self.rms, journal=TradeJournal(journal_file) if journal_file else None)
 
         # Strategy position bookkeeping (single-symbol strategy)
         # None when no active position, else dict with entry_fill etc.
@@ -158,10 +132,10 @@ class MeanReversionStrategy:
 # place_order() method Usecases
 # -------------------------
 
-    def place_entry(self, side, qty, price, timestamp):
-        """Place entry via OMS and record fill & internal position state."""
-        resp = self.oms.place_order(SYMBOL_TOKEN, side, qty, price, timestamp)
-        if isinstance(resp, dict) and resp.get("status") != "REJECTED":
+    def place_entry(self, side, qty, price, timestamp, reservation=None):
+        """Place entry via OMS (with the RMS reservation token) and record fill & internal position state."""
+        resp = self.oms.place_order(SYMBOL_TOKEN, side, qty, price, timestamp, reservation=reservation)
+        if isinstance(resp, Fill):
             logger.info("Order executed: %s", resp)
         else:
             logger.info("Order rejected by RMS")
@@ -169,11 +143,11 @@ class MeanReversionStrategy:
 
         # Save position metadata using the entry fill
         self.position = {
-            "side": side,                      # 'BUY' or 'SELL'
+            "side": resp.side,                 # Side.BUY or Side.SELL
             "qty": qty,
             "entry_fill": resp,
-            "entry_price": resp["filled_price"],
-            "entry_time": resp["timestamp"]
+            "entry_price": resp.filled_price,
+            "entry_time": resp.timestamp
         }
         self.record_fill(resp, "ENTRY")
         return resp
@@ -182,6 +156,7 @@ class MeanReversionStrategy:
         """
         Close existing position via OMS, compute realized pnl using entry_fill and exit fill,
         append trade_summary (same pattern as Straddle).
+        A rejected exit keeps the position (retried on the next exit signal) and returns None.
         """
         if not self.position:
             logger.debug("place_exit_and_compute_pnl called but no active position.")
@@ -194,25 +169,27 @@ class MeanReversionStrategy:
         entry_time = entry["entry_time"]
 
         # Determine closing side
-        close_side = "SELL" if entry_side == "BUY" else "BUY"
+        close_side = entry_side.opposite
 
         # Use current market price approximated by last close for exit price submission
         last_close = self.closes[-1] if len(self.closes) else entry_price
 
         resp = self.oms.place_order(SYMBOL_TOKEN, close_side, qty, last_close, timestamp)
-        if isinstance(resp, dict) and resp.get("status") != "REJECTED":
-            logger.info("Order executed: %s", resp)
-        else:
-            logger.info("Order rejected by RMS")
+        if not isinstance(resp, Fill):
+            logger.error("Exit order rejected, position still open: %s", resp)
+            send_telegram(f"EXIT REJECTED: MEAN REVERSION\n• Reason = {reason}\n• Time = {timestamp}",
+                          priority=PRIORITY_TRADE)
+            return None
+        logger.info("Order executed: %s", resp)
 
         self.record_fill(resp, "EXIT")
 
 
-        exit_price = resp["filled_price"]
+        exit_price = resp.filled_price
         # Realized PnL formula consistent with OMS behavior:
         # If entry was BUY -> pnl = (exit - entry) * qty
         # If entry was SELL -> pnl = (entry - exit) * qty
-        if entry_side == "BUY":
+        if entry_side is Side.BUY:
             realized = round((exit_price - entry_price) * qty, 2)
         else:
             realized = round((entry_price - exit_price) * qty, 2)
@@ -221,43 +198,38 @@ class MeanReversionStrategy:
         self.daily_loss += max(0.0, -realized)
 
         # Create trade summary similar to Straddle
-        trade_summary = {
-            "symbol": SYMBOL_TOKEN,
-            "side": entry_side,
-            "qty": qty,
-            "entry_time": entry_time,
-            "exit_time": resp["timestamp"],
-            "entry_price": entry_price,
-            "exit_price": exit_price,
-            "realized_pnl": realized,
-            "reason": reason
-        }
+        trade_summary = TradeSummary(
+            symbol=SYMBOL_TOKEN,
+            side=entry_side,
+            qty=qty,
+            entry_time=entry_time,
+            exit_time=resp.timestamp,
+            entry_price=entry_price,
+            exit_price=exit_price,
+            realized_pnl=realized,
+            reason=reason
+        )
 
         # Log & Telegram (clean multi-line)
-        logger.info("\nEXIT: Mean Reversion\n%s", trade_summary)
+        logger.info("\nEXIT: Mean Reversion\n%s", trade_summary.as_dict())
 
         telegram_msg = (
             "\nExit Order : MEAN REVERSION\n"
             f"• Symbol = {SYMBOL_TOKEN}\n"
-            f"• Side = {'LONG' if entry_side == 'BUY' else 'SHORT'}\n"
+            f"• Side = {'LONG' if entry_side is Side.BUY else 'SHORT'}\n"
             f"• Qty: = {qty}\n"
             f"• Entry Time = {entry_time}\n"
-            f"• Exit Time = {resp['timestamp']}\n"
+            f"• Exit Time = {resp.timestamp}\n"
             f"• Entry Price = {entry_price}\n"
             f"• Exit Price = {exit_price}\n"
             f"• Realized PnL = {realized}\n"
             f"• Reason = {reason}"
         )
-        send_telegram(telegram_msg)
+        send_telegram(telegram_msg, priority=PRIORITY_TRADE)
 
         # Append to trade_log (summary)
         self.trade_log.append({"summary": trade_summary})
-
-        # Release RMS exposure for entry side (best-effort)
-        try:
-            self.rms.release_order(SYMBOL_TOKEN, entry_side, qty)
-        except Exception:
-            pass
+        self.oms.record_trade(trade_summary)
 
         # Reset position
         self.position = None
@@ -271,31 +243,63 @@ class MeanReversionStrategy:
         Reads market data from ZeroMQ and returns a normalized bar dict:
         { 'symbol': ..., 'timestamp': ..., 'close': ... }
         Returns None if no data received within timeout.
+        Batched feed frames are unpacked and returned one bar per call;
+        aggregated BAR<period> bars are skipped.
         """
-        if self.sub.poll(timeout_ms):
-            topic, raw_msg = self.sub.recv_multipart()
-            msg = pickle.loads(raw_msg)
+        while True:
+            msg = self.market.recv(timeout_ms)
+            if msg is None:
+                return None
+            if "period" not in msg:     # aggregated BAR<period> bars are not 1-minute bars
+                break
 
-            try:
-                bar = self.parse_bar(msg)
-            except Exception:
-                # fallback for older feed formats
-                bar = {
-                    "symbol": msg.get("symbol"),
-                    "timestamp": msg.get("timestamp"),
-                    "close": msg.get("price") or msg.get("close")
-                }
-                if isinstance(bar["timestamp"], str):
-                    try:
-                        bar["timestamp"] = datetime.fromisoformat(bar["timestamp"])
-                    except Exception:
-                        bar["timestamp"] = datetime.strptime(bar["timestamp"], "%Y-%m-%d %H:%M")
-
-            logger.info(f"Market Data Received: {bar}")
-            return bar
-        return None
+        try:
+            bar = self.parse_bar(msg)
+        except Exception:
+            # fallback for older feed formats
+            bar = {
+                "symbol": msg.get("symbol"),
+                "timestamp": msg.get("timestamp"),
+                "close": msg.get("price") or msg.get("close")
+            }
+            if isinstance(bar["timestamp"], str):
+                try:
+                    bar["timestamp"] = datetime.fromisoformat(bar["timestamp"])
+                except Exception:
+                    bar["timestamp"] = datetime.strptime(bar["timestamp"], "%Y-%m-%d %H:%M")
+
+        self.hot.tick()
+        self.hot("Market Data Received: %s", bar)
+        return bar
     
 
+    def on_bar(self, bar):
+        """
+        One stream bar: skips bars up to the snapshot's minute (bars queued
+        before bootstrap() arrive after it, older), then handle_bar().
+        """
+        if self.bootstrap_ts is not None and bar and bar["timestamp"] <= self.bootstrap_ts:
+            return
+        self.handle_bar(bar)
+
+    def handle_bar(self, bar):
+        """process_bar() on every 1-minute bar, or on each completed bar_period-minute bar."""
+        if self.bars is None:
+            self.process_bar(bar)
+            return
+        if not bar or bar["symbol"] != SYMBOL_TOKEN:
+            return
+
+        now = bar["timestamp"]
+        for period, (_, o, h, l, c, v) in self.bars.update_msg(bar):
+            # decided when the bar completes, so stamped with the minute that completed it
+            self.process_bar({"symbol": SYMBOL_TOKEN, "timestamp": now, "price": c, "open": o, "high": h,
+                              "low": l, "close": c, "volume": v, "period": period})
+
+        # square-off and market close follow the 1-minute clock, not bar boundaries
+        if self.check_square_off(now, float(bar["close"])):
+            self.handle_market_close(now)
+
     def process_bar(self, bar):
         if not bar or bar["symbol"] != SYMBOL_TOKEN:
             return
@@ -310,14 +314,16 @@ class MeanReversionStrategy:
         now = bar["timestamp"]
         close_price = float(bar["close"])
 
-        # Store price
+        # Store price, mark the open position (O(1))
         self.closes.append(close_price)
+        self.oms.update_price(SYMBOL_TOKEN, close_price)
 
         # Update indicators
         indicators = self.update_indicators(close_price)
 
         # Square-off (before indicators logic)
         if self.check_square_off(now, close_price):
+            self.handle_market_close(now)
             return
 
         # Prevent new entries after square-off time
@@ -336,27 +342,23 @@ class MeanReversionStrategy:
 
 
     def update_indicators(self, close_price):
-        self.ema_val = ema(close_price, self.ema_val, EMA_N)
+        self.ema_val = self.ema_ind.update(close_price)
 
-        lower_bb, mid_bb, upper_bb = compute_bollinger(self.closes)
-        rsi = compute_rsi(self.closes)
+        lower_bb, mid_bb, upper_bb = self.bb_ind.update(close_price)
+        rsi = self.rsi_ind.update(close_price)
 
         # -------------------------------------
-        # PRINT EACH MINUTE’S INDICATOR VALUES
+        # LOG INDICATOR VALUES (sampled ticks only)
         # -------------------------------------
-        # Safe formatting
-        close_fmt = f"{close_price:.2f}"
-        ema_fmt = f"{self.ema_val:.2f}" if self.ema_val is not None else "None"
-        rsi_fmt = f"{rsi:.2f}" if rsi is not None else "None"
-        lower_bb_fmt = f"{lower_bb:.2f}" if lower_bb is not None else "None"
-        mid_bb_fmt = f"{mid_bb:.2f}" if mid_bb is not None else "None"
-        upper_bb_fmt = f"{upper_bb:.2f}" if upper_bb is not None else "None"
-
-        # Logging indicators safely
-        logger.info(
-            f"Indicators - Close={close_fmt} | EMA={ema_fmt} | RSI={rsi_fmt} | "
-            f"BBands=({lower_bb_fmt}, {mid_bb_fmt}, {upper_bb_fmt})"
-        )
+        if self.hot.sampled:
+            close_fmt, ema_fmt, rsi_fmt, lower_bb_fmt, mid_bb_fmt, upper_bb_fmt = (
+                "None" if v is None else f"{v:.2f}"
+                for v in (close_price, self.ema_val, rsi, lower_bb, mid_bb, upper_bb)
+            )
+            self.hot(
+                "Indicators - Close=%s | EMA=%s | RSI=%s | BBands=(%s, %s, %s)",
+                close_fmt, ema_fmt, rsi_fmt, lower_bb_fmt, mid_bb_fmt, upper_bb_fmt
+            )
 
         return {
             "ema": self.ema_val,
@@ -385,9 +387,10 @@ class MeanReversionStrategy:
             self.oms.square_off_all({SYMBOL_TOKEN: close_price}, now)
 
         logger.info(f"Final positions after square-off: {self.oms.get_positions()}")
-        logger.info(f"Cumulative PnL: {self.oms.cum_pnl:.2f}")
+        logger.info(f"Cumulative PnL: {self.oms.cum_realized_pnl:.2f}")
         send_telegram(
-            f"Final square-off at {now.strftime('%H:%M:%S')} | PnL: {self.oms.cum_pnl:.2f}"
+            f"Final square-off at {now.strftime('%H:%M:%S')} | PnL: {self.oms.cum_realized_pnl:.2f}",
+            priority=PRIORITY_TRADE
         )
         return True
 
@@ -411,25 +414,29 @@ class MeanReversionStrategy:
         # BUY condition
         if touched_lower and rsi < 30 and close_price > ema_val:
         # if touched_lower and rsi < 40:
-            if self.rms.check_order(SYMBOL_TOKEN, "BUY", QTY, close_price):
-                fill = self.place_entry("BUY", QTY, close_price, now)
+            token = self.rms.reserve(SYMBOL_TOKEN, Side.BUY, QTY, close_price)
+            if token is not None:
+                fill = self.place_entry(Side.BUY, QTY, close_price, now, reservation=token)
                 if fill:
                     self.trade_triggered = True
-                    logger.info(f"BUY executed at {fill['filled_price']} | Time: {now}")
+                    logger.info(f"BUY executed at {fill.filled_price} | Time: {now}")
                     send_telegram(
-                        f"\nEntry: BUY\nPrice={fill['filled_price']}\nTime={now}"
+                        f"\nEntry: BUY\nPrice={fill.filled_price}\nTime={now}",
+                        priority=PRIORITY_TRADE
                     )
 
         # SELL condition
         if touched_upper and rsi > 70 and close_price < ema_val:
         # if touched_upper and rsi > 60:
-            if self.rms.check_order(SYMBOL_TOKEN, "SELL", QTY, close_price):
-                fill = self.place_entry("SELL", QTY, close_price, now)
+            token = self.rms.reserve(SYMBOL_TOKEN, Side.SELL, QTY, close_price)
+            if token is not None:
+                fill = self.place_entry(Side.SELL, QTY, close_price, now, reservation=token)
                 if fill:
                     self.trade_triggered = True
-                    logger.info(f"SELL executed at {fill['filled_price']} | Time: {now}")
+                    logger.info(f"SELL executed at {fill.filled_price} | Time: {now}")
                     send_telegram(
-                        f"\nEntry: SELL\nPrice={fill['filled_price']}\nTime={now}"
+                        f"\nEntry: SELL\nPrice={fill.filled_price}\nTime={now}",
+                        priority=PRIORITY_TRADE
                     )
 
 
@@ -445,15 +452,15 @@ class MeanReversionStrategy:
         exit_by_ema = False
 
         # RSI exit
-        if entry_side == "BUY" and rsi >= 50:
+        if entry_side is Side.BUY and rsi >= 50:
             exit_by_rsi = True
-        if entry_side == "SELL" and rsi <= 50:
+        if entry_side is Side.SELL and rsi <= 50:
             exit_by_rsi = True
 
         # EMA exit
-        if entry_side == "BUY" and close_price <= ema_val:
+        if entry_side is Side.BUY and close_price <= ema_val:
             exit_by_ema = True
-        if entry_side == "SELL" and close_price >= ema_val:
+        if entry_side is Side.SELL and close_price >= ema_val:
             exit_by_ema = True
 
         if exit_by_rsi or exit_by_ema:
@@ -464,24 +471,27 @@ class MeanReversionStrategy:
     # -------------------------
     # DAILY REPORT
     # -------------------------
-    def daily_report(self):
-        # Count trades with summary
-        total_trades = len([t for t in self.trade_log if "summary" in t])
-        wins = sum(1 for t in self.trade_log if "summary" in t and t["summary"]["realized_pnl"] >= 0)
-        losses = total_trades - wins
-        total_pnl = sum(t["summary"]["realized_pnl"] for t in self.trade_log if "summary" in t)
+    def daily_report(self, trades=None):
+        """
+        trades: TradeSummary list, defaults to this session's trade_log.
+        Pass trade_journal.journal_trades(read_journal(path)) to rebuild
+        the report from a journal.
+        """
+        if trades is None:
+            trades = [t["summary"] for t in self.trade_log if "summary" in t]
+        report = trade_report(trades)
 
         telegram_msg = (
             "DAY REPORT: Mean Reversion Strategy\n"
             f"• Date: {datetime.now().strftime('%Y-%m-%d')}\n"
-            f"• Total Trades: {total_trades}\n"
-            f"• Wins: {wins}\n"
-            f"• Losses: {losses}\n"
-            f"• Total PnL: {round(total_pnl, 2)}\n"
-            f"• Daily Loss Accumulated: {round(self.daily_loss, 2)}"
+            f"• Total Trades: {report['total_trades']}\n"
+            f"• Wins: {report['wins']}\n"
+            f"• Losses: {report['losses']}\n"
+            f"• Total PnL: {report['total_pnl']}\n"
+            f"• Daily Loss Accumulated: {report['daily_loss']}"
         )
 
-        send_telegram(telegram_msg)
+        send_telegram(telegram_msg, priority=PRIORITY_TRADE)
         logger.info("DAILY REPORT: %s", telegram_msg)
 
 
@@ -492,17 +502,41 @@ class MeanReversionStrategy:
 
 
 
+    def bootstrap(self):
+        """
+        Process the feed's latest bar for SYMBOL_TOKEN from the snapshot
+        service, so a late or restarted strategy starts from the current
+        price instead of waiting for the next tick.
+        """
+        if not self.snapshot_addr:
+            return
+        msgs = self.market.bootstrap(self.snapshot_addr, [SYMBOL_TOKEN])
+        if not msgs:
+            logger.warning("No snapshot available, waiting for the stream")
+            return
+
+        bar = self.parse_bar(msgs[0])
+        logger.info(f"Bootstrapped from snapshot: {bar}")
+        self.handle_bar(bar)
+        self.bootstrap_ts = bar["timestamp"]
+
     def run(self):
         logger.info("Strategy run loop started...")
 
         try:
+            try:
+                self.bootstrap()
+            except StopIteration:
+                return
+
             while True:
                 bar = self.get_market_data()
                 if not bar:
                     continue
 
                 try:
-                    self.process_bar(bar)
+                    # Stream bars up to the snapshot's minute were already covered by bootstrap()
+                    self.on_bar(bar)
                 except StopIteration:
                     break
 
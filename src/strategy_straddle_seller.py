@@ -18,18 +18,22 @@ Integrates with OMS and RMS:
     - self.oms.place_order(symbol, side, qty, price, timestamp)
     - self.oms.get_positions()
     - self.oms.square_off_all(...)
-    - self.rms.check_order(...)
+    - self.rms.reserve(...) / self.rms.check_basket(...) -> oms.place_order(..., reservation=token)
 """
 
 import os
 import zmq
-import pickle
 from datetime import datetime, time as dt_time
-import logging
+from log_setup import get_logger, TickLog
 from simulator_oms import OMS
+from oms_client import OMSClient
 from simulator_rms import RMS
-from telegram_alert import send_telegram
-from load_csv import get_exchange_instrument_id
+from margin_engine import MarginEngine
+from records import Fill, Side, TradeSummary
+from trade_journal import TradeJournal, trade_report
+from telegram_alert import send_telegram, PRIORITY_TRADE
+from load_csv import get_exchange_instrument_id, get_contract_id
+from market_subscriber import MarketSubscriber
 import sys
 
 # -------------------------
@@ -42,19 +46,10 @@ LOG_DIR = "./logs/Strategy/StraddleSeller/"
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + f"_{STRATEGY_NAME.lower()}.log")
 
-logger = logging.getLogger(STRATEGY_NAME)
-logger.setLevel(logging.DEBUG)
-logger.handlers.clear()
-logger.propagate = False
-fh = logging.FileHandler(LOG_FILE, mode="a")
-fh.setLevel(logging.DEBUG)
-fh.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(fh)
+JOURNAL_DIR = "./journal/Strategy/StraddleSeller/"
+JOURNAL_FILE = os.path.join(JOURNAL_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + f"_{STRATEGY_NAME.lower()}.jrnl")
 
-ch = logging.StreamHandler()
-ch.setLevel(logging.INFO)
-ch.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-logger.addHandler(ch)
+logger = get_logger(STRATEGY_NAME, LOG_FILE)
 
 logger.info(f"{STRATEGY_NAME} logger initialized -> {LOG_FILE}")
 
@@ -66,31 +61,51 @@ STRIKE_STEP = 50
 STOP_LOSS_PCT = 0.25
 TARGET_PCT = 0.50
 QTY_PER_SIDE = 1
+MAX_MARGIN = 50000             # portfolio margin limit of the local RMS
 
 # -------------------------
 # Strategy Engine
 # -------------------------
 class StraddleSeller:
-    def __init__(self, feed_addr="tcp://localhost:5555"):
+    def __init__(self, feed_addr="tcp://localhost:5555", snapshot_addr="tcp://localhost:5556",
+                 journal_file=JOURNAL_FILE, market=None, oms_addr=None):
         self.feed_addr = feed_addr
-        self.context = zmq.Context()
-        self.sub = self.context.socket(zmq.SUB)
-        self.sub.connect(feed_addr)
+        self.snapshot_addr = snapshot_addr
+        # market: a MarketView on a StrategyHost's shared subscriber; None opens our own socket
+        self.context = None
+        if market is None:
+            self.context = zmq.Context()
+            market = MarketSubscriber(self.context, feed_addr)
+        self.market = market
+        self.sub = self.market.sub
         logger.info("ZMQ context initialized")
+        self.hot = TickLog(logger)     # per-bar spot / premium lines, sampled
 
-        self.rms = RMS()
-        self.oms = OMS(rms=self.rms)
+        if oms_addr:
+            # shared OMS / RMS service (oms_service.py): firm-wide limits, it keeps the journal
+            self.oms = OMSClient(oms_addr)
+            self.rms = self.oms.rms
+        else:
+            self.rms = RMS(margin=MarginEngine.from_contract_master(), max_margin=MAX_MARGIN)
+            self.oms = OMS(rms=self.rms, journal=TradeJournal(journal_file) if journal_file else None)
         self.position = None
         self.trade_log = []
 
+        self.atm_strike = None
+        self.leg_tokens = {}           # strike -> (call token, put token)
+
 # -------------------------
 # DAILY REPORT ...
 # -------------------------
-    def daily_report(self):
-        self.total_trades = len([t for t in self.trade_log if "summary" in t])
-        self.wins = sum(1 for t in self.trade_log if "summary" in t and t["summary"]["realized_pnl"] >= 0)
-        self.losses = self.total_trades - self.wins
-        self.total_pnl = sum(t["summary"]["realized_pnl"] for t in self.trade_log if "summary" in t)
+    def daily_report(self, trades=None):
+        """trades: TradeSummary list (e.g. rebuilt from the journal), defaults to trade_log."""
+        if trades is None:
+            trades = [t["summary"] for t in self.trade_log if "summary" in t]
+        report = trade_report(trades)
+        self.total_trades = report["total_trades"]
+        self.wins = report["wins"]
+        self.losses = report["losses"]
+        self.total_pnl = report["total_pnl"]
         telegram_msg = (
             "DAY REPORT: Short Straddle\n"
             f"• Date: {datetime.now().strftime('%Y-%m-%d')}\n"
@@ -99,10 +114,16 @@ class StraddleSeller:
             f"• Losses: {self.losses}\n"
             f"• Total PnL: {round(self.total_pnl, 2)}\n"
         )
-        send_telegram(telegram_msg)
+        send_telegram(telegram_msg, priority=PRIORITY_TRADE)
         logger.info("DAILY REPORT: %s", telegram_msg)
 
 
+    def log_margin(self, label):
+        margin = getattr(self.rms, "margin", None)
+        if margin is not None:
+            logger.info("Margin used %s: %.2f (limit %s)", label, margin.total(), self.rms.max_margin)
+
+
 # -------------------------
 # get_market_data() method 
 # -------------------------
@@ -111,71 +132,91 @@ class StraddleSeller:
         """
         Read market data for a given token from ZeroMQ multicast.
         Returns (price, timestamp) tuple or None if no data received.
+        Bars of other subscribed tokens (option legs) only refresh the
+        last-price cache while reading.
         """
-        self.sub.setsockopt_string(zmq.SUBSCRIBE, f"MARKET:{token}")
-        if self.sub.poll(timeout_ms):
-            topic, raw_msg = self.sub.recv_multipart()
-            msg = pickle.loads(raw_msg)
-            price = float(msg.get("price") or msg.get("close"))
-            ts = datetime.fromisoformat(msg["timestamp"]) if isinstance(msg["timestamp"], str) else msg["timestamp"]
-            # self.sub.close()
-            return price, ts
-            
-        return None
+        token = str(token)
+        self.market.subscribe(token)
+        while True:
+            msg = self.market.recv(timeout_ms)
+            if msg is None:
+                return None
+            if msg["symbol"] == token and "period" not in msg:
+                return float(msg.get("price") or msg.get("close")), msg["timestamp"]
 
     def close_get_market_data(self):
         """Close the ZeroMQ subscription cleanly."""
-        self.sub.close()
-        self.context.term()
+        self.market.close()
+        if self.context is not None:
+            self.context.term()
         logger.info("Subscription closed for get_market_data")
 
     def nearest_strike(self, spot: float) -> int:
         return round(spot / STRIKE_STEP) * STRIKE_STEP
 
 
+    def option_tokens(self, strike: int):
+        """(call token, put token) for an ATM strike, resolved once per strike."""
+        tokens = self.leg_tokens.get(strike)
+        if tokens is None:
+            expiry_date = "25NOV"
+            tokens = self.leg_tokens[strike] = (
+                get_contract_id("NIFTY", expiry_date, strike, "CE"),
+                get_contract_id("NIFTY", expiry_date, strike, "PE")
+            )
+        return tokens
+
+    def track_atm_legs(self, spot: float):
+        """Keep the subscription on the current ATM CE/PE (plus open legs) so premiums are cached before entry."""
+        strike = self.nearest_strike(spot)
+        if strike == self.atm_strike:
+            return
+        self.atm_strike = strike
+
+        tokens = {SYMBOL_UNDERLYING, *self.option_tokens(strike)}
+        if self.position:
+            tokens.update((self.position["call_symbol"], self.position["put_symbol"]))
+        self.market.set_tokens(tokens)
+        logger.info(f"ATM strike {strike}: subscribed tokens {sorted(self.market.topics)}")
+
+    def bootstrap(self):
+        """Seed spot and ATM leg prices from the feed's snapshot service before the first tick."""
+        if not self.snapshot_addr:
+            return
+        self.market.bootstrap(self.snapshot_addr, [SYMBOL_UNDERLYING])
+        data = self.market.last_price(SYMBOL_UNDERLYING)
+        if data is None:
+            logger.warning("No snapshot available, waiting for the stream")
+            return
+
+        spot, ts = data
+        self.track_atm_legs(spot)
+        self.market.bootstrap(self.snapshot_addr, self.option_tokens(self.atm_strike))
+        logger.info(f"Bootstrapped from snapshot | Time: {ts} | Spot: {spot}")
+
     def get_option_premium(self, token: str, timestamp: datetime) -> float:
-        data = None  # ensure it exists even if socket setup fails
-        sub = self.context.socket(zmq.SUB)
         try:
-            sub.connect(self.feed_addr)
-            sub.setsockopt_string(zmq.SUBSCRIBE, f"MARKET:{token}")
-
-            try:
-                if sub.poll(100):  # short timeout in milliseconds
-                    topic, raw_msg = sub.recv_multipart()
-                    try:
-                        msg = pickle.loads(raw_msg)
-                        price = float(msg.get("price") or msg.get("close"))
-                        ts = datetime.fromisoformat(msg["timestamp"])
-                        data = price, ts
-                    except (pickle.UnpicklingError, KeyError, ValueError) as e:
-                        logger.error(f"Error decoding message for token {token} at {timestamp}: {e}")
-                else:
-                    logger.warning(f"No packet received for token {token} after timeout at {timestamp}")
-
-            except zmq.ZMQError as e:
-                logger.error(f"ZeroMQ error while polling/receiving for token {token}: {e}")
-
-        except Exception as e:
-            logger.error(f"Failed to setup temporary socket for token {token}: {e}")
-
-        finally:
-            sub.close()
+            if self.market.subscribe(token):
+                # first lookup of this leg: give the stream a short time to deliver it
+                self.market.wait_for(token, 100)
+            else:
+                self.market.drain()
+        except zmq.ZMQError as e:
+            logger.error(f"ZeroMQ error while polling/receiving for token {token}: {e}")
 
+        data = self.market.last_price(token)
         if not data:
             logger.warning(f"No market data for token {token} at {timestamp}")
             return -1
 
         price, ts = data
-        logger.info(f"Fetched premium for {token} at {ts}: {price}")
+        self.hot("Fetched premium for %s at %s: %s", token, ts, price)
         return price
 
 
     def place_straddle(self, spot: float, timestamp: datetime):
         atm_strike = self.nearest_strike(spot)
-        expiry_date = "25NOV"
-        call_symbol = get_exchange_instrument_id(f"NIFTY{expiry_date}{atm_strike}CE")
-        put_symbol = get_exchange_instrument_id(f"NIFTY{expiry_date}{atm_strike}PE")
+        call_symbol, put_symbol = self.option_tokens(atm_strike)
 
         logger.info(f"Placing straddle at {timestamp} | Spot: {spot} | ATM Strike: {atm_strike}")
         logger.info(f"Call token ID : {call_symbol} | Put token ID : {put_symbol}")
@@ -185,29 +226,29 @@ class StraddleSeller:
         put_premium = self.get_option_premium(put_symbol, timestamp)
         if call_premium == -1 or put_premium == -1:
             logger.error("No Data for option premiums, aborting straddle placement")
-            send_telegram("STRATEGY ABORTED \n• No option premium data")
+            send_telegram("STRATEGY ABORTED \n• No option premium data", priority=PRIORITY_TRADE)
             sys.exit(1)
         
         combined_premium = call_premium + put_premium
 
-        # place_order() method implementation --------------------------------------------------------
-        # Place short call
-        if self.rms.check_order(call_symbol, "SELL", QTY_PER_SIDE, call_premium):
-            resp = self.oms.place_order(call_symbol, "SELL", QTY_PER_SIDE, call_premium, timestamp)
-            if isinstance(resp, dict) and resp.get("status") != "REJECTED":
-                logger.info("Order executed: %s", resp)
-            else:
-                logger.info("Order rejected by RMS")
-            self.trade_log.append({"leg": "CALL_SELL", "fill": resp})
+        # Both legs pass the RMS together or not at all
+        legs = [(call_symbol, Side.SELL, QTY_PER_SIDE, call_premium),
+                (put_symbol, Side.SELL, QTY_PER_SIDE, put_premium)]
+        tokens = self.rms.check_basket(legs)
+        if tokens is None:
+            logger.warning("Straddle rejected by RMS, no legs placed")
+            send_telegram("STRADDLE REJECTED BY RMS", priority=PRIORITY_TRADE)
+            return
 
-        # Place short put
-        if self.rms.check_order(put_symbol, "SELL", QTY_PER_SIDE, put_premium):
-            resp = self.oms.place_order(put_symbol, "SELL", QTY_PER_SIDE, put_premium, timestamp)
-            if isinstance(resp, dict) and resp.get("status") != "REJECTED":
+        # place_order() method implementation --------------------------------------------------------
+        # Place short call, then short put
+        for leg, (symbol, side, qty, premium), token in zip(("CALL_SELL", "PUT_SELL"), legs, tokens):
+            resp = self.oms.place_order(symbol, side, qty, premium, timestamp, reservation=token)
+            if isinstance(resp, Fill):
                 logger.info("Order executed: %s", resp)
             else:
                 logger.info("Order rejected by RMS")
-            self.trade_log.append({"leg": "PUT_SELL", "fill": resp})
+            self.trade_log.append({"leg": leg, "fill": resp})
 
         self.position = {
             "call_symbol": call_symbol,
@@ -217,10 +258,12 @@ class StraddleSeller:
             "stop_loss": combined_premium * (1 + STOP_LOSS_PCT),
             "target": combined_premium * (1 - TARGET_PCT)
         }
+        self.log_margin("after entry")
 
-        send_telegram(f"\nEntry: Short Straddle\nATM Strike={atm_strike}\nPremium={combined_premium}\nTime={timestamp}")
+        send_telegram(f"\nEntry: Short Straddle\nATM Strike={atm_strike}\nPremium={combined_premium}\nTime={timestamp}", priority=PRIORITY_TRADE)
 
-    def monitor_exit(self, timestamp: datetime):
+    def monitor_exit(self, timestamp: datetime, force_reason=None):
+        """force_reason closes the straddle regardless of SL / target / time."""
         if not self.position:
             return
 
@@ -228,8 +271,13 @@ class StraddleSeller:
         call_price = self.get_option_premium(self.position["call_symbol"], timestamp)
         put_price = self.get_option_premium(self.position["put_symbol"], timestamp)
         current_val = call_price + put_price
+        if call_price >= 0 and put_price >= 0:
+            self.oms.update_price(self.position["call_symbol"], call_price)
+            self.oms.update_price(self.position["put_symbol"], put_price)
 
-        if current_val >= self.position["stop_loss"]:
+        if force_reason:
+            reason = force_reason
+        elif current_val >= self.position["stop_loss"]:
             reason = "STOP_LOSS"
         elif current_val <= self.position["target"]:
             reason = "TARGET"
@@ -243,37 +291,68 @@ class StraddleSeller:
 # square_off_all() method
 # -------------------------
         # square_off_all method implementation -------------------------------------------------------
-        self.oms.square_off_all({self.position["call_symbol"]: call_price,
-                                 self.position["put_symbol"]: put_price}, timestamp)
+        results = self.oms.square_off_all({self.position["call_symbol"]: call_price,
+                                           self.position["put_symbol"]: put_price}, timestamp)
+        rejected = [r.symbol for r in results if not isinstance(r, Fill)]
+        if rejected:
+            # legs that did close are gone from the OMS, the next tick retries the rest
+            logger.error(f"Straddle exit ({reason}) rejected for {rejected}, position still open")
+            send_telegram(f"STRADDLE EXIT REJECTED\n• Reason={reason}\n• Legs={rejected}\n• Time={timestamp}",
+                          priority=PRIORITY_TRADE)
+            return
         pnl = self.position["combined_premium"] - current_val
-        summary = {
-            "entry_time": self.position["entry_time"],
-            "exit_time": timestamp,
-            "realized_pnl": pnl,
-            "reason": reason
-        }
+        summary = TradeSummary(
+            symbol=f"{self.position['call_symbol']}/{self.position['put_symbol']}",
+            side=Side.SELL,
+            qty=QTY_PER_SIDE,
+            entry_time=self.position["entry_time"],
+            exit_time=timestamp,
+            entry_price=self.position["combined_premium"],
+            exit_price=current_val,
+            realized_pnl=pnl,
+            reason=reason
+        )
         self.trade_log.append({"summary": summary})
-        send_telegram(f"\nExit: Straddle\nReason={reason}\nPnL={pnl}\nTime={timestamp}")
+        self.oms.record_trade(summary)
+        self.log_margin("after exit")
+        send_telegram(f"\nExit: Straddle\nReason={reason}\nPnL={pnl}\nTime={timestamp}", priority=PRIORITY_TRADE)
         self.position = None
 
+    def on_spot(self, spot: float, ts: datetime) -> bool:
+        """
+        One underlying tick: track the ATM legs, enter whenever flat between
+        ENTRY_TIME and SQUARE_OFF_TIME (again after a stop-loss / target
+        exit), check exits. Returns False at market close.
+        """
+        self.oms.update_price(SYMBOL_UNDERLYING, spot)     # underlying price for the margin scan
+        if not self.position:
+            self.track_atm_legs(spot)
+
+        # not from SQUARE_OFF_TIME on: monitor_exit would square each new straddle off at once
+        if not self.position and ENTRY_TIME <= ts.time() < SQUARE_OFF_TIME:
+            self.place_straddle(spot, ts)
+
+        if self.position:
+            self.monitor_exit(ts)
+
+        if ts.time() >= MARKET_CLOSE_TIME:
+            logger.info("Market closed, terminating strategy")
+            return False
+        return True
+
     def run(self):
         logger.info("StraddleSeller run loop started...")
         try:
+            self.bootstrap()
             while True:
                 data = self.get_market_data(SYMBOL_UNDERLYING)
                 if not data:
                     continue
                 spot, ts = data
-                logger.info(f"Received market data | Time: {ts} | Spot: {spot}")
-
-                if ts.time() >= ENTRY_TIME and not self.position:
-                    self.place_straddle(spot, ts)
-
-                if self.position:
-                    self.monitor_exit(ts)
+                self.hot.tick()
+                self.hot("Received market data | Time: %s | Spot: %s", ts, spot)
 
-                if ts.time() >= MARKET_CLOSE_TIME:
-                    logger.info("Market closed, terminating strategy")
+                if not self.on_spot(spot, ts):
                     break
         except KeyboardInterrupt:
             logger.info("Interrupted by user.")
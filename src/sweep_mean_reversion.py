@@ -0,0 +1,178 @@
+"""
+Mean Reversion Parameter Sweep
+Runs the vectorized backtest (backtest_mean_reversion.run_backtest) over a
+grid of BB_N, BB_K, RSI_N, EMA_N and RSI thresholds in a process pool.
+
+• The close series is loaded once, written to .npy files in a temporary
+  directory and opened by every worker with np.load(mmap_mode="r"): the
+  pages are shared through the OS page cache, nothing is pickled per task.
+• One task = one (BB_N, BB_K, RSI_N, EMA_N) combination: its indicator
+  arrays are computed once and reused for every RSI threshold combination.
+• Every run uses the same slippage seed, so parameter sets are compared
+  on identical fills.
+• Results are ranked by PnL (then lower drawdown): trades, win rate and
+  max drawdown of the realized equity curve.
+
+Run from repo root:
+    python src/sweep_mean_reversion.py --data ./data/market_store \\
+        --bb-n 10,20,30 --bb-k 1.5,2,2.5 --rsi-n 7,14 --ema-n 10,20,50 \\
+        --rsi-long 25,30,35 --rsi-short 65,70,75 [--workers N] [--csv out.csv]
+    python src/sweep_mean_reversion.py ... --scaling      # combos/s for 1..N workers
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import pickle
+import tempfile
+import time
+from multiprocessing import Pool
+import numpy as np
+from market_store import MarketStore
+from backtest_mean_reversion import (load_close_series, indicator_series, run_backtest,
+                                     BB_N, BB_K, RSI_N, EMA_N, RSI_LONG, RSI_SHORT, RSI_EXIT)
+
+COLUMNS = ["bb_n", "bb_k", "rsi_n", "ema_n", "rsi_long", "rsi_short", "rsi_exit",
+           "pnl", "trades", "win_rate", "max_drawdown"]
+
+_series = None      # (timestamps, closes) memmaps, per worker
+_run_kwargs = {}
+
+
+# -------------------------
+# Workers
+# -------------------------
+def _init_worker(ts_path, close_path, run_kwargs):
+    global _series, _run_kwargs
+    _series = (np.load(ts_path, mmap_mode="r"), np.load(close_path, mmap_mode="r"))
+    _run_kwargs = run_kwargs
+
+
+def max_drawdown(pnls):
+    """Largest peak-to-trough fall of the cumulative realized PnL (starting from 0)."""
+    equity = np.concatenate(([0.0], np.cumsum(pnls)))
+    return float(np.max(np.maximum.accumulate(equity) - equity))
+
+
+def run_task(task):
+    """One indicator combination against every threshold combination."""
+    (bb_n, bb_k, rsi_n, ema_n), thresholds = task
+    timestamps, closes = _series
+    indicators = indicator_series(closes, bb_n, bb_k, rsi_n, ema_n)
+
+    rows = []
+    for rsi_long, rsi_short, rsi_exit in thresholds:
+        result = run_backtest(timestamps, closes, bb_n=bb_n, bb_k=bb_k, rsi_n=rsi_n, ema_n=ema_n,
+                              rsi_long=rsi_long, rsi_short=rsi_short, rsi_exit=rsi_exit,
+                              indicators=indicators, **_run_kwargs)
+        report = result["report"]
+        pnls = [t.realized_pnl for t in result["trades"]]
+        rows.append({
+            "bb_n": bb_n, "bb_k": bb_k, "rsi_n": rsi_n, "ema_n": ema_n,
+            "rsi_long": rsi_long, "rsi_short": rsi_short, "rsi_exit": rsi_exit,
+            "pnl": report["total_pnl"],
+            "trades": report["total_trades"],
+            "win_rate": report["wins"] / report["total_trades"] if report["total_trades"] else 0.0,
+            "max_drawdown": round(max_drawdown(pnls), 2),
+        })
+    return rows
+
+
+# -------------------------
+# Sweep
+# -------------------------
+def build_tasks(grid):
+    indicator_combos = itertools.product(grid["bb_n"], grid["bb_k"], grid["rsi_n"], grid["ema_n"])
+    thresholds = [
+        (lo, hi, ex)
+        for lo, hi, ex in itertools.product(grid["rsi_long"], grid["rsi_short"], grid["rsi_exit"])
+        if lo < hi
+    ]
+    return [(combo, thresholds) for combo in indicator_combos if combo[0] >= 2], len(thresholds)
+
+
+def sweep(timestamps, closes, grid, workers=None, **run_kwargs):
+    """Returns (ranked result rows, elapsed seconds)."""
+    tasks, _ = build_tasks(grid)
+    with tempfile.TemporaryDirectory() as tmp:
+        ts_path = os.path.join(tmp, "timestamps.npy")
+        close_path = os.path.join(tmp, "closes.npy")
+        np.save(ts_path, np.asarray(timestamps, dtype="datetime64[m]"))
+        np.save(close_path, np.asarray(closes, dtype=np.float64))
+
+        t0 = time.perf_counter()
+        with Pool(workers, initializer=_init_worker, initargs=(ts_path, close_path, run_kwargs)) as pool:
+            rows = [row for chunk in pool.imap_unordered(run_task, tasks) for row in chunk]
+        elapsed = time.perf_counter() - t0
+
+    rows.sort(key=lambda r: (-r["pnl"], r["max_drawdown"]))
+    return rows, elapsed
+
+
+def print_table(rows, top):
+    print(f"{'rank':>4} {'BB_N':>5} {'BB_K':>5} {'RSI_N':>5} {'EMA_N':>5} {'long':>5} {'short':>5} "
+          f"{'exit':>5} {'PnL':>10} {'trades':>6} {'win%':>6} {'max DD':>9}")
+    for rank, r in enumerate(rows[:top], 1):
+        print(f"{rank:>4} {r['bb_n']:>5} {r['bb_k']:>5} {r['rsi_n']:>5} {r['ema_n']:>5} "
+              f"{r['rsi_long']:>5} {r['rsi_short']:>5} {r['rsi_exit']:>5} {r['pnl']:>10.2f} "
+              f"{r['trades']:>6} {r['win_rate'] * 100:>6.1f} {r['max_drawdown']:>9.2f}")
+
+
+def _values(cast):
+    return lambda text: [cast(v) for v in text.split(",")]
+
+
+# -------------------------
+# Runner
+# -------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--data", default="./data/market_data.pkl", help="market_data.pkl or market_store dir")
+    parser.add_argument("--token", default=None, help="defaults to NIFTY25NOVFUT from contracts.csv")
+    parser.add_argument("--bb-n", type=_values(int), default=[BB_N])
+    parser.add_argument("--bb-k", type=_values(float), default=[BB_K])
+    parser.add_argument("--rsi-n", type=_values(int), default=[RSI_N])
+    parser.add_argument("--ema-n", type=_values(int), default=[EMA_N])
+    parser.add_argument("--rsi-long", type=_values(float), default=[RSI_LONG])
+    parser.add_argument("--rsi-short", type=_values(float), default=[RSI_SHORT])
+    parser.add_argument("--rsi-exit", type=_values(float), default=[RSI_EXIT])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="slippage seed shared by every run")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--csv", default=None, help="write every result row to this file")
+    parser.add_argument("--scaling", action="store_true", help="time the grid for 1..--workers workers")
+    args = parser.parse_args()
+
+    token = args.token
+    if token is None:
+        from load_csv import get_exchange_instrument_id
+        token = str(get_exchange_instrument_id("NIFTY25NOVFUT"))
+    if MarketStore.is_store(args.data):
+        data = MarketStore(args.data)
+    else:
+        data = pickle.load(open(args.data, "rb"))
+    timestamps, closes = load_close_series(data, token)
+
+    grid = {name: getattr(args, name) for name in
+            ("bb_n", "bb_k", "rsi_n", "ema_n", "rsi_long", "rsi_short", "rsi_exit")}
+    tasks, per_task = build_tasks(grid)
+    combos = len(tasks) * per_task
+    print(f"{len(closes)} bars, {combos} parameter sets ({len(tasks)} tasks)")
+
+    if args.scaling:
+        base = None
+        for workers in range(1, args.workers + 1):
+            _, elapsed = sweep(timestamps, closes, grid, workers=workers, seed=args.seed)
+            base = base or elapsed
+            print(f"workers={workers:>3}  {combos / elapsed:>10,.1f} sets/s  speedup x{base / elapsed:.2f}")
+    else:
+        rows, elapsed = sweep(timestamps, closes, grid, workers=args.workers, seed=args.seed)
+        print_table(rows, args.top)
+        print(f"{combos} parameter sets in {elapsed:.2f} s with {args.workers} workers "
+              f"({combos / elapsed:,.1f} sets/s)")
+        if args.csv:
+            with open(args.csv, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=COLUMNS)
+                writer.writeheader()
+                writer.writerows(rows)
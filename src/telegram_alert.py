@@ -1,3 +1,7 @@
+import atexit
+import threading
+import time
+from collections import deque
 import requests
 
 # -------------------------
@@ -7,12 +11,159 @@ TELEGRAM_BOT_TOKEN = "8278088757:AAFeDq3X5Q8it-e5oeWIey3bAJsqt9vP0lY"
 TELEGRAM_CHAT_ID = "1253991819"
 TELEGRAM_URL = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
 
-def send_telegram(message: str):
-    try:
-        data = {
-            "chat_id": TELEGRAM_CHAT_ID,
-            "text": message
-        }
-        requests.post(TELEGRAM_URL, data=data, timeout=5)
-    except Exception as e:
-        print(f"Telegram Alert Error: {e}")
+PRIORITY_TRADE = 0      # entries, exits, aborts, daily reports
+PRIORITY_INFO = 1       # launcher / status messages
+
+MAX_MESSAGE_LEN = 4096  # Telegram text limit
+
+
+# -------------------------
+# Background Dispatcher
+# -------------------------
+class TelegramDispatcher:
+    """
+    Non-blocking Telegram sender.
+
+    send() only appends to a bounded in-memory queue; a worker thread posts
+    with a reused HTTP session. Messages that arrive within coalesce_window
+    (or while waiting for the rate limit) are joined into one post, trade
+    messages first. When the queue is full the oldest INFO message is
+    dropped first, trade messages only when no INFO message is left.
+    """
+    def __init__(self, url=TELEGRAM_URL, chat_id=TELEGRAM_CHAT_ID, max_queue=1000,
+                 min_interval=1.0, coalesce_window=0.25, timeout=5):
+        self.url = url
+        self.chat_id = chat_id
+        self.max_queue = max_queue
+        self.min_interval = min_interval          # seconds between posts (rate limit)
+        self.coalesce_window = coalesce_window
+        self.timeout = timeout
+
+        self.queues = {PRIORITY_TRADE: deque(), PRIORITY_INFO: deque()}
+        self.cond = threading.Condition()
+        self.in_flight = False
+        self.stopping = False
+        self.dropped = 0
+        self.posts = 0
+        self.last_post = 0.0
+
+        self.session = requests.Session()
+        self.worker = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+        self.worker.start()
+
+    def pending(self):
+        return sum(len(q) for q in self.queues.values())
+
+    def send(self, message, priority=PRIORITY_INFO):
+        with self.cond:
+            if self.stopping:
+                return False
+            if self.pending() >= self.max_queue:
+                victim = self.queues[PRIORITY_INFO] or self.queues[PRIORITY_TRADE]
+                victim.popleft()
+                self.dropped += 1
+            self.queues[priority].append(message)
+            self.cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.pending() and not self.stopping:
+                    self.cond.wait()
+                if not self.pending():
+                    return
+
+                # Let a burst accumulate and respect the rate limit
+                ready_at = max(time.monotonic() + self.coalesce_window, self.last_post + self.min_interval)
+                while not self.stopping:
+                    remaining = ready_at - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+
+                batch = list(self.queues[PRIORITY_TRADE]) + list(self.queues[PRIORITY_INFO])
+                for q in self.queues.values():
+                    q.clear()
+                self.in_flight = True
+
+            try:
+                for text in self._chunks(batch):
+                    self._post(text)
+            finally:
+                with self.cond:
+                    self.in_flight = False
+                    self.cond.notify_all()
+
+    @staticmethod
+    def _chunks(messages):
+        """Join messages into as few posts as the Telegram length limit allows."""
+        chunk = ""
+        for msg in messages:
+            msg = msg[:MAX_MESSAGE_LEN]
+            if chunk and len(chunk) + 2 + len(msg) > MAX_MESSAGE_LEN:
+                yield chunk
+                chunk = ""
+            chunk = f"{chunk}\n\n{msg}" if chunk else msg
+        if chunk:
+            yield chunk
+
+    def _post(self, text):
+        try:
+            data = {
+                "chat_id": self.chat_id,
+                "text": text
+            }
+            self.session.post(self.url, data=data, timeout=self.timeout)
+        except Exception as e:
+            print(f"Telegram Alert Error: {e}")
+        finally:
+            self.last_post = time.monotonic()
+            self.posts += 1
+
+    def flush(self, timeout=10.0):
+        """Block until everything queued so far has been posted (or timeout)."""
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while self.pending() or self.in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def shutdown(self, timeout=10.0):
+        """Send what is queued without further rate-limit waits, then stop the worker."""
+        with self.cond:
+            self.stopping = True
+            self.cond.notify_all()
+        self.worker.join(timeout)
+        self.session.close()
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+_alerts_enabled = True
+
+
+def set_alerts_enabled(enabled):
+    """Turn send_telegram() into a no-op (backtests, benchmarks) or back on."""
+    global _alerts_enabled
+    _alerts_enabled = enabled
+
+
+def get_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = TelegramDispatcher()
+                atexit.register(_dispatcher.shutdown)
+    return _dispatcher
+
+
+def send_telegram(message: str, priority=PRIORITY_INFO):
+    """Queue a Telegram alert; returns immediately (delivery happens in the background)."""
+    if not _alerts_enabled:
+        return
+    get_dispatcher().send(message, priority)
@@ -0,0 +1,295 @@
+"""
+Trade Journal
+Append-only binary journal of orders, fills, position changes and closed
+trades, written by the OMS.
+
+File layout:
+    header   16 bytes: b"TJRNL\\0", version (u2), record size (u2), padding
+    records  fixed 96-byte little-endian records (RECORD_DTYPE), back to back
+
+    kind     ORDER    order_id, ts, symbol, side, qty, price, status
+             FILL     order_id, ts, symbol, side, qty, price = filled price
+             POSITION ts, symbol, side / qty / price = position after the
+                      change (side 0, qty 0 when flat), pnl = realized by it
+             TRADE    ts = exit, ts2 = entry, symbol, side, qty,
+                      price = exit, price2 = entry, pnl, reason
+    ts       epoch microseconds (naive exchange-local time, like feed_codec)
+    symbol / reason are UTF-8, at most 24 / 16 bytes: longer values raise
+    ValueError on append instead of being cut (a cut straddle pair
+    'CALL/PUT' would no longer match the live record)
+
+• append is a struct.pack into a memory buffer; a committer thread writes
+  and fsyncs the buffer every commit_interval seconds or once
+  commit_records are waiting (group commit), so at most one interval of
+  records is lost on a crash. flush() waits for everything appended so far.
+• read_journal() maps the file as a NumPy structured array (np.memmap), so
+  scans over millions of records are vectorized and read only what they touch.
+  A torn last record after a crash is ignored.
+
+Usage (from repo root):
+    python src/trade_journal.py report ./journal/Strategy/MeanReversion/<file>.jrnl
+"""
+
+import atexit
+import os
+import struct
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from records import Side, OrderStatus, TradeSummary
+
+JOURNAL_VERSION = 1
+MAGIC = b"TJRNL\0"
+HEADER = struct.Struct("<6sHH6x")
+
+KIND_ORDER = 1
+KIND_FILL = 2
+KIND_POSITION = 3
+KIND_TRADE = 4
+
+SIDE_CODES = {Side.BUY: 1, Side.SELL: 2}
+SIDES = {code: side for side, code in SIDE_CODES.items()}
+STATUS_CODES = {OrderStatus.NEW: 1, OrderStatus.FILLED: 2, OrderStatus.REJECTED: 3, OrderStatus.CANCELLED: 4}
+
+SYMBOL_SIZE = 24
+REASON_SIZE = 16
+
+RECORD = struct.Struct(f"<BBBxiqqqddd{SYMBOL_SIZE}s{REASON_SIZE}s")
+RECORD_DTYPE = np.dtype([
+    ("kind", "u1"), ("side", "u1"), ("status", "u1"), ("_pad", "u1"), ("qty", "<i4"),
+    ("order_id", "<i8"), ("ts", "<i8"), ("ts2", "<i8"),
+    ("price", "<f8"), ("price2", "<f8"), ("pnl", "<f8"),
+    ("symbol", f"S{SYMBOL_SIZE}"), ("reason", f"S{REASON_SIZE}"),
+])
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+def to_epoch_us(ts):
+    """datetime -> epoch microseconds; numeric timestamps are stored as given."""
+    if isinstance(ts, datetime):
+        return (ts - EPOCH) // _ONE_US
+    return int(ts or 0)
+
+
+def from_epoch_us(us):
+    return EPOCH + timedelta(microseconds=int(us))
+
+
+def _text(value, size, field):
+    """UTF-8 bytes of a symbol / reason; struct.pack would silently cut anything over `size`."""
+    raw = str(value).encode()
+    if len(raw) > size:
+        raise ValueError(f"Journal {field} {str(value)!r} is {len(raw)} bytes, the record holds {size}")
+    return raw
+
+
+# -------------------------
+# Writer
+# -------------------------
+class TradeJournal:
+    def __init__(self, path, commit_interval=0.05, commit_records=1024):
+        self.path = path
+        self.commit_interval = commit_interval
+        self.commit_bytes = commit_records * RECORD.size
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.file = open(path, "a+b")
+        size = os.fstat(self.file.fileno()).st_size
+        if size == 0:
+            self.file.write(HEADER.pack(MAGIC, JOURNAL_VERSION, RECORD.size))
+            self.file.flush()
+        else:
+            self.file.seek(0)
+            _check_header(self.file.read(HEADER.size), path)
+            torn = (size - HEADER.size) % RECORD.size
+            if torn:
+                os.ftruncate(self.file.fileno(), size - torn)
+
+        self.buffer = bytearray()
+        self.cond = threading.Condition()
+        self.appended = 0           # records handed to append
+        self.committed = 0          # records written and fsynced
+        self.commits = 0
+        self.flush_requested = False
+        self.stopping = False
+
+        self.worker = threading.Thread(target=self._run, name="trade-journal", daemon=True)
+        self.worker.start()
+        atexit.register(self.close)
+
+    def _append(self, record):
+        with self.cond:
+            if self.stopping:
+                raise ValueError(f"Journal {self.path} is closed")
+            self.buffer += record
+            self.appended += 1
+            if len(self.buffer) == RECORD.size or len(self.buffer) >= self.commit_bytes:
+                self.cond.notify()
+
+    # -------------------------
+    # Record types
+    # -------------------------
+    def order(self, order):
+        self._append(RECORD.pack(
+            KIND_ORDER, SIDE_CODES[order.side], STATUS_CODES[order.status], order.qty,
+            order.order_id, to_epoch_us(order.timestamp), 0,
+            order.price, 0.0, 0.0, _text(order.symbol, SYMBOL_SIZE, "symbol"), b""))
+
+    def fill(self, fill):
+        self._append(RECORD.pack(
+            KIND_FILL, SIDE_CODES[fill.side], 0, fill.qty,
+            fill.order_id, to_epoch_us(fill.timestamp), 0,
+            fill.filled_price, 0.0, 0.0, _text(fill.symbol, SYMBOL_SIZE, "symbol"), b""))
+
+    def position(self, symbol, pos, timestamp, realized_pnl=0.0, order_id=0):
+        """pos is the Position after the change, None when flat."""
+        if pos is None:
+            side, qty, avg_price = 0, 0, 0.0
+        else:
+            side, qty, avg_price = SIDE_CODES[pos.side], pos.qty, pos.avg_price
+        self._append(RECORD.pack(
+            KIND_POSITION, side, 0, qty,
+            order_id, to_epoch_us(timestamp), 0,
+            avg_price, 0.0, realized_pnl, _text(symbol, SYMBOL_SIZE, "symbol"), b""))
+
+    def trade(self, summary):
+        self._append(RECORD.pack(
+            KIND_TRADE, SIDE_CODES[Side(summary.side)], 0, summary.qty,
+            0, to_epoch_us(summary.exit_time), to_epoch_us(summary.entry_time),
+            summary.exit_price, summary.entry_price, summary.realized_pnl,
+            _text(summary.symbol, SYMBOL_SIZE, "symbol"), _text(summary.reason, REASON_SIZE, "reason")))
+
+    # -------------------------
+    # Group commit
+    # -------------------------
+    def _run(self):
+        while True:
+            with self.cond:
+                while not self.buffer and not self.stopping:
+                    self.cond.wait()
+                if not self.buffer:
+                    return
+
+                # let more records join this commit
+                deadline = time.monotonic() + self.commit_interval
+                while not (self.stopping or self.flush_requested or len(self.buffer) >= self.commit_bytes):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+
+                data, self.buffer = self.buffer, bytearray()
+                upto = self.appended
+                self.flush_requested = False
+
+            self.file.write(data)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+            with self.cond:
+                self.committed = upto
+                self.commits += 1
+                self.cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until every record appended so far is on disk."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            target = self.appended
+            self.flush_requested = True
+            self.cond.notify_all()
+            while self.committed < target:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def close(self):
+        with self.cond:
+            if self.stopping:
+                return
+            self.stopping = True
+            self.cond.notify_all()
+        self.worker.join()
+        self.file.close()
+
+
+# -------------------------
+# Reader
+# -------------------------
+def _check_header(raw, path):
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path} is not a trade journal (short header)")
+    magic, version, record_size = HEADER.unpack(raw)
+    if magic != MAGIC or version != JOURNAL_VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a version {JOURNAL_VERSION} trade journal")
+
+
+def read_journal(path):
+    """All complete records as a read-only structured array (RECORD_DTYPE)."""
+    with open(path, "rb") as f:
+        _check_header(f.read(HEADER.size), path)
+    rows = (os.path.getsize(path) - HEADER.size) // RECORD.size
+    if rows == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(rows,))
+
+
+def journal_trades(records):
+    """TradeSummary records for the TRADE entries, in journal order."""
+    rows = records[records["kind"] == KIND_TRADE]
+    return [
+        TradeSummary(
+            symbol=r["symbol"].decode(),
+            side=SIDES[int(r["side"])],
+            qty=int(r["qty"]),
+            entry_time=from_epoch_us(r["ts2"]),
+            exit_time=from_epoch_us(r["ts"]),
+            entry_price=float(r["price2"]),
+            exit_price=float(r["price"]),
+            realized_pnl=float(r["pnl"]),
+            reason=r["reason"].decode()
+        )
+        for r in rows
+    ]
+
+
+def trade_report(trades):
+    """Daily report numbers for a list of TradeSummary (live strategies, journal, backtest)."""
+    total_trades = len(trades)
+    wins = sum(1 for t in trades if t.realized_pnl >= 0)
+    total_pnl = sum(t.realized_pnl for t in trades)
+    daily_loss = sum(max(0.0, -t.realized_pnl) for t in trades)
+    return {
+        "total_trades": total_trades,
+        "wins": wins,
+        "losses": total_trades - wins,
+        "total_pnl": round(total_pnl, 2),
+        "daily_loss": round(daily_loss, 2)
+    }
+
+
+# -------------------------
+# CLI
+# -------------------------
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "report":
+        print("usage: trade_journal.py report <journal file>")
+        sys.exit(1)
+
+    records = read_journal(sys.argv[2])
+    kinds = np.bincount(records["kind"], minlength=KIND_TRADE + 1)
+    print(f"records: {len(records)} (orders={kinds[KIND_ORDER]}, fills={kinds[KIND_FILL]}, "
+          f"position changes={kinds[KIND_POSITION]}, trades={kinds[KIND_TRADE]})")
+    trades = journal_trades(records)
+    for t in trades:
+        print(t)
+    print("DAILY REPORT:", trade_report(trades))
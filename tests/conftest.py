@@ -0,0 +1,21 @@
+"""
+Test setup: src/ modules are flat and imported by name, like the scripts
+do. They create ./logs/<component>/ on import and read the contract master
+from ./data/contracts.csv, so the suite runs from a temporary directory
+with a small contract master of its own.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.chdir(tempfile.mkdtemp(prefix="package_tests_"))
+
+os.makedirs("data")
+with open("data/contracts.csv", "w") as f:
+    f.write("exchangeInstrumentID,Description\n"
+            "26000,NIFTY-SPOT\n"
+            "35001,NIFTY25NOVFUT\n"
+            "40001,NIFTY25NOV25000CE\n"
+            "40002,NIFTY25NOV25000PE\n")
@@ -0,0 +1,62 @@
+import random
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+import zmq
+import strategy_mean_reversion as mr
+from backtest_mean_reversion import run_backtest
+from market_subscriber import MarketSubscriber
+from telegram_alert import set_alerts_enabled
+
+# fast indicator settings, so a few days of random walk give plenty of trades
+PARAMS = {"bb_n": 5, "bb_k": 0.5, "rsi_n": 2, "ema_n": 50}
+
+
+def synthetic_day_bars(days=3, seed=11):
+    """09:15 - 15:29 one-minute bars per day (the live loop stops at 15:30)."""
+    rng = np.random.default_rng(seed)
+    times = [datetime(2025, 11, 3 + d, 9, 15) + timedelta(minutes=m) for d in range(days) for m in range(375)]
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, len(times))))
+    return times, closes
+
+
+def live_trades(times, closes, seed, max_daily_loss=None):
+    """Trades of an actual MeanReversionStrategy fed bar by bar through on_bar()."""
+    set_alerts_enabled(False)
+    context = zmq.Context()
+    strat = mr.MeanReversionStrategy(snapshot_addr=None, journal_file=None,
+                                     market=MarketSubscriber(context, "inproc://parity"), **PARAMS)
+    if max_daily_loss is not None:
+        strat.rms.max_daily_loss = max_daily_loss
+    random.seed(seed)           # OMS slippage
+    for ts, close in zip(times, closes):
+        strat.on_bar({"symbol": mr.SYMBOL_TOKEN, "timestamp": ts, "close": float(close)})
+    strat.market.close()
+    context.term()
+    return [t["summary"] for t in strat.trade_log if "summary" in t], strat
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_backtest_trades_match_live_strategy(seed):
+    times, closes = synthetic_day_bars(seed=seed)
+    live, strat = live_trades(times, closes, seed)
+    result = run_backtest(np.array(times, dtype="datetime64[m]"), closes, token=mr.SYMBOL_TOKEN, seed=seed,
+                          **PARAMS)
+
+    assert len(live) > 20
+    assert [t.as_dict() for t in result["trades"]] == [t.as_dict() for t in live]
+    assert result["open_position"] is None and strat.position is None
+    assert {t.reason for t in live} >= {"EXIT_RSI", "EXIT_EMA"}
+
+
+def test_daily_loss_stop_matches_live_rms():
+    times, closes = synthetic_day_bars(seed=6)
+    full, _ = live_trades(times, closes, seed=6)
+    limit = -min(np.cumsum([t.realized_pnl for t in full])) / 2     # breached part way through
+    live, strat = live_trades(times, closes, seed=6, max_daily_loss=limit)
+    result = run_backtest(np.array(times, dtype="datetime64[m]"), closes, token=mr.SYMBOL_TOKEN, seed=6,
+                          max_daily_loss=limit, **PARAMS)
+
+    assert 0 < len(live) < len(full)
+    assert strat.oms.total_pnl < -limit
+    assert [t.as_dict() for t in result["trades"]] == [t.as_dict() for t in live]
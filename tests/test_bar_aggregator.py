@@ -0,0 +1,35 @@
+from bar_aggregator import BarAggregator, BarBuilder
+
+
+def test_bar_completes_on_its_last_minute():
+    builder = BarBuilder(periods=(5,))
+    out = []
+    for minute, price in zip(range(100, 105), (10, 12, 9, 11, 13)):
+        out += builder.update(minute, price, price, price, price)
+    assert out == [(5, (100, 10, 13, 9, 13, 5))]
+    assert builder.flush() == []
+
+
+def test_gap_emits_incomplete_bar():
+    builder = BarBuilder(periods=(5,))
+    assert builder.update(100, 10, 10, 10, 10) == []
+    assert builder.update(101, 11, 11, 11, 11) == []
+    # 102 - 104 missing: the next bucket's first minute closes the old one
+    assert builder.update(105, 20, 20, 20, 20) == [(5, (100, 10, 11, 10, 11, 2))]
+    assert builder.flush() == [(5, (105, 20, 20, 20, 20, 1))]
+
+
+def test_gap_over_several_buckets_emits_once():
+    builder = BarBuilder(periods=(1, 5))
+    builder.update(101, 10, 10, 10, 10)
+    out = builder.update(117, 20, 20, 20, 20)
+    assert out == [(1, (117, 20, 20, 20, 20, 1)), (5, (100, 10, 10, 10, 10, 1))]
+
+
+def test_aggregator_keeps_tokens_apart():
+    agg = BarAggregator(periods=(3,))
+    agg.update("A", 99, 1, 1, 1, 1)
+    agg.update("B", 99, 2, 2, 2, 2)
+    assert agg.update("A", 100, 3, 3, 3, 3) == []
+    assert agg.update("A", 101, 4, 4, 4, 4) == [(3, (99, 1, 4, 1, 4, 3))]
+    assert agg.flush() == [("B", 3, (99, 2, 2, 2, 2, 1))]
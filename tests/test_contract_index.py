@@ -0,0 +1,108 @@
+import os
+import pytest
+import load_csv
+from contract_index import ContractIndex, build_index, make_description, open_index, parse_description
+
+CONTRACTS = """exchangeInstrumentID,Description,Other
+26000,NIFTY-SPOT,x
+26009,BANKNIFTY-SPOT,x
+40001,NIFTY25NOV24800CE,x
+40002,NIFTY25NOV24800PE,x
+40003,NIFTY25NOV24850.5CE,x
+40004,NIFTY25NOVFUT,x
+,BROKEN,x
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "contracts.csv"
+    path.write_text(CONTRACTS)
+    return str(path)
+
+
+@pytest.fixture
+def index(csv_path, tmp_path):
+    build_index(csv_path, str(tmp_path / "contracts.idx"))
+    index = ContractIndex(str(tmp_path / "contracts.idx"))
+    yield index
+    index.close()
+
+
+# -------------------------
+# Descriptions
+# -------------------------
+def test_parse_and_make_description_round_trip():
+    for description, fields in [("NIFTY25NOV24800CE", ("NIFTY", "25NOV", 24800.0, "CE")),
+                                ("NIFTY25NOV24850.5PE", ("NIFTY", "25NOV", 24850.5, "PE")),
+                                ("NIFTY25NOVFUT", ("NIFTY", "25NOV", None, "FUT")),
+                                ("NIFTY-SPOT", ("NIFTY", None, None, "SPOT"))]:
+        assert parse_description(description) == fields
+        assert make_description(*fields) == description
+    assert parse_description("garbage") is None
+
+
+# -------------------------
+# Index
+# -------------------------
+def test_lookups(index):
+    assert len(index) == 6                          # the row without a token is skipped
+    assert index.token("NIFTY-SPOT") == 26000
+    assert index.token("NIFTY25NOV24800PE") == 40002
+    assert index.token("NOPE") is None
+    assert "NIFTY25NOVFUT" in index
+    assert index.description(40003) == "NIFTY25NOV24850.5CE"
+    assert index.description("26009") == "BANKNIFTY-SPOT"
+    assert index.description(1, "NOT FOUND") == "NOT FOUND"
+    assert index.contract("NIFTY", "25NOV", 24800, "CE") == 40001
+    assert index.contract("NIFTY", "25NOV", kind="FUT") == 40004
+    assert index.contract("BANKNIFTY") == 26009
+    assert index.contract("NIFTY", "25NOV", 99999, "CE") is None
+    assert dict(index.items())["NIFTY25NOV24800CE"] == 40001
+
+
+def test_open_index_rebuilds_when_csv_is_newer(csv_path, tmp_path):
+    idx_path = str(tmp_path / "contracts.idx")
+    open_index(csv_path, idx_path).close()
+    with open(csv_path, "a") as f:
+        f.write("40005,NIFTY25NOV24900CE,x\n")
+    stamp = os.path.getmtime(idx_path) + 10
+    os.utime(csv_path, (stamp, stamp))
+    index = open_index(csv_path, idx_path)
+    assert index.token("NIFTY25NOV24900CE") == 40005
+    index.close()
+
+
+# -------------------------
+# load_csv
+# -------------------------
+@pytest.fixture
+def contracts(csv_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(load_csv, "CONTRACTS_CSV", csv_path)
+    monkeypatch.setattr(load_csv, "CONTRACTS_INDEX", str(tmp_path / "contracts.idx"))
+    monkeypatch.setattr(load_csv, "_index", None)
+    saved = vars(load_csv).pop("desc_to_id", None)
+    yield load_csv
+    load_csv.get_index().close()
+    vars(load_csv).pop("desc_to_id", None)
+    if saved is not None:
+        load_csv.desc_to_id = saved
+
+
+def test_load_csv_lookups(contracts):
+    assert contracts.get_exchange_instrument_id("NIFTY-SPOT") == 26000
+    assert contracts.get_exchange_instrument_id("NOPE") == "NOT FOUND"
+    assert contracts.get_description(40004) == "NIFTY25NOVFUT"
+    assert contracts.get_contract_id("NIFTY", "25NOV", 24800, "PE") == 40002
+    assert contracts.get_contract_id("NIFTY", "25NOV", 1, "PE") == "NOT FOUND"
+
+
+def test_desc_to_id_is_built_once_on_first_access(contracts):
+    assert "desc_to_id" not in vars(contracts)
+    table = contracts.desc_to_id
+    assert table == {"NIFTY-SPOT": 26000, "BANKNIFTY-SPOT": 26009, "NIFTY25NOV24800CE": 40001,
+                     "NIFTY25NOV24800PE": 40002, "NIFTY25NOV24850.5CE": 40003, "NIFTY25NOVFUT": 40004}
+    assert vars(contracts)["desc_to_id"] is table       # a plain global now: no rebuild
+    assert contracts.desc_to_id is table
+    with pytest.raises(AttributeError):
+        contracts.no_such_name
@@ -0,0 +1,78 @@
+import pickle
+from datetime import datetime
+import pytest
+from feed_codec import (BAR_SIZE, MAX_BATCH, WIRE_BATCH, WIRE_BINARY, WIRE_OHLCV, WIRE_PICKLE, decode_message,
+                        decode_messages, encode_bar, encode_batch, encode_ohlcv, from_epoch_minute, to_epoch_minute)
+
+TS = datetime(2025, 11, 3, 9, 15)
+MINUTE = to_epoch_minute(TS)
+
+
+def test_epoch_minute_round_trip():
+    assert to_epoch_minute("2025-11-03 09:15") == MINUTE
+    assert from_epoch_minute(MINUTE) == TS
+
+
+def test_binary_round_trip():
+    payload = encode_bar(26000, MINUTE, 100.5, 102.0, 99.25, 101.75)
+    assert payload[0] == WIRE_BINARY
+    assert len(payload) == BAR_SIZE
+    assert decode_message(payload) == {"symbol": "26000", "timestamp": TS, "price": 101.75,
+                                       "open": 100.5, "high": 102.0, "low": 99.25, "close": 101.75}
+    assert decode_messages(payload) == [decode_message(payload)]
+
+
+def test_pickle_round_trip():
+    payload = encode_bar(26000, MINUTE, 100.5, 102.0, 99.25, 101.75, wire_format=WIRE_PICKLE)
+    assert payload[0] == WIRE_PICKLE
+    assert decode_message(payload) == {"symbol": "26000", "timestamp": TS, "price": 101.75}
+
+
+def test_legacy_raw_pickle_is_accepted():
+    payload = pickle.dumps({"symbol": "26000", "timestamp": "2025-11-03 09:15", "price": 101.75})
+    assert decode_message(payload) == {"symbol": "26000", "timestamp": TS, "price": 101.75}
+    assert decode_messages(payload) == [{"symbol": "26000", "timestamp": TS, "price": 101.75}]
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        decode_message(b"\x7fjunk")
+    with pytest.raises(ValueError):
+        encode_bar(26000, MINUTE, 1.0, 1.0, 1.0, 1.0, wire_format=0x7f)
+
+
+# -------------------------
+# Batches
+# -------------------------
+BARS = [(MINUTE, 100.0, 101.0, 99.0, 100.5), (MINUTE + 1, 100.5, 102.0, 100.0, 101.5)]
+
+
+def test_binary_batch_round_trip():
+    payload = encode_batch(26000, BARS)
+    assert payload[0] == WIRE_BATCH
+    msgs = decode_messages(payload)
+    assert [m["timestamp"] for m in msgs] == [TS, from_epoch_minute(MINUTE + 1)]
+    assert [(m["open"], m["high"], m["low"], m["close"], m["price"]) for m in msgs] == \
+        [(100.0, 101.0, 99.0, 100.5, 100.5), (100.5, 102.0, 100.0, 101.5, 101.5)]
+    assert {m["symbol"] for m in msgs} == {"26000"}
+    with pytest.raises(ValueError):
+        decode_message(payload)
+
+
+def test_pickle_batch_round_trip():
+    msgs = decode_messages(encode_batch(26000, BARS, wire_format=WIRE_PICKLE))
+    assert msgs == [{"symbol": "26000", "timestamp": TS, "price": 100.5},
+                    {"symbol": "26000", "timestamp": from_epoch_minute(MINUTE + 1), "price": 101.5}]
+
+
+def test_batch_size_is_bounded():
+    assert decode_messages(encode_batch(26000, [])) == []
+    with pytest.raises(ValueError):
+        encode_batch(26000, BARS * (MAX_BATCH // 2 + 1))
+
+
+def test_ohlcv_round_trip():
+    payload = encode_ohlcv(26000, 5, MINUTE, 100.0, 103.0, 98.0, 102.0, 5)
+    assert payload[0] == WIRE_OHLCV
+    assert decode_messages(payload) == [{"symbol": "26000", "timestamp": TS, "price": 102.0, "open": 100.0,
+                                         "high": 103.0, "low": 98.0, "close": 102.0, "volume": 5.0, "period": 5}]
@@ -0,0 +1,95 @@
+import random
+import pytest
+from indicators import EMA, BollingerBands, RollingStats, WilderRSI
+
+
+def prices(n, seed=1, start=25000.0):
+    rng = random.Random(seed)
+    out = [start]
+    for _ in range(n - 1):
+        out.append(out[-1] * (1 + rng.gauss(0, 0.001)))
+    return out
+
+
+# -------------------------
+# Rescan references (recompute from the window / full history every bar)
+# -------------------------
+def window_stats(window):
+    m = sum(window) / len(window)
+    return m, (sum((v - m) ** 2 for v in window) / len(window)) ** 0.5
+
+
+def wilder_rsi(history, period):
+    changes = [b - a for a, b in zip(history, history[1:])]
+    if len(changes) < period:
+        return None
+    gains = [max(c, 0.0) for c in changes]
+    losses = [max(-c, 0.0) for c in changes]
+    avg_gain, avg_loss = sum(gains[:period]) / period, sum(losses[:period]) / period
+    for g, l in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + g) / period
+        avg_loss = (avg_loss * (period - 1) + l) / period
+    return 100 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+# -------------------------
+# Tests
+# -------------------------
+@pytest.mark.parametrize("period", [1, 2, 20, 200])
+def test_rolling_stats_matches_rescan(period):
+    series = prices(1500)
+    stats = RollingStats(period)
+    for i, value in enumerate(series):
+        stats.update(value)
+        window = series[max(0, i + 1 - period):i + 1]
+        mean, sd = window_stats(window)
+        assert stats.ready == (i + 1 >= period)
+        assert stats.mean == pytest.approx(mean, rel=1e-12)
+        assert stats.stddev == pytest.approx(sd, rel=1e-6, abs=1e-6)
+
+
+def test_bollinger_bands():
+    series = prices(100)
+    bands = BollingerBands(20, 2)
+    for i, value in enumerate(series):
+        lower, mid, upper = bands.update(value)
+        if i < 19:
+            assert (lower, mid, upper) == (None, None, None)
+            continue
+        mean, sd = window_stats(series[i - 19:i + 1])
+        assert (lower, mid, upper) == pytest.approx((mean - 2 * sd, mean, mean + 2 * sd), rel=1e-9)
+
+
+@pytest.mark.parametrize("period", [2, 14, 50])
+def test_wilder_rsi_matches_rescan(period):
+    series = prices(600, seed=period)
+    rsi = WilderRSI(period)
+    for i, value in enumerate(series):
+        expected = wilder_rsi(series[:i + 1], period)
+        got = rsi.update(value)
+        if expected is None:
+            assert got is None
+        else:
+            assert got == pytest.approx(expected, rel=1e-9)
+
+
+def test_wilder_rsi_all_gains_is_100():
+    rsi = WilderRSI(3)
+    for value in (1, 2, 3, 4, 5):
+        result = rsi.update(value)
+    assert result == 100
+
+
+def test_ema_matches_recurrence():
+    series = prices(300)
+    ema = EMA(50)
+    expected = None
+    for value in series:
+        expected = value if expected is None else (value - expected) * 2 / 51 + expected
+        assert ema.update(value) == pytest.approx(expected, rel=1e-12)
+
+
+def test_invalid_period():
+    for cls in (RollingStats, WilderRSI):
+        with pytest.raises(ValueError):
+            cls(0)
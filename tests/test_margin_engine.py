@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from margin_engine import MarginEngine
+from records import Side
+from simulator_rms import RMS
+
+CONTRACTS = [(26000, "NIFTY-SPOT"), (40001, "NIFTY25NOV25000CE"), (40002, "NIFTY25NOV25000PE"),
+             (40004, "NIFTY25NOVFUT"), (26009, "BANKNIFTY-SPOT"), (1, "NOT A CONTRACT")]
+
+
+@pytest.fixture
+def engine():
+    # scenarios: underlying at -10%, 0, +10%; no exposure add-on unless a test sets it
+    engine = MarginEngine(CONTRACTS, scan_pct=0.1, scenarios=3, exposure_pct=0.0)
+    engine.update_price(26000, 25000.0)
+    return engine
+
+
+def test_future_scan_and_exposure():
+    engine = MarginEngine(CONTRACTS, scan_pct=0.1, scenarios=3, exposure_pct=0.02)
+    engine.update_price(26000, 25000.0)
+    engine.fill(40004, 10, 25000.0)
+    # worst move: 10 x -2500, plus 2% of 10 x 25000 notional
+    assert engine.total() == pytest.approx(25000 + 5000)
+    assert engine.by_underlying() == {"NIFTY": pytest.approx(30000)}
+
+
+def test_short_straddle_is_charged_for_one_side(engine):
+    engine.update_price(40001, 200.0)
+    engine.update_price(40002, 200.0)
+    engine.fill(40002, -1, 200.0)
+    put_only = engine.total()
+    assert put_only == pytest.approx(2300)          # 2500 intrinsic at -10% less 200 premium
+    engine.fill(40001, -1, 200.0)
+    assert engine.total() == pytest.approx(2100)    # the call's premium offsets the put's loss
+
+
+def test_future_hedges_short_call(engine):
+    engine.update_price(40001, 200.0)
+    engine.fill(40001, -1, 200.0)
+    naked = engine.total()
+    engine.fill(40004, 1, 25000.0)
+    assert engine.total() < naked
+
+
+def test_what_if_matches_fill_and_leaves_state(engine):
+    engine.update_price(40001, 200.0)
+    engine.update_price(40002, 180.0)
+    engine.fill(40001, -2, 200.0)
+    before = engine.total()
+    legs = [(40002, Side.SELL, 2, 180.0), (40004, Side.BUY, 1, 25010.0), (26009, Side.BUY, 1, 50000.0)]
+    expected = engine.what_if(legs)
+    assert engine.total() == before
+    assert engine.qty.tolist() == [0, -2, 0, 0, 0]
+
+    engine.fill(40002, -2, 180.0)
+    engine.fill(40004, 1, 25010.0)
+    engine.fill(26009, 1, 50000.0)
+    assert engine.total() == pytest.approx(expected)
+
+
+def test_marks_reprice_and_flat_book_is_zero(engine):
+    engine.fill(40001, -1, 200.0)
+    assert engine.total() == pytest.approx(2300)
+    engine.update_price(26000, 26000.0)             # re-priced on the next total()
+    assert engine.total() == pytest.approx(26000 * 1.1 - 25000 - 200)
+    engine.fill(40001, 1, 1000.0)
+    assert engine.total() == 0
+    assert engine.legs == {}
+
+
+def test_unknown_contracts_are_ignored(engine):
+    engine.fill("99999", 5, 100.0)
+    engine.update_price("99999", 100.0)
+    assert engine.what_if([("99999", Side.BUY, 5, 100.0)]) == 0
+    assert "1" not in engine.index
+
+
+def test_rms_rejects_over_max_margin(engine):
+    rms = RMS(max_exposure=100, margin=engine, max_margin=30000)
+    assert rms.check_order("40004", Side.BUY, 10, 25000.0)
+    rms.on_fill("40004", Side.BUY, 10, 25000.0)
+    assert not rms.check_order("40004", Side.BUY, 5, 25000.0)
+    assert rms.check_order("40004", Side.SELL, 5, 25000.0)      # reducing passes
+
+
+def test_contract_master_is_parsed_once_per_process(monkeypatch):
+    import margin_engine
+    import load_csv
+    monkeypatch.setattr(margin_engine, "_master", None)
+    parses = []
+    items = load_csv.get_index().items
+
+    class CountingIndex:
+        def items(self):
+            parses.append(1)
+            return items()
+    monkeypatch.setattr(load_csv, "get_index", CountingIndex)
+
+    first = MarginEngine.from_contract_master()
+    second = MarginEngine.from_contract_master(exposure_pct=0.0)
+    assert len(parses) == 1
+    assert first.kind is second.kind and first.index is second.index
+
+    first.update_price("26000", 25000.0)
+    first.fill("35001", 2, 25000.0)
+    assert first.total() > 0
+    assert second.total() == 0 and not second.qty.any()       # positions are per engine
+    assert np.isnan(second.under_price).all()
+    assert second.exposure_pct == 0.0
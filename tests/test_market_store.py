@@ -0,0 +1,56 @@
+import csv
+import pickle
+from feed_codec import to_epoch_minute
+from market_store import MarketStore, convert_pickle, export_csv
+
+MINUTES = ["2025-11-03 09:15", "2025-11-03 09:16", "2025-11-03 09:17"]
+
+
+def series(prices):
+    return [{"Minute": m, "Price": p} for m, p in zip(MINUTES, prices)]
+
+
+def make_store(tmp_path):
+    # token 26000 has full OHLC, 26009 only closes (OHL fall back to close)
+    data = {
+        "Open": {"26000": series([100, 101, 102])},
+        "High": {"26000": series([105, 106, 107])},
+        "Low": {"26000": series([95, 96, 97])},
+        "Close": {"26000": series([101, 102, 103]), "26009": series([50.5, 51.5])},
+    }
+    pkl = tmp_path / "market_data.pkl"
+    pkl.write_bytes(pickle.dumps(data))
+    rows = convert_pickle(str(pkl), str(tmp_path / "store"))
+    return rows, MarketStore(str(tmp_path / "store"))
+
+
+def test_convert_and_read_back(tmp_path):
+    rows, store = make_store(tmp_path)
+    assert rows == 5
+    assert MarketStore.is_store(str(tmp_path / "store"))
+    assert store.tokens() == ["26000", "26009"]
+
+    first = to_epoch_minute(MINUTES[0])
+    assert list(store.bars("26000")) == [(first, 100.0, 105.0, 95.0, 101.0), (first + 1, 101.0, 106.0, 96.0, 102.0),
+                                         (first + 2, 102.0, 107.0, 97.0, 103.0)]
+    assert list(store.bars(26009)) == [(first, 50.5, 50.5, 50.5, 50.5), (first + 1, 51.5, 51.5, 51.5, 51.5)]
+    assert store.series("26009", "close").tolist() == [50.5, 51.5]
+    assert str(store.timestamps("26000")[0]) == "2025-11-03T09:15"
+
+
+def test_token_bars_is_reiterable_with_length(tmp_path):
+    _, store = make_store(tmp_path)
+    bars = store.bars("26000")
+    assert len(bars) == 3
+    assert list(bars) == list(bars)
+    assert list(store.iter_bars("26000", chunk=2)) == list(bars)
+
+
+def test_export_csv(tmp_path):
+    _, store = make_store(tmp_path)
+    export_csv(store, str(tmp_path / "out.csv"))
+    with open(tmp_path / "out.csv", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Token", "Minute", "Open", "High", "Low", "Close"]
+    assert rows[1] == ["26000", "2025-11-03 09:15", "100.0", "105.0", "95.0", "101.0"]
+    assert len(rows) == 6
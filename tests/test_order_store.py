@@ -0,0 +1,87 @@
+import json
+from datetime import datetime
+import pytest
+from order_store import OrderStore
+from records import Fill, Order, OrderStatus, Side
+
+TS = datetime(2025, 11, 3, 9, 15)
+
+
+def order(order_id, symbol="NIFTY"):
+    return Order(order_id, symbol, Side.BUY, 1, 100.0, TS)
+
+
+def fill(order_id, symbol="NIFTY"):
+    return Fill(order_id, symbol, Side.BUY, 1, 100.0 + order_id, TS)
+
+
+# -------------------------
+# Orders
+# -------------------------
+def test_transition_moves_order_out_of_pending():
+    store = OrderStore()
+    for i in (1, 2, 3):
+        store.add(order(i, "NIFTY" if i < 3 else "BANKNIFTY"))
+    store.transition(1, OrderStatus.FILLED)
+    store.transition(2, "REJECTED")
+    assert [o.order_id for o in store.pending()] == [3]
+    assert [o.order_id for o in store.by_status(OrderStatus.FILLED)] == [1]
+    assert [o.order_id for o in store.by_status(OrderStatus.REJECTED)] == [2]
+    assert [o.order_id for o in store.by_symbol("NIFTY")] == [1, 2]
+    assert store.get(2).status is OrderStatus.REJECTED
+
+
+def test_terminal_orders_cannot_transition():
+    store = OrderStore()
+    store.add(order(1))
+    store.transition(1, OrderStatus.FILLED)
+    with pytest.raises(ValueError):
+        store.transition(1, OrderStatus.CANCELLED)
+    with pytest.raises(ValueError):
+        store.transition(1, OrderStatus.NEW)
+    assert store.get(1).status is OrderStatus.FILLED
+
+
+def test_terminal_orders_are_evicted_oldest_first():
+    store = OrderStore(max_orders=2)
+    for i in range(1, 6):
+        store.add(order(i))
+    store.transition(1, OrderStatus.FILLED)
+    store.transition(3, OrderStatus.FILLED)
+    store.transition(2, OrderStatus.REJECTED)
+    # 1 retired first; pending orders are never evicted
+    assert store.get(1) is None
+    assert [o.order_id for o in store.by_symbol("NIFTY")] == [2, 3, 4, 5]
+    assert [o.order_id for o in store.pending()] == [4, 5]
+    store.transition(4, OrderStatus.CANCELLED)
+    store.transition(5, OrderStatus.CANCELLED)
+    assert sorted(store.orders) == [4, 5]
+    assert store.by_status(OrderStatus.FILLED) == []
+
+
+# -------------------------
+# Fills
+# -------------------------
+def test_fills_are_bounded_and_spilled(tmp_path):
+    spill = tmp_path / "fills.jsonl"
+    store = OrderStore(max_fills=2, spill_path=str(spill))
+    for i in range(1, 6):
+        store.add_fill(fill(i))
+    store.close()
+
+    assert [f.order_id for f in store.fills] == [4, 5]
+    assert store.fill_for(5).filled_price == 105.0
+    assert store.fill_for(1) is None
+    assert store.spilled_fills == 3
+    spilled = [json.loads(line) for line in spill.read_text().splitlines()]
+    assert [f["order_id"] for f in spilled] == [1, 2, 3]
+    assert spilled[0]["filled_price"] == 101.0
+    assert spilled[0]["symbol"] == "NIFTY"
+
+
+def test_fills_without_spill_path_are_dropped():
+    store = OrderStore(max_fills=1)
+    store.add_fill(fill(1))
+    store.add_fill(fill(2))
+    assert store.fill_for(1) is None
+    assert store.spilled_fills == 0
@@ -0,0 +1,93 @@
+from simulator_rms import RMS
+from records import Side
+
+
+# -------------------------
+# Reservations
+# -------------------------
+def test_reserve_books_exposure_until_released():
+    rms = RMS(max_exposure=10)
+    token = rms.reserve("NIFTY", Side.BUY, 4, 100.0)
+    assert token is not None
+    assert rms.exposure["NIFTY"] == 4
+    rms.release(token)
+    assert rms.exposure["NIFTY"] == 0
+    assert not rms.matches(token, "NIFTY", Side.BUY, 4)
+
+
+def test_commit_keeps_exposure_and_spends_token():
+    rms = RMS(max_exposure=10)
+    token = rms.reserve("NIFTY", Side.SELL, 3, 100.0)
+    assert rms.matches(token, "NIFTY", Side.SELL, 3)
+    rms.commit(token)
+    assert rms.exposure["NIFTY"] == -3
+    assert not rms.matches(token, "NIFTY", Side.SELL, 3)
+    rms.release(token)              # already committed: no effect
+    assert rms.exposure["NIFTY"] == -3
+
+
+def test_matches_checks_symbol_side_and_qty():
+    rms = RMS()
+    token = rms.reserve("NIFTY", Side.BUY, 5, 100.0)
+    assert rms.matches(token, "NIFTY", Side.BUY, 5)
+    assert not rms.matches(token, "BANKNIFTY", Side.BUY, 5)
+    assert not rms.matches(token, "NIFTY", Side.SELL, 5)
+    assert not rms.matches(token, "NIFTY", Side.BUY, 6)
+    assert not rms.matches(token + 1, "NIFTY", Side.BUY, 5)
+
+
+def test_exposure_limit_rejects_without_booking():
+    rms = RMS(max_exposure=10)
+    assert rms.reserve("NIFTY", Side.BUY, 11, 100.0) is None
+    assert rms.exposure == {}
+
+
+# -------------------------
+# Baskets
+# -------------------------
+def test_basket_reserves_every_leg():
+    rms = RMS(max_exposure=10)
+    tokens = rms.check_basket([("CE", Side.SELL, 5, 100.0), ("PE", Side.SELL, 5, 90.0)])
+    assert len(tokens) == 2
+    assert rms.exposure == {"CE": -5, "PE": -5}
+    assert rms.matches(tokens[0], "CE", Side.SELL, 5)
+    assert rms.matches(tokens[1], "PE", Side.SELL, 5)
+
+
+def test_basket_is_all_or_none():
+    rms = RMS(max_exposure=10)
+    rms.check_order("PE", Side.SELL, 8, 90.0)
+    # second leg would take PE to -13: neither leg is booked
+    assert rms.check_basket([("CE", Side.SELL, 5, 100.0), ("PE", Side.SELL, 5, 90.0)]) is None
+    assert rms.exposure == {"PE": -8}
+    assert rms.reservations == {}
+
+
+def test_basket_legs_on_one_symbol_are_netted():
+    rms = RMS(max_exposure=10)
+    assert rms.check_basket([("CE", Side.BUY, 8, 100.0), ("CE", Side.BUY, 8, 100.0)]) is None
+    assert rms.check_basket([("CE", Side.BUY, 8, 100.0), ("CE", Side.SELL, 8, 100.0)]) is not None
+    assert rms.exposure["CE"] == 0
+
+
+# -------------------------
+# Limits vs exits
+# -------------------------
+def test_daily_loss_blocks_new_risk_but_not_exits():
+    rms = RMS(max_exposure=10, max_daily_loss=100)
+    rms.check_order("NIFTY", Side.BUY, 5, 100.0)
+    rms.update_pnl(-500)
+    assert rms.reserve("NIFTY", Side.BUY, 1, 100.0) is None
+    assert rms.reserve("BANKNIFTY", Side.SELL, 1, 100.0) is None
+    assert rms.reserve("NIFTY", Side.SELL, 10, 100.0) is None     # flips to short
+    assert rms.reserve("NIFTY", Side.SELL, 2, 100.0) is not None  # partial exit
+    assert rms.reserve("NIFTY", Side.SELL, 3, 100.0) is not None  # rest of it
+    assert rms.exposure["NIFTY"] == 0
+
+
+def test_exit_passes_over_exposure_limit():
+    rms = RMS(max_exposure=10)
+    rms.check_order("NIFTY", Side.BUY, 10, 100.0)
+    rms.max_exposure = 5            # limit lowered while the position is open
+    assert rms.reserve("NIFTY", Side.BUY, 1, 100.0) is None
+    assert rms.reserve("NIFTY", Side.SELL, 4, 100.0) is not None
@@ -0,0 +1,70 @@
+from records import Fill, OrderStatus, Side
+from simulator_oms import OMS
+from simulator_rms import RMS
+
+
+def make_oms(**limits):
+    return OMS(RMS(**limits), slippage_pct=0.0)
+
+
+def test_exit_fills_under_daily_loss_breach():
+    oms = make_oms(max_exposure=10, max_daily_loss=100)
+    assert isinstance(oms.place_order("NIFTY", Side.BUY, 10, 100.0), Fill)
+    oms.update_price("NIFTY", 80.0)             # unrealized -200: limit breached
+    assert oms.rms.total_pnl == -200
+
+    entry = oms.place_order("NIFTY", Side.BUY, 1, 80.0)
+    assert not isinstance(entry, Fill)
+    assert entry.status is OrderStatus.REJECTED
+
+    flip = oms.place_order("NIFTY", Side.SELL, 20, 80.0)
+    assert not isinstance(flip, Fill)
+
+    exit_ = oms.place_order("NIFTY", Side.SELL, 10, 80.0)
+    assert isinstance(exit_, Fill)
+    assert oms.get_positions() == {}
+    assert oms.cum_realized_pnl == -200
+    assert oms.rms.exposure["NIFTY"] == 0
+
+
+def test_reservation_commits_on_fill():
+    oms = make_oms(max_exposure=10)
+    token = oms.rms.reserve("NIFTY", Side.BUY, 5, 100.0)
+    assert isinstance(oms.place_order("NIFTY", Side.BUY, 5, 100.0, reservation=token), Fill)
+    assert oms.rms.reservations == {}
+    assert oms.rms.exposure["NIFTY"] == 5
+
+
+def test_unknown_or_spent_reservation_is_rejected():
+    oms = make_oms(max_exposure=10)
+    bogus = oms.place_order("NIFTY", Side.BUY, 5, 100.0, reservation=12345)
+    assert not isinstance(bogus, Fill)
+    assert oms.rms.exposure == {}
+
+    token = oms.rms.reserve("NIFTY", Side.BUY, 5, 100.0)
+    assert isinstance(oms.place_order("NIFTY", Side.BUY, 5, 100.0, reservation=token), Fill)
+    again = oms.place_order("NIFTY", Side.BUY, 5, 100.0, reservation=token)
+    assert not isinstance(again, Fill)
+    assert oms.rms.exposure["NIFTY"] == 5
+
+
+def test_reservation_for_another_order_is_rejected_and_released():
+    oms = make_oms(max_exposure=100)
+    token = oms.rms.reserve("NIFTY", Side.BUY, 1, 100.0)
+    assert oms.rms.exposure["NIFTY"] == 1
+    assert not isinstance(oms.place_order("NIFTY", Side.BUY, 50, 100.0, reservation=token), Fill)
+    assert oms.get_positions() == {}
+    # the booked exposure is given back, not left until the end of the day
+    assert oms.rms.exposure["NIFTY"] == 0
+    assert oms.rms.reservations == {}
+    # and the token is spent: it cannot fill the order it was booked for any more
+    assert not isinstance(oms.place_order("NIFTY", Side.BUY, 1, 100.0, reservation=token), Fill)
+    assert oms.rms.exposure["NIFTY"] == 0
+
+
+def test_mismatched_basket_leg_releases_only_its_own_token():
+    oms = make_oms(max_exposure=10)
+    call, put = oms.rms.check_basket([("CE", Side.SELL, 1, 100.0), ("PE", Side.SELL, 1, 90.0)])
+    assert not isinstance(oms.place_order("PE", Side.SELL, 1, 90.0, reservation=call), Fill)
+    assert isinstance(oms.place_order("PE", Side.SELL, 1, 90.0, reservation=put), Fill)
+    assert oms.rms.exposure == {"CE": 0, "PE": -1}
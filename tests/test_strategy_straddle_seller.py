@@ -0,0 +1,58 @@
+from datetime import datetime
+import pytest
+import zmq
+import strategy_straddle_seller as ss
+from market_subscriber import MarketSubscriber
+from telegram_alert import set_alerts_enabled
+
+
+@pytest.fixture
+def strat():
+    """StraddleSeller with entry / exit stubbed: entries are recorded, exits close at once."""
+    set_alerts_enabled(False)
+    context = zmq.Context()
+    strat = ss.StraddleSeller(snapshot_addr=None, journal_file=None,
+                              market=MarketSubscriber(context, "inproc://straddle"))
+    strat.entries = []
+    strat.track_atm_legs = lambda spot: None
+
+    def place_straddle(spot, ts):
+        strat.entries.append(ts)
+        strat.position = {"entry_time": ts}
+
+    def monitor_exit(ts, force_reason=None):
+        strat.position = None       # every tick hits the stop-loss / target
+
+    strat.place_straddle = place_straddle
+    strat.monitor_exit = monitor_exit
+    yield strat
+    strat.market.close()
+    context.term()
+
+
+def at(hour, minute):
+    return datetime(2025, 11, 3, hour, minute)
+
+
+def test_no_entry_before_entry_time(strat):
+    strat.on_spot(25000.0, at(9, 15))
+    strat.on_spot(25000.0, at(9, 19))
+    assert strat.entries == []
+
+
+def test_re_enters_when_flat_after_an_exit(strat):
+    for minute in (20, 21, 22):
+        strat.on_spot(25000.0, at(9, minute))
+    assert strat.entries == [at(9, 20), at(9, 21), at(9, 22)]
+
+
+def test_no_entry_from_square_off_time(strat):
+    strat.on_spot(25000.0, at(15, 9))
+    strat.on_spot(25000.0, at(15, 10))
+    strat.on_spot(25000.0, at(15, 20))
+    assert strat.entries == [at(15, 9)]
+
+
+def test_stops_at_market_close(strat):
+    assert strat.on_spot(25000.0, at(15, 29))
+    assert not strat.on_spot(25000.0, at(15, 30))
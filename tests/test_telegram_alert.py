@@ -0,0 +1,122 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+import pytest
+from telegram_alert import PRIORITY_INFO, PRIORITY_TRADE, TelegramDispatcher
+
+
+# -------------------------
+# Local stub of the Telegram sendMessage endpoint
+# -------------------------
+@pytest.fixture
+def stub():
+    posts = []          # (monotonic time, form fields)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+            posts.append((time.monotonic(), {k: v[0] for k, v in parse_qs(body).items()}))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"ok":true}')
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}/sendMessage"
+    server.posts = posts
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_dispatcher(stub):
+    dispatchers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("min_interval", 0.0)
+        kwargs.setdefault("coalesce_window", 0.0)
+        dispatchers.append(TelegramDispatcher(url=stub.url, chat_id="42", **kwargs))
+        return dispatchers[-1]
+    yield make
+    for d in dispatchers:
+        d.shutdown()
+
+
+def texts(stub):
+    return [fields["text"] for _, fields in stub.posts]
+
+
+# -------------------------
+# Tests
+# -------------------------
+def test_delivery(stub, make_dispatcher):
+    dispatcher = make_dispatcher()
+    start = time.perf_counter()
+    assert dispatcher.send("ENTRY NIFTY", PRIORITY_TRADE)
+    assert time.perf_counter() - start < 0.05       # send() does not wait for the post
+    assert dispatcher.flush(5)
+    assert stub.posts[0][1] == {"chat_id": "42", "text": "ENTRY NIFTY"}
+    assert dispatcher.posts == 1
+
+
+def test_burst_is_coalesced_trade_first(stub, make_dispatcher):
+    dispatcher = make_dispatcher(coalesce_window=0.3)
+    dispatcher.send("status 1")
+    dispatcher.send("EXIT NIFTY", PRIORITY_TRADE)
+    dispatcher.send("status 2", PRIORITY_INFO)
+    assert dispatcher.flush(5)
+    assert texts(stub) == ["EXIT NIFTY\n\nstatus 1\n\nstatus 2"]
+
+
+def test_full_queue_drops_info_before_trade(stub, make_dispatcher):
+    dispatcher = make_dispatcher(max_queue=3, coalesce_window=30)     # worker holds the burst
+    for message, priority in [("info 1", PRIORITY_INFO), ("trade 1", PRIORITY_TRADE), ("info 2", PRIORITY_INFO),
+                              ("trade 2", PRIORITY_TRADE), ("trade 3", PRIORITY_TRADE)]:
+        dispatcher.send(message, priority)
+    assert dispatcher.dropped == 2
+    dispatcher.send("trade 4", PRIORITY_TRADE)     # no INFO left: oldest trade goes
+    assert dispatcher.dropped == 3
+    dispatcher.shutdown(5)
+    assert texts(stub) == ["trade 2\n\ntrade 3\n\ntrade 4"]
+
+
+def test_posts_are_rate_limited(stub, make_dispatcher):
+    dispatcher = make_dispatcher(min_interval=0.3)
+    for i in range(3):
+        dispatcher.send(f"alert {i}")
+        assert dispatcher.flush(5)
+    times = [t for t, _ in stub.posts]
+    assert texts(stub) == ["alert 0", "alert 1", "alert 2"]
+    assert all(b - a >= 0.25 for a, b in zip(times, times[1:]))
+
+
+def test_flush_waits_for_delivery(stub, make_dispatcher):
+    dispatcher = make_dispatcher(coalesce_window=0.2)
+    dispatcher.send("a")
+    assert not dispatcher.flush(0.01)               # still inside the coalesce window
+    assert dispatcher.flush(5)
+    assert texts(stub) == ["a"]
+    assert dispatcher.pending() == 0
+
+
+def test_shutdown_drains_without_waiting_and_stops(stub, make_dispatcher):
+    dispatcher = make_dispatcher(min_interval=60, coalesce_window=60)
+    dispatcher.send("first")
+    dispatcher.send("last", PRIORITY_TRADE)
+    start = time.monotonic()
+    dispatcher.shutdown(5)
+    assert time.monotonic() - start < 5
+    assert texts(stub) == ["last\n\nfirst"]
+    assert not dispatcher.worker.is_alive()
+    assert not dispatcher.send("late")
+
+
+def test_long_bursts_are_split_at_the_length_limit():
+    chunks = list(TelegramDispatcher._chunks(["x" * 3000, "y" * 3000, "z" * 5000]))
+    assert [len(c) for c in chunks] == [3000, 3000, 4096]
@@ -0,0 +1,61 @@
+import os
+from datetime import datetime
+import pytest
+from records import Order, Side, TradeSummary
+from trade_journal import HEADER, KIND_ORDER, RECORD, SYMBOL_SIZE, TradeJournal, journal_trades, read_journal
+
+
+def write_orders(path, count):
+    journal = TradeJournal(path)
+    for i in range(count):
+        journal.order(Order(i + 1, "NIFTY", Side.BUY, 1, 100.0 + i, datetime(2025, 11, 3, 9, 15 + i)))
+    journal.close()
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / "t.jrnl")
+    write_orders(path, 3)
+    records = read_journal(path)
+    assert len(records) == 3
+    assert (records["kind"] == KIND_ORDER).all()
+    assert records["order_id"].tolist() == [1, 2, 3]
+    assert records["price"].tolist() == [100.0, 101.0, 102.0]
+
+
+def test_torn_last_record_is_ignored(tmp_path):
+    path = str(tmp_path / "t.jrnl")
+    write_orders(path, 2)
+    with open(path, "ab") as f:
+        f.write(b"\x01" * (RECORD.size // 2))      # crash mid-write
+    assert len(read_journal(path)) == 2
+
+
+def test_reopen_truncates_torn_record(tmp_path):
+    path = str(tmp_path / "t.jrnl")
+    write_orders(path, 2)
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 10)
+    write_orders(path, 1)                           # appends after the truncated tail
+    assert os.path.getsize(path) == HEADER.size + 3 * RECORD.size
+    assert read_journal(path)["order_id"].tolist() == [1, 2, 1]
+
+
+def test_fields_too_long_are_rejected_not_cut(tmp_path):
+    path = str(tmp_path / "t.jrnl")
+    journal = TradeJournal(path)
+    ts = datetime(2025, 11, 3, 9, 15)
+    pair = "NIFTY25NOV24800CE/NIFTY25NOV24800PE"
+    with pytest.raises(ValueError):
+        journal.order(Order(1, pair, Side.SELL, 1, 100.0, ts))
+    with pytest.raises(ValueError):
+        journal.trade(TradeSummary(symbol="40001/40002", side=Side.SELL, qty=1, entry_time=ts, exit_time=ts,
+                                   entry_price=100.0, exit_price=90.0, realized_pnl=10.0,
+                                   reason="STOP_LOSS_AND_TARGET_BOTH"))
+    full = "X" * SYMBOL_SIZE
+    journal.trade(TradeSummary(symbol=full, side=Side.SELL, qty=1, entry_time=ts, exit_time=ts, entry_price=100.0,
+                               exit_price=90.0, realized_pnl=10.0, reason="TARGET"))
+    journal.close()
+
+    records = read_journal(path)
+    assert len(records) == 1
+    assert journal_trades(records)[0].symbol == full